@@ -0,0 +1,16 @@
+"""
+Management command to maintain activity log partitions.
+"""
+from django.core.management.base import BaseCommand
+from activity.partitions import maintain, partition_name
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly activity log partitions and drop expired ones'
+
+    def handle(self, *args, **options):
+        created, dropped = maintain()
+        for month in created:
+            self.stdout.write(self.style.SUCCESS(f'created {partition_name(month)}'))
+        for month in dropped:
+            self.stdout.write(self.style.WARNING(f'dropped {partition_name(month)}'))
@@ -0,0 +1,18 @@
+"""
+Middleware for activity app.
+"""
+from .recorder import current_request
+
+
+class ActivityActorMiddleware:
+    """Makes the user of a request the actor of the activity it causes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
@@ -0,0 +1,82 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:11
+
+from django.conf import settings
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from datetime import datetime, timezone
+
+# Range-partitioned by month (see ``activity.partitions``); the primary key
+# has to include the partition key.
+CREATE_SQL = """
+    CREATE TABLE activity_activitylog (
+        id bigserial NOT NULL,
+        created_at timestamp with time zone NOT NULL,
+        actor_id bigint NULL,
+        entity varchar(20) NOT NULL,
+        entity_id bigint NOT NULL,
+        action varchar(20) NOT NULL,
+        task_id bigint NULL,
+        project_id bigint NULL,
+        changes jsonb NOT NULL,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at);
+    CREATE TABLE activity_activitylog_default PARTITION OF activity_activitylog DEFAULT;
+    CREATE INDEX activity_task_feed_idx ON activity_activitylog (task_id, created_at DESC, id DESC)
+        WHERE task_id IS NOT NULL;
+    CREATE INDEX activity_project_feed_idx ON activity_activitylog (project_id, created_at DESC, id DESC)
+        WHERE project_id IS NOT NULL;
+"""
+
+
+def create_first_partitions(apps, schema_editor):
+    # The current month and the next two; ``activity_partitions`` keeps going from there.
+    now = datetime.now(timezone.utc)
+    months = [divmod(now.year * 12 + now.month - 1 + offset, 12) for offset in range(4)]
+    for (year, month), (next_year, next_month) in zip(months, months[1:]):
+        schema_editor.execute(
+            f'CREATE TABLE activity_activitylog_y{year}m{month + 1:02d} PARTITION OF activity_activitylog '
+            'FOR VALUES FROM (%s) TO (%s)',
+            [f'{year}-{month + 1:02d}-01T00:00:00+00:00', f'{next_year}-{next_month + 1:02d}-01T00:00:00+00:00'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(CREATE_SQL, 'DROP TABLE activity_activitylog'),
+                migrations.RunPython(create_first_partitions, migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.CreateModel(
+                    name='ActivityLog',
+                    fields=[
+                        ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                        ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                        ('entity', models.CharField(choices=[('task', 'Задача'), ('project', 'Проект'), ('comment', 'Комментарий к задаче')], max_length=20, verbose_name='Сущность')),
+                        ('entity_id', models.BigIntegerField(verbose_name='ID сущности')),
+                        ('action', models.CharField(choices=[('created', 'Создание'), ('updated', 'Изменение'), ('deleted', 'Удаление')], max_length=20, verbose_name='Действие')),
+                        ('task_id', models.BigIntegerField(blank=True, null=True, verbose_name='ID задачи')),
+                        ('project_id', models.BigIntegerField(blank=True, null=True, verbose_name='ID проекта')),
+                        ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Изменения')),
+                        ('actor', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                    ],
+                    options={
+                        'verbose_name': 'Запись журнала активности',
+                        'verbose_name_plural': 'Журнал активности',
+                        'ordering': ['-created_at', '-id'],
+                        'indexes': [models.Index(condition=models.Q(('task_id__isnull', False)), fields=['task_id', '-created_at', '-id'], name='activity_task_feed_idx'), models.Index(condition=models.Q(('project_id__isnull', False)), fields=['project_id', '-created_at', '-id'], name='activity_project_feed_idx')],
+                    },
+                ),
+            ],
+        ),
+    ]
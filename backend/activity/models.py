@@ -0,0 +1,63 @@
+"""
+Activity log models.
+"""
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+ACTIVITY_ENTITIES = [
+    ('task', _('Задача')),
+    ('project', _('Проект')),
+    ('comment', _('Комментарий к задаче')),
+]
+
+ACTIVITY_ACTIONS = [
+    ('created', _('Создание')),
+    ('updated', _('Изменение')),
+    ('deleted', _('Удаление')),
+]
+
+
+class ActivityLog(models.Model):
+    """
+    Append-only record of one change to a task, project or task comment.
+
+    The table is range-partitioned by month of ``created_at`` (see
+    ``activity.partitions``), so it is created by SQL in its migration and
+    its primary key is ``(id, created_at)`` in the database.  Entries keep
+    plain ids instead of foreign keys to outlive what they describe.
+    ``changes`` maps a field to ``[old, new]``; long text fields map to
+    ``null``, only telling that they changed.
+    """
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+        null=True, blank=True, related_name='+', verbose_name=_('Пользователь'),
+    )
+    entity = models.CharField(max_length=20, choices=ACTIVITY_ENTITIES, verbose_name=_('Сущность'))
+    entity_id = models.BigIntegerField(verbose_name=_('ID сущности'))
+    action = models.CharField(max_length=20, choices=ACTIVITY_ACTIONS, verbose_name=_('Действие'))
+    task_id = models.BigIntegerField(null=True, blank=True, verbose_name=_('ID задачи'))
+    project_id = models.BigIntegerField(null=True, blank=True, verbose_name=_('ID проекта'))
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name=_('Изменения'))
+    
+    class Meta:
+        verbose_name = _('Запись журнала активности')
+        verbose_name_plural = _('Журнал активности')
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(
+                fields=['task_id', '-created_at', '-id'], name='activity_task_feed_idx',
+                condition=models.Q(task_id__isnull=False),
+            ),
+            models.Index(
+                fields=['project_id', '-created_at', '-id'], name='activity_project_feed_idx',
+                condition=models.Q(project_id__isnull=False),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.entity} {self.entity_id} - {self.action}"
@@ -0,0 +1,91 @@
+"""
+Monthly partitions of the activity log.
+
+``activity_activitylog`` is range-partitioned by ``created_at`` into one
+table per calendar month (UTC), named ``activity_activitylog_yYYYYmMM``,
+plus a default partition for rows outside them.  ``maintain`` (run daily)
+creates the partitions of the coming months ahead of time, which keeps the
+default partition empty, and drops whole months past
+``ACTIVITY_RETENTION_MONTHS``; dropping a partition costs no more than
+dropping a table, unlike deleting its rows.
+"""
+import re
+from datetime import date, datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import ActivityLog
+
+PARENT = ActivityLog._meta.db_table
+PARTITION_NAME = re.compile(rf'^{PARENT}_y(\d{{4}})m(\d{{2}})$')
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{PARENT}_y{month.year}m{month.month:02d}'
+
+
+def _bound(month):
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc).isoformat()
+
+
+def current_month(now=None):
+    now = (now or timezone.now()).astimezone(dt_timezone.utc)
+    return date(now.year, now.month, 1)
+
+
+def existing_partitions():
+    """Months that have a partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE parent.relname = %s', [PARENT]
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    return sorted(
+        date(int(match[1]), int(match[2]), 1) for match in map(PARTITION_NAME.match, names) if match
+    )
+
+
+def create_partitions(months_ahead=None, now=None):
+    """Create the partitions of this month and the next ``months_ahead``; returns the new months."""
+    months_ahead = settings.ACTIVITY_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    first = current_month(now)
+    existing = set(existing_partitions())
+    created = []
+    with connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if month in existing:
+                continue
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {connection.ops.quote_name(partition_name(month))} '
+                f'PARTITION OF {connection.ops.quote_name(PARENT)} FOR VALUES FROM (%s) TO (%s)',
+                [_bound(month), _bound(add_months(month, 1))]
+            )
+            created.append(month)
+    return created
+
+
+def drop_partitions(before):
+    """Drop the partitions of months before ``before``; returns the dropped months."""
+    dropped = [month for month in existing_partitions() if month < before]
+    with connection.cursor() as cursor:
+        for month in dropped:
+            cursor.execute(f'DROP TABLE IF EXISTS {connection.ops.quote_name(partition_name(month))}')
+    return dropped
+
+
+def maintain(now=None):
+    """Create upcoming partitions and drop expired ones; returns ``(created, dropped)``."""
+    created = create_partitions(now=now)
+    dropped = []
+    if settings.ACTIVITY_RETENTION_MONTHS:
+        dropped = drop_partitions(add_months(current_month(now), -settings.ACTIVITY_RETENTION_MONTHS))
+    return created, dropped
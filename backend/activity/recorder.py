@@ -0,0 +1,106 @@
+"""
+Recording of activity.
+
+``track`` makes a model remember the values of its tracked fields as it is
+loaded (or saved), so a later save is diffed without reading the row again.
+Entries are buffered per transaction and written with one ``bulk_create``
+when it commits; a rolled-back transaction takes its buffer with it (a
+rolled-back savepoint does not, unless the buffer was started in it).  The
+actor is the user of the request being served (see ``ActivityActorMiddleware``);
+background jobs record no actor.
+"""
+from contextvars import ContextVar
+from django.db import models, transaction
+from django.db.models.signals import post_init
+from .models import ActivityLog
+
+BATCH_SIZE = 1000
+
+current_request = ContextVar('activity_request', default=None)
+
+_tracked = {}
+
+
+def current_actor_id():
+    # DRF sets ``user`` on the underlying request once it has authenticated it.
+    user = getattr(current_request.get(), 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+class Tracked:
+    """Fields of a tracked model that are diffed; text fields are only flagged."""
+
+    def __init__(self, model, fields):
+        self.fields = [model._meta.get_field(name) for name in fields]
+        self.text_fields = {field.attname for field in self.fields if isinstance(field, models.TextField)}
+
+    def snapshot(self, instance):
+        # Deferred fields are left out rather than loaded.
+        values = instance.__dict__
+        return {field.attname: values[field.attname] for field in self.fields if field.attname in values}
+
+    def changes(self, before, after):
+        return {
+            self._name(attname): None if attname in self.text_fields else [before.get(attname), value]
+            for attname, value in after.items()
+            if before.get(attname) != value
+        }
+
+    def _name(self, attname):
+        return attname[:-3] if attname.endswith('_id') else attname
+
+
+def _remember(sender, instance, **kwargs):
+    if instance.pk is not None:
+        instance._activity_snapshot = _tracked[sender].snapshot(instance)
+
+
+def track(model, fields):
+    """Diff ``fields`` of ``model`` between loading and saving."""
+    _tracked[model] = Tracked(model, fields)
+    post_init.connect(_remember, sender=model, dispatch_uid=f'activity:{model._meta.label_lower}')
+
+
+def diff(instance, created=False):
+    """Tracked fields changed since ``instance`` was loaded; all of them for a new instance."""
+    tracked = _tracked[type(instance)]
+    after = tracked.snapshot(instance)
+    before = {} if created else getattr(instance, '_activity_snapshot', None)
+    instance._activity_snapshot = after
+    if before is None:
+        return {}
+    return tracked.changes(before, after)
+
+
+def _write(entries, using):
+    ActivityLog.objects.using(using).bulk_create(entries, batch_size=BATCH_SIZE)
+
+
+def _pending(connection):
+    """The buffer of the current transaction, if its flush is still scheduled."""
+    buffer = getattr(connection, 'activity_buffer', None)
+    if buffer is not None and any(callback[1] is buffer[1] for callback in connection.run_on_commit):
+        return buffer
+    return None
+
+
+def record(entity, entity_id, action, changes=None, task_id=None, project_id=None, using='default'):
+    """Log an entry once the current transaction commits (at once outside a transaction)."""
+    entry = ActivityLog(
+        actor_id=current_actor_id(), entity=entity, entity_id=entity_id, action=action,
+        changes=changes or {}, task_id=task_id, project_id=project_id,
+    )
+    connection = transaction.get_connection(using)
+    buffer = _pending(connection) if connection.in_atomic_block else None
+    if buffer is not None:
+        buffer[0].append(entry)
+        return
+    entries = [entry]
+
+    # A function rather than a ``partial``: robust hooks are logged by ``__qualname__``.
+    def flush():
+        _write(entries, using)
+
+    if connection.in_atomic_block:
+        connection.activity_buffer = (entries, flush)
+    transaction.on_commit(flush, using=using, robust=True)
@@ -0,0 +1,15 @@
+"""
+Serializers for activity app.
+"""
+from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
+from users.serializers import UserSerializer
+from .models import ActivityLog
+
+
+class ActivityLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ActivityLog
+        fields = ['id', 'created_at', 'actor', 'entity', 'entity_id', 'action', 'task_id', 'project_id', 'changes']
+        read_only_fields = fields
+        expandable_fields = {'actor': (UserSerializer, {})}
@@ -0,0 +1,62 @@
+"""
+Signals for activity app.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tasks.models import Project, Task, TaskComment
+from tasks.signals import tasks_bulk_saved
+from .recorder import diff, record, track
+
+TASK_FIELDS = [
+    'title', 'description', 'status', 'priority', 'assignee', 'reporter', 'project', 'column',
+    'due_date', 'depends_on', 'is_recurring', 'recurrence_pattern',
+]
+PROJECT_FIELDS = ['name', 'description', 'manager', 'department', 'start_date', 'end_date', 'status', 'color']
+COMMENT_FIELDS = ['content']
+
+track(Task, TASK_FIELDS)
+track(Project, PROJECT_FIELDS)
+track(TaskComment, COMMENT_FIELDS)
+
+
+def _scope(instance):
+    if isinstance(instance, Task):
+        return 'task', {'task_id': instance.pk, 'project_id': instance.project_id}
+    if isinstance(instance, Project):
+        return 'project', {'project_id': instance.pk}
+    return 'comment', {'task_id': instance.task_id, 'project_id': instance.task.project_id}
+
+
+def _log_save(instance, created, using):
+    changes = diff(instance, created)
+    if created or changes:
+        entity, scope = _scope(instance)
+        record(entity, instance.pk, 'created' if created else 'updated', changes, using=using, **scope)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=TaskComment)
+def log_save(sender, instance, created, raw=False, using='default', **kwargs):
+    """Field-level diff of a saved task, project or comment."""
+    if not raw:
+        _log_save(instance, created, using)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=TaskComment)
+def log_delete(sender, instance, using='default', **kwargs):
+    entity, scope = _scope(instance)
+    record(entity, instance.pk, 'deleted', using=using, **scope)
+
+
+@receiver(tasks_bulk_saved)
+def log_bulk_save(sender, created=(), updated=(), **kwargs):
+    """Bulk task writes skip ``post_save``; they are logged here, after their commit, in one batch."""
+    with transaction.atomic():
+        for task in created:
+            _log_save(task, True, 'default')
+        for task in updated:
+            _log_save(task, False, 'default')
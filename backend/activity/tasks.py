@@ -0,0 +1,12 @@
+"""
+Background jobs for activity.
+"""
+from celery import shared_task
+from .partitions import maintain
+
+
+@shared_task
+def maintain_activity_partitions():
+    """Create the coming months' partitions and drop expired ones."""
+    created, dropped = maintain()
+    return {'created': [str(month) for month in created], 'dropped': [str(month) for month in dropped]}
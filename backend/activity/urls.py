@@ -0,0 +1,10 @@
+"""
+URLs for activity app.
+"""
+from django.urls import path
+from .views import ActivityFeedView
+
+urlpatterns = [
+    path('tasks/<int:pk>/', ActivityFeedView.as_view(scope='task_id'), name='task-activity'),
+    path('projects/<int:pk>/', ActivityFeedView.as_view(scope='project_id'), name='project-activity'),
+]
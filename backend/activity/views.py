@@ -0,0 +1,21 @@
+"""
+Views for activity app.
+"""
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from core.pagination import KeysetPagination
+from core.serializers import DynamicFieldsViewMixin
+from .models import ActivityLog
+from .serializers import ActivityLogSerializer
+
+
+class ActivityFeedView(DynamicFieldsViewMixin, generics.ListAPIView):
+    """Activity of one task or project (``scope``), newest first."""
+    queryset = ActivityLog.objects.all()
+    serializer_class = ActivityLogSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    scope = None
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(**{self.scope: self.kwargs['pk']})
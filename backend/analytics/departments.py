@@ -0,0 +1,100 @@
+"""
+Per-department rollups for the whole department tree.
+
+Counters are computed once per department with two grouped queries (tasks
+by the project's department, documents by the author's department) and then
+summed over each subtree using the cached closure from ``users.tree``, so
+the response size, not the query count, grows with the tree.
+"""
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from core.cache import versioned_key, model_version_name
+from tasks.models import Task, Project, TASK_STATUSES
+from documents.models import Document
+from users.models import Department
+from users.tree import get_subtree_index
+from .stats import OPEN_TASK_STATUSES
+
+REPORT_TTL = settings.DASHBOARD_SNAPSHOT_TTL
+
+
+def _task_counters(now):
+    aggregates = {
+        f'tasks_{code}': Count('id', filter=Q(status=code)) for code, _ in TASK_STATUSES
+    }
+    aggregates['tasks_overdue'] = Count('id', filter=Q(due_date__lt=now, status__in=OPEN_TASK_STATUSES))
+    rows = Task.objects.filter(project__department__isnull=False).values(
+        'project__department_id'
+    ).annotate(**aggregates).order_by()
+    return {row.pop('project__department_id'): row for row in rows}
+
+
+def _document_counters():
+    rows = Document.objects.filter(created_by__department__isnull=False).values(
+        'created_by__department_id'
+    ).annotate(
+        documents_total=Count('id'),
+        documents_pending=Count('id', filter=Q(status='pending')),
+    ).order_by()
+    return {row.pop('created_by__department_id'): row for row in rows}
+
+
+def _counters(row):
+    return {
+        'tasks': {code: row.get(f'tasks_{code}', 0) for code, _ in TASK_STATUSES},
+        'tasks_overdue': row.get('tasks_overdue', 0),
+        'documents_total': row.get('documents_total', 0),
+        'documents_pending': row.get('documents_pending', 0),
+    }
+
+
+def build_department_report():
+    """Department forest with own and subtree counters for every node."""
+    now = timezone.now()
+    own = {}
+    for source in (_task_counters(now), _document_counters()):
+        for department_id, row in source.items():
+            own.setdefault(department_id, Counter()).update(row)
+
+    subtrees = get_subtree_index()
+    nodes = {}
+    for department in Department.objects.values('id', 'name', 'parent_id'):
+        subtree = Counter()
+        for descendant_id in subtrees.get(department['id'], [department['id']]):
+            subtree.update(own.get(descendant_id, {}))
+        nodes[department['id']] = {
+            **department,
+            'own': _counters(own.get(department['id'], {})),
+            'subtree': _counters(subtree),
+            'children': [],
+        }
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node['parent_id'])
+        (parent['children'] if parent else roots).append(node)
+    return roots
+
+
+def get_department_report(department_id=None):
+    """Cached department report, optionally only the subtree of ``department_id``."""
+    key = versioned_key(
+        'analytics:departments',
+        *(model_version_name(model) for model in (Department, Project, Task, Document)),
+    )
+    report = cache.get(key)
+    if report is None:
+        report = build_department_report()
+        cache.set(key, report, REPORT_TTL)
+    if department_id is None:
+        return report
+    return [node for node in _walk(report) if node['id'] == department_id]
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node['children'])
@@ -0,0 +1,124 @@
+"""
+Database-side duration statistics.
+
+``duration_stats`` turns a queryset and a pair of datetime fields into mean,
+median, p90/p95 and a histogram of the elapsed time (in hours) without loading
+rows into Python: everything is computed by one aggregate query using
+PostgreSQL's ``percentile_cont``.
+"""
+from django.db.models import Aggregate, Avg, Count, F, FloatField, Func, Q, DurationField, ExpressionWrapper
+
+# Upper bounds (in hours) of the histogram buckets; the last bucket is open.
+HISTOGRAM_BOUNDS = [1, 4, 8, 24, 72, 168, 336, 720]
+
+
+class Percentile(Aggregate):
+    """Continuous percentile (``percentile_cont``) of an expression."""
+    function = 'PERCENTILE_CONT'
+    name = 'Percentile'
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, percentile, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
+
+
+class EpochHours(Func):
+    """Length of an interval expression in hours."""
+    template = 'EXTRACT(EPOCH FROM %(expressions)s) / 3600.0'
+    output_field = FloatField()
+
+
+def _as_expression(value):
+    return F(value) if isinstance(value, str) else value
+
+
+def duration_expression(start, end):
+    return EpochHours(ExpressionWrapper(_as_expression(end) - _as_expression(start), output_field=DurationField()))
+
+
+def _bucket_label(lower, upper):
+    if upper is None:
+        return f'{lower}h+'
+    return f'{lower}-{upper}h'
+
+
+def _buckets():
+    lower = 0
+    for upper in HISTOGRAM_BOUNDS + [None]:
+        yield lower, upper
+        lower = upper
+
+
+def _aggregates(field):
+    aggregates = {
+        'count': Count(field),
+        'mean': Avg(field),
+        'median': Percentile(field, 0.5),
+        'p90': Percentile(field, 0.9),
+        'p95': Percentile(field, 0.95),
+    }
+    for index, (lower, upper) in enumerate(_buckets()):
+        condition = Q(**{f'{field}__gte': lower})
+        if upper is not None:
+            condition &= Q(**{f'{field}__lt': upper})
+        aggregates[f'bucket_{index}'] = Count('pk', filter=condition)
+    return aggregates
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def _format(row, extra=()):
+    histogram = [
+        {
+            'label': _bucket_label(lower, upper),
+            'min_hours': lower,
+            'max_hours': upper,
+            'count': row[f'bucket_{index}'],
+        }
+        for index, (lower, upper) in enumerate(_buckets())
+    ]
+    return {
+        'count': row['count'],
+        'mean_hours': _round(row['mean']),
+        'median_hours': _round(row['median']),
+        'p90_hours': _round(row['p90']),
+        'p95_hours': _round(row['p95']),
+        'histogram': histogram,
+        **{name: row[name] for name in extra},
+    }
+
+
+def duration_stats(queryset, start_field, end_field, group_by=None, extra=None):
+    """
+    Statistics of ``end_field - start_field`` over ``queryset``.
+
+    ``start_field``/``end_field`` are field names or expressions.  Rows where a
+    named field is NULL are filtered out; rows where an expression evaluates to
+    NULL stay in the query but are ignored by the statistics, which lets
+    ``extra`` aggregates (a dict of name -> aggregate) count them in the same
+    pass.  Without ``group_by`` a single dict is returned; with ``group_by``
+    (a list of field names) one dict per group, with the group values merged in.
+    """
+    field = '_duration_hours'
+    extra = extra or {}
+    not_null = {f'{name}__isnull': False for name in (start_field, end_field) if isinstance(name, str)}
+    queryset = queryset.filter(**not_null).annotate(
+        **{field: duration_expression(start_field, end_field)}
+    ).order_by()
+    aggregates = {**_aggregates(field), **extra}
+
+    if not group_by:
+        return _format(queryset.aggregate(**aggregates), extra)
+
+    rows = queryset.values(*group_by).annotate(**aggregates).order_by(*group_by)
+    return [
+        {**{name: row[name] for name in group_by}, **_format(row, extra)}
+        for row in rows
+    ]
+
+
+def hours_to_days(hours):
+    return round(hours / 24, 2) if hours is not None else None
@@ -0,0 +1,225 @@
+"""
+XLSX and PDF export of task/document lists and the dashboard summary.
+
+Rows are read with server-side cursors (``iterator(chunk_size=...)``) and
+written as they arrive: openpyxl in write-only mode and a reportlab canvas
+drawn row by row (no platypus story is built), so the rows themselves are
+never held in memory.
+"""
+import os
+import tempfile
+from dataclasses import dataclass
+from django.conf import settings
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+from tasks.models import Task, TASK_STATUSES, TASK_PRIORITIES
+from documents.models import Document, DOCUMENT_STATUSES
+from core.counting import approximate_count
+from .filters import apply_scope, TASK_SCOPE, DOCUMENT_SCOPE
+from .stats import get_dashboard_snapshot
+
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'pdf': 'application/pdf',
+}
+
+
+@dataclass
+class Column:
+    header: str
+    field: str
+    width: int = 20
+    labels: dict = None
+
+
+@dataclass
+class ExportDataset:
+    title: str
+    columns: list
+    queryset: object = None
+
+    def rows(self):
+        fields = [column.field for column in self.columns]
+        for values in self.queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+            yield [_format_value(value, column) for value, column in zip(values, self.columns)]
+
+    def count(self):
+        return approximate_count(self.queryset)
+
+
+@dataclass
+class DashboardDataset(ExportDataset):
+    """Dashboard counters flattened to (section, metric, value) rows."""
+
+    def rows(self):
+        for section, metrics in get_dashboard_snapshot().items():
+            for metric, value in metrics.items():
+                yield [section, metric, value]
+
+    def count(self):
+        return 0
+
+
+def _format_value(value, column):
+    if column.labels is not None and value is not None:
+        return str(column.labels.get(value, value))
+    if hasattr(value, 'tzinfo') and value.tzinfo is not None:
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def _status_filter(queryset, params):
+    status = params.get('status')
+    return queryset.filter(status=status) if status else queryset
+
+
+def tasks_dataset(params):
+    queryset = apply_scope(Task.objects.order_by('id'), params, TASK_SCOPE)
+    return ExportDataset(
+        title='Задачи',
+        queryset=_status_filter(queryset, params),
+        columns=[
+            Column('ID', 'id', 8),
+            Column('Название', 'title', 50),
+            Column('Проект', 'project__name', 25),
+            Column('Статус', 'status', 15, dict(TASK_STATUSES)),
+            Column('Приоритет', 'priority', 12, dict(TASK_PRIORITIES)),
+            Column('Исполнитель', 'assignee__email', 25),
+            Column('Автор', 'reporter__email', 25),
+            Column('Срок', 'due_date', 18),
+            Column('Создана', 'created_at', 18),
+            Column('Выполнена', 'completed_at', 18),
+        ],
+    )
+
+
+def documents_dataset(params):
+    queryset = apply_scope(Document.objects.order_by('id'), params, DOCUMENT_SCOPE)
+    return ExportDataset(
+        title='Документы',
+        queryset=_status_filter(queryset, params),
+        columns=[
+            Column('ID', 'id', 8),
+            Column('Название', 'title', 50),
+            Column('Тип', 'document_type__name', 20),
+            Column('Версия', 'version', 8),
+            Column('Статус', 'status', 15, dict(DOCUMENT_STATUSES)),
+            Column('Создатель', 'created_by__email', 25),
+            Column('Создан', 'created_at', 18),
+            Column('Согласован', 'approved_at', 18),
+        ],
+    )
+
+
+def dashboard_dataset(params):
+    return DashboardDataset(
+        title='Сводка',
+        columns=[Column('Раздел', 'section', 20), Column('Показатель', 'metric', 25), Column('Значение', 'value', 12)],
+    )
+
+
+DATASETS = {
+    'tasks': tasks_dataset,
+    'documents': documents_dataset,
+    'dashboard': dashboard_dataset,
+}
+
+
+def write_xlsx(dataset, fileobj):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(dataset.title)
+    for index, column in enumerate(dataset.columns, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = column.width
+    sheet.append([column.header for column in dataset.columns])
+    row_count = 0
+    for row in dataset.rows():
+        sheet.append(row)
+        row_count += 1
+    workbook.save(fileobj)
+    return row_count
+
+
+def _pdf_font():
+    path = settings.EXPORT_PDF_FONT
+    if path and os.path.exists(path):
+        if 'ExportFont' not in pdfmetrics.getRegisteredFontNames():
+            pdfmetrics.registerFont(TTFont('ExportFont', path))
+        return 'ExportFont'
+    return 'Helvetica'
+
+
+def _fit(pdf, text, font, size, width):
+    text = '' if text is None else str(text)
+    if pdf.stringWidth(text, font, size) <= width:
+        return text
+    while text and pdf.stringWidth(text + '…', font, size) > width:
+        text = text[:-1]
+    return text + '…'
+
+
+def write_pdf(dataset, fileobj, font_size=8):
+    font = _pdf_font()
+    page_width, page_height = landscape(A4)
+    margin = 30
+    line_height = font_size * 1.6
+    scale = (page_width - 2 * margin) / sum(column.width for column in dataset.columns)
+    widths = [column.width * scale for column in dataset.columns]
+
+    pdf = canvas.Canvas(fileobj, pagesize=(page_width, page_height))
+    pdf.setTitle(dataset.title)
+
+    def draw_row(values, y):
+        x = margin
+        for value, width in zip(values, widths):
+            if hasattr(value, 'strftime'):
+                value = value.strftime('%d.%m.%Y %H:%M')
+            pdf.drawString(x, y, _fit(pdf, value, font, font_size, width - 4))
+            x += width
+
+    def start_page():
+        pdf.setFont(font, font_size + 4)
+        pdf.drawString(margin, page_height - margin, dataset.title)
+        pdf.setFont(font, font_size)
+        y = page_height - margin - 2 * line_height
+        draw_row([column.header for column in dataset.columns], y)
+        pdf.line(margin, y - 3, page_width - margin, y - 3)
+        return y - line_height
+
+    y = start_page()
+    row_count = 0
+    for row in dataset.rows():
+        if y < margin:
+            pdf.showPage()
+            y = start_page()
+        draw_row(row, y)
+        y -= line_height
+        row_count += 1
+    pdf.save()
+    return row_count
+
+
+WRITERS = {
+    'xlsx': write_xlsx,
+    'pdf': write_pdf,
+}
+
+
+def export_filename(dataset_name, export_format):
+    stamp = timezone.localtime().strftime('%Y%m%d-%H%M%S')
+    return f'{dataset_name}-{stamp}.{export_format}'
+
+
+def write_export(dataset_name, export_format, params):
+    """Write an export into a temporary file; returns ``(file, row_count)``."""
+    dataset = DATASETS[dataset_name](params)
+    fileobj = tempfile.TemporaryFile()
+    row_count = WRITERS[export_format](dataset, fileobj)
+    fileobj.seek(0)
+    return fileobj, row_count
@@ -0,0 +1,73 @@
+"""
+Query parameter filters shared by analytics endpoints.
+"""
+from datetime import date
+from rest_framework.exceptions import ValidationError
+from users.tree import department_subtree
+
+TASK_SCOPE = {
+    'project': 'project_id',
+    'department': 'project__department_id',
+}
+
+ROLLUP_SCOPE = {
+    'project': 'project_id',
+    'department': 'department_id',
+}
+
+DOCUMENT_SCOPE = {
+    'department': 'created_by__department_id',
+    'document_type': 'document_type_id',
+}
+
+# Parameters whose value stands for a set of ids (a department and its subtree).
+SCOPE_EXPANDERS = {
+    'department': department_subtree,
+}
+
+
+def get_int_param(params, name):
+    """Read an optional integer query parameter."""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: 'Expected an integer'})
+
+
+def get_date_param(params, name, default=None):
+    """Read an optional ISO date (YYYY-MM-DD) query parameter."""
+    value = params.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: 'Expected a date in YYYY-MM-DD format'})
+
+
+def get_choice_param(params, name, choices, default):
+    """Read a query parameter restricted to ``choices``."""
+    value = params.get(name) or default
+    if value not in choices:
+        raise ValidationError({name: f'Expected one of: {", ".join(choices)}'})
+    return value
+
+
+def apply_scope(queryset, params, scope):
+    """
+    Filter ``queryset`` by the parameters listed in ``scope`` (param -> lookup).
+
+    ``department`` matches the department and all of its sub-departments.
+    """
+    for param, lookup in scope.items():
+        value = get_int_param(params, param)
+        if value is None:
+            continue
+        if param in SCOPE_EXPANDERS:
+            queryset = queryset.filter(**{f'{lookup}__in': SCOPE_EXPANDERS[param](value)})
+        else:
+            queryset = queryset.filter(**{lookup: value})
+    return queryset
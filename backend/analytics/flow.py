@@ -0,0 +1,79 @@
+"""
+Cumulative flow and burndown built from the task transition log.
+
+Each status transition moves one task out of ``from_status`` and into
+``to_status``.  A single grouped query returns the net daily movement per
+status pair; the daily series is then a running sum over those deltas, so
+the cost depends on the number of distinct (day, transition) pairs rather
+than on the number of tasks.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from tasks.models import TaskTransition, TASK_STATUSES
+
+STATUSES = [code for code, _ in TASK_STATUSES]
+OPEN_STATUSES = ['todo', 'in_progress', 'review']
+
+
+def _daily_deltas(project_id, date_to):
+    until = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+    rows = TaskTransition.objects.filter(
+        project_id=project_id,
+        created_at__lt=until,
+    ).exclude(
+        from_status=F('to_status'),
+    ).annotate(
+        day=TruncDate('created_at'),
+    ).values('day', 'from_status', 'to_status').annotate(moved=Count('id')).order_by('day')
+
+    deltas = {}
+    for row in rows:
+        day = deltas.setdefault(row['day'], Counter())
+        if row['from_status']:
+            day[row['from_status']] -= row['moved']
+        day[row['to_status']] += row['moved']
+    return deltas
+
+
+def status_counts_by_day(project_id, date_from, date_to):
+    """Yield ``(day, {status: count})`` for every day in the range."""
+    deltas = _daily_deltas(project_id, date_to)
+    counts = Counter()
+    for day in sorted(d for d in deltas if d < date_from):
+        counts.update(deltas[day])
+
+    day = date_from
+    while day <= date_to:
+        counts.update(deltas.get(day, {}))
+        yield day, {status: counts[status] for status in STATUSES}
+        day += timedelta(days=1)
+
+
+def cumulative_flow(project_id, date_from, date_to):
+    return [
+        {'date': day, 'counts': counts}
+        for day, counts in status_counts_by_day(project_id, date_from, date_to)
+    ]
+
+
+def burndown(project, date_from, date_to):
+    series = [
+        {
+            'date': day,
+            'remaining': sum(counts[status] for status in OPEN_STATUSES),
+            'completed': counts['done'],
+        }
+        for day, counts in status_counts_by_day(project.id, date_from, date_to)
+    ]
+
+    # Straight line from the first remaining value to zero at the project deadline.
+    if series and project.end_date and project.end_date > date_from:
+        start = series[0]['remaining']
+        span = (project.end_date - date_from).days
+        for point in series:
+            elapsed = (point['date'] - date_from).days
+            point['ideal'] = round(max(start * (1 - elapsed / span), 0), 2)
+    return series
@@ -0,0 +1,171 @@
+"""
+Monte Carlo delivery forecast for a project.
+
+Historical daily throughput (tasks completed per calendar day, idle days
+included) is resampled to simulate how many days the remaining backlog
+takes.  All simulations advance together as NumPy arrays, a block of days
+at a time.  The leading days in which (practically) no simulation can
+finish are skipped in one step by drawing how often each throughput value
+occurs from a multinomial, which gives the same distribution of sums as
+drawing those days one by one.
+"""
+from datetime import datetime, time, timedelta
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from core.cache import versioned_key, model_version_name
+from tasks.models import Task, Project
+
+PERCENTILES = (50, 85, 95)
+CLOSED_STATUSES = ['done', 'cancelled']
+MAX_HORIZON_DAYS = 3650
+BLOCK_CELLS = 2_000_000  # simulations x days drawn per block
+CACHE_TTL = 24 * 60 * 60
+
+
+def project_forecast_version_name(project_id):
+    """Counter bumped whenever a task of the project is completed, reopened, added or removed."""
+    return f'analytics.forecast.project:{project_id}'
+
+
+def _backlog(project_id):
+    return Task.objects.filter(project_id=project_id).aggregate(
+        remaining=Count('id', filter=~Q(status__in=CLOSED_STATUSES)),
+        first_created=Min('created_at'),
+    )
+
+
+def daily_throughput(project_id, date_from, date_to):
+    """Completed tasks per day from ``date_from`` to ``date_to`` as an array."""
+    since = timezone.make_aware(datetime.combine(date_from, time.min))
+    rows = Task.objects.filter(
+        project_id=project_id, status='done', completed_at__gte=since,
+    ).annotate(day=TruncDate('completed_at')).values('day').annotate(completed=Count('id')).order_by()
+
+    throughput = np.zeros((date_to - date_from).days + 1, dtype=np.int32)
+    for row in rows:
+        offset = (row['day'] - date_from).days
+        if 0 <= offset < throughput.size:
+            throughput[offset] = row['completed']
+    return throughput
+
+
+def _checkpoint(throughput, remaining):
+    """
+    Day up to which the simulation can jump in one step.
+
+    It is the last day on which finishing is more than four standard
+    deviations away, and never earlier than the day nobody can finish by
+    even completing the best day's total every day.
+    """
+    mean, std = throughput.mean(), throughput.std()
+    root = (-4 * std + np.sqrt(16 * std ** 2 + 4 * mean * remaining)) / (2 * mean)
+    safe = (remaining - 1) // int(throughput.max())
+    return int(min(max(np.ceil(root ** 2) - 1, safe, 0), MAX_HORIZON_DAYS))
+
+
+def _finish_days(values, drawn, remaining, rng):
+    """Day on which each path with the given value counts first reaches ``remaining``."""
+    paths = np.repeat(np.tile(values, drawn.shape[0]), drawn.ravel()).reshape(drawn.shape[0], -1)
+    paths = rng.permuted(paths, axis=1)
+    return np.argmax(np.cumsum(paths, axis=1) >= remaining, axis=1) + 1
+
+
+def simulate(throughput, remaining, simulations, rng):
+    """
+    Days each simulation needs to complete ``remaining`` tasks.
+
+    Simulations that do not finish within ``MAX_HORIZON_DAYS`` get ``inf``.
+    """
+    values, counts = np.unique(throughput, return_counts=True)
+    values = values.astype(np.int64)
+    completed = np.zeros(simulations, dtype=np.int64)
+    days = np.full(simulations, np.inf)
+
+    # Days are i.i.d., so the total after ``elapsed`` days only depends on how
+    # often each value was drawn, and any order of those draws is equally likely:
+    # paths that already finished before the checkpoint are replayed exactly.
+    elapsed = _checkpoint(throughput, remaining)
+    if elapsed:
+        drawn = rng.multinomial(elapsed, counts / counts.sum(), size=simulations)
+        completed = drawn @ values
+        crossed = completed >= remaining
+        if crossed.any():
+            days[crossed] = _finish_days(values, drawn[crossed], remaining, rng)
+
+    active = np.flatnonzero(completed < remaining)
+    mean = throughput.mean()
+    while active.size and elapsed < MAX_HORIZON_DAYS:
+        expected = (remaining - completed[active].mean()) / mean
+        block = int(min(max(expected * 1.25, 16), BLOCK_CELLS // active.size, MAX_HORIZON_DAYS - elapsed))
+        draws = throughput[rng.integers(0, throughput.size, size=(active.size, max(block, 1)))]
+        totals = completed[active, None] + np.cumsum(draws, axis=1)
+
+        finished = totals[:, -1] >= remaining
+        first = np.argmax(totals >= remaining, axis=1)
+        days[active[finished]] = elapsed + first[finished] + 1
+        completed[active] = totals[:, -1]
+        active = active[~finished]
+        elapsed += block
+    return days
+
+
+def build_forecast(project):
+    today = timezone.localdate()
+    simulations = settings.FORECAST_SIMULATIONS
+    backlog = _backlog(project.id)
+    remaining = backlog['remaining']
+
+    # Days before the project had any tasks would only add idle history.
+    date_from = today - timedelta(days=settings.FORECAST_HISTORY_DAYS)
+    if backlog['first_created']:
+        date_from = max(date_from, timezone.localdate(backlog['first_created']))
+    throughput = daily_throughput(project.id, date_from, today)
+
+    forecast = {
+        'project': project.id,
+        'remaining': remaining,
+        'history_from': date_from,
+        'history_days': int(throughput.size),
+        'mean_daily_throughput': round(float(throughput.mean()), 2),
+        'simulations': simulations,
+        'percentiles': [],
+        'on_time_probability': None,
+    }
+    if remaining == 0:
+        days = np.zeros(1)
+    elif throughput.any():
+        rng = np.random.default_rng([project.id, today.toordinal()])
+        days = simulate(throughput, remaining, simulations, rng)
+    else:
+        return forecast
+
+    # Unfinished simulations sort last without turning percentiles into NaN.
+    horizon = np.where(np.isfinite(days), days, MAX_HORIZON_DAYS + 1)
+    for percentile, value in zip(PERCENTILES, np.percentile(horizon, PERCENTILES, method='higher')):
+        finite = value <= MAX_HORIZON_DAYS
+        forecast['percentiles'].append({
+            'percentile': percentile,
+            'days': int(value) if finite else None,
+            'date': today + timedelta(days=int(value)) if finite else None,
+        })
+    if project.end_date:
+        forecast['on_time_probability'] = round(float(np.mean(days <= (project.end_date - today).days)), 3)
+    return forecast
+
+
+def get_forecast(project):
+    """Forecast cached for the day until a task of the project changes state."""
+    key = versioned_key(
+        f'analytics:forecast:{project.id}:{timezone.localdate().isoformat()}',
+        project_forecast_version_name(project.id),
+        model_version_name(Project),
+    )
+    forecast = cache.get(key)
+    if forecast is None:
+        forecast = build_forecast(project)
+        cache.set(key, forecast, CACHE_TTL)
+    return forecast
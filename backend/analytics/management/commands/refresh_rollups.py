@@ -0,0 +1,22 @@
+"""
+Management command to refresh daily analytics rollups.
+"""
+from django.core.management.base import BaseCommand
+from analytics.rollups import SOURCES, refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Incrementally refresh daily analytics rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entity', choices=sorted(SOURCES), help='Refresh a single entity')
+        parser.add_argument('--full', action='store_true', help='Rebuild rollups from scratch')
+
+    def handle(self, *args, **options):
+        entities = [options['entity']] if options['entity'] else list(SOURCES)
+        for entity in entities:
+            days = refresh_rollups(entity, full=options['full'])
+            if days is None:
+                self.stdout.write(self.style.SUCCESS(f'{entity}: rebuilt'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{entity}: {days} day(s) recomputed'))
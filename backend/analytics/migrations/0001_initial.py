@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('tasks', '0002_task_timestamp_indexes'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(choices=[('task', 'Задачи'), ('document', 'Документы'), ('process', 'Экземпляры процессов')], max_length=20, unique=True, verbose_name='Сущность')),
+                ('processed_until', models.DateTimeField(blank=True, null=True, verbose_name='Обработано до')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Отметка агрегации',
+                'verbose_name_plural': 'Отметки агрегации',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Дата')),
+                ('entity', models.CharField(choices=[('task', 'Задачи'), ('document', 'Документы'), ('process', 'Экземпляры процессов')], max_length=20, verbose_name='Сущность')),
+                ('dimension', models.CharField(choices=[('status', 'Статус'), ('priority', 'Приоритет'), ('completed', 'Завершено')], max_length=20, verbose_name='Измерение')),
+                ('value', models.CharField(max_length=20, verbose_name='Значение')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество')),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='users.department')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.project')),
+            ],
+            options={
+                'verbose_name': 'Дневной агрегат',
+                'verbose_name_plural': 'Дневные агрегаты',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['entity', 'dimension', 'date'], name='analytics_d_entity_f5130a_idx')],
+            },
+        ),
+    ]
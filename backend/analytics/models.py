@@ -0,0 +1,101 @@
+"""
+Analytics models.
+"""
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+
+User = get_user_model()
+
+ROLLUP_ENTITIES = [
+    ('task', _('Задачи')),
+    ('document', _('Документы')),
+    ('process', _('Экземпляры процессов')),
+]
+
+ROLLUP_DIMENSIONS = [
+    ('status', _('Статус')),
+    ('priority', _('Приоритет')),
+    ('completed', _('Завершено')),
+]
+
+EXPORT_DATASETS = [
+    ('tasks', _('Задачи')),
+    ('documents', _('Документы')),
+    ('dashboard', _('Сводка')),
+]
+
+EXPORT_FORMATS = [
+    ('xlsx', 'XLSX'),
+    ('pdf', 'PDF'),
+]
+
+EXPORT_STATUSES = [
+    ('pending', _('В очереди')),
+    ('running', _('Выполняется')),
+    ('done', _('Готово')),
+    ('failed', _('Ошибка')),
+]
+
+
+class DailyRollup(models.Model):
+    """
+    Pre-aggregated daily counts.
+
+    ``status`` and ``priority`` rows count items created on ``date`` by their
+    current value; ``completed`` rows count items finished on ``date``.
+    """
+    date = models.DateField(verbose_name=_('Дата'))
+    entity = models.CharField(max_length=20, choices=ROLLUP_ENTITIES, verbose_name=_('Сущность'))
+    dimension = models.CharField(max_length=20, choices=ROLLUP_DIMENSIONS, verbose_name=_('Измерение'))
+    value = models.CharField(max_length=20, verbose_name=_('Значение'))
+    project = models.ForeignKey('tasks.Project', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    department = models.ForeignKey('users.Department', on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    count = models.PositiveIntegerField(default=0, verbose_name=_('Количество'))
+    
+    class Meta:
+        verbose_name = _('Дневной агрегат')
+        verbose_name_plural = _('Дневные агрегаты')
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['entity', 'dimension', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.entity}.{self.dimension}={self.value}: {self.count}"
+
+
+class RollupWatermark(models.Model):
+    """Point in time up to which changes of an entity are rolled up."""
+    entity = models.CharField(max_length=20, choices=ROLLUP_ENTITIES, unique=True, verbose_name=_('Сущность'))
+    processed_until = models.DateTimeField(null=True, blank=True, verbose_name=_('Обработано до'))
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = _('Отметка агрегации')
+        verbose_name_plural = _('Отметки агрегации')
+    
+    def __str__(self):
+        return f"{self.entity}: {self.processed_until}"
+
+
+class ExportJob(models.Model):
+    """Background export of a dataset to a file."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs', verbose_name=_('Пользователь'))
+    dataset = models.CharField(max_length=20, choices=EXPORT_DATASETS, verbose_name=_('Набор данных'))
+    format = models.CharField(max_length=10, choices=EXPORT_FORMATS, verbose_name=_('Формат'))
+    params = models.JSONField(default=dict, blank=True, verbose_name=_('Параметры'))
+    status = models.CharField(max_length=20, choices=EXPORT_STATUSES, default='pending', verbose_name=_('Статус'))
+    file = models.FileField(upload_to='exports/%Y/%m/%d/', null=True, blank=True, verbose_name=_('Файл'))
+    row_count = models.PositiveIntegerField(default=0, verbose_name=_('Строк'))
+    error = models.TextField(blank=True, verbose_name=_('Ошибка'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = _('Экспорт')
+        verbose_name_plural = _('Экспорты')
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.dataset}.{self.format} ({self.status})"
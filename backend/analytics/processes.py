@@ -0,0 +1,71 @@
+"""
+Process instance throughput and node dwell-time analytics.
+
+Node timings come from ``ProcessNodeVisit`` rows written by
+``move_to_node``/``complete``; all aggregation is done in the database
+over indexed columns (``process, entered_at`` for visits, ``completed_at``
+and ``status, started_at`` for instances).
+"""
+from datetime import timedelta
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from processes.models import ProcessInstance, ProcessNode, ProcessNodeVisit
+from .durations import duration_stats
+
+SLOWEST_LIMIT = 10
+
+
+def throughput_by_day(since, process_id=None):
+    instances = ProcessInstance.objects.filter(completed_at__gte=since)
+    if process_id is not None:
+        instances = instances.filter(process_id=process_id)
+    rows = instances.annotate(day=TruncDate('completed_at')).values('day').annotate(completed=Count('id')).order_by('day')
+    return list(rows)
+
+
+def node_dwell_times(since, process_id=None):
+    visits = ProcessNodeVisit.objects.filter(entered_at__gte=since)
+    if process_id is not None:
+        visits = visits.filter(process_id=process_id)
+    rows = duration_stats(visits, 'entered_at', 'left_at', group_by=['process_id', 'node_id'])
+
+    names = ProcessNode.objects.filter(
+        process_id__in={row['process_id'] for row in rows}
+    ).values_list('process_id', 'node_id', 'name')
+    names = {(process, node): name for process, node, name in names}
+    for row in rows:
+        row['node_name'] = names.get((row['process_id'], row['node_id']), row['node_id'])
+    rows.sort(key=lambda row: -(row['mean_hours'] or 0))
+    return rows
+
+
+def slowest_running(process_id=None, limit=SLOWEST_LIMIT):
+    now = timezone.now()
+    open_visit = ProcessNodeVisit.objects.filter(instance=OuterRef('pk'), left_at__isnull=True)
+    instances = ProcessInstance.objects.filter(status='active')
+    if process_id is not None:
+        instances = instances.filter(process_id=process_id)
+    rows = instances.annotate(
+        node_entered_at=Subquery(open_visit.values('entered_at')[:1]),
+    ).order_by('started_at').values(
+        'id', 'name', 'process_id', 'process__name', 'current_node', 'started_at', 'node_entered_at',
+    )[:limit]
+
+    result = []
+    for row in rows:
+        row['running_hours'] = round((now - row['started_at']).total_seconds() / 3600, 2)
+        entered = row['node_entered_at']
+        row['in_node_hours'] = round((now - entered).total_seconds() / 3600, 2) if entered else None
+        result.append(row)
+    return result
+
+
+def process_report(days=30, process_id=None):
+    since = timezone.now() - timedelta(days=days)
+    return {
+        'days': days,
+        'throughput': throughput_by_day(since, process_id),
+        'nodes': node_dwell_times(since, process_id),
+        'slowest_running': slowest_running(process_id),
+    }
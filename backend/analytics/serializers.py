@@ -0,0 +1,16 @@
+"""
+Serializers for analytics app.
+"""
+from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
+from .models import ExportJob
+
+
+class ExportJobSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'dataset', 'format', 'params', 'status', 'file',
+            'row_count', 'error', 'created_at', 'finished_at'
+        ]
+        read_only_fields = fields
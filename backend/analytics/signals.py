@@ -0,0 +1,29 @@
+"""
+Signals for analytics.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.cache import track_model_versions, bump_version
+from documents.models import Approval, WorkflowStep
+from tasks.models import Task, TaskTransition
+from tasks.signals import tasks_bulk_saved, tasks_imported
+from .forecast import project_forecast_version_name
+from .stats import SNAPSHOT_MODELS
+
+track_model_versions(*SNAPSHOT_MODELS)
+track_model_versions(Approval, WorkflowStep)
+
+
+@receiver(post_save, sender=TaskTransition)
+@receiver(post_delete, sender=Task)
+def invalidate_project_forecast(sender, instance, **kwargs):
+    """Status changes and removed tasks change a project's backlog and throughput."""
+    if instance.project_id:
+        bump_version(project_forecast_version_name(instance.project_id))
+
+
+@receiver(tasks_bulk_saved)
+@receiver(tasks_imported)
+def invalidate_bulk_forecasts(sender, project_ids=(), **kwargs):
+    """Bulk task writes skip the per-row signals above."""
+    bump_version(*(project_forecast_version_name(project_id) for project_id in project_ids))
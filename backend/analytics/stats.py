@@ -0,0 +1,113 @@
+"""
+Dashboard statistics engine.
+
+Every model's counters are computed in a single conditional-aggregate query
+and the combined snapshot is cached under a key built from the models'
+version counters (see ``core.cache``), so any write to the underlying tables
+invalidates it.  Time-based counters (overdue, recent activity) drift even
+without writes, which is what ``DASHBOARD_SNAPSHOT_TTL`` bounds.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+from core.cache import versioned_key, model_version_name
+from tasks.models import Task, Project
+from documents.models import Document
+from processes.models import ProcessInstance
+
+SNAPSHOT_MODELS = (Task, Project, Document, ProcessInstance)
+SNAPSHOT_TTL = settings.DASHBOARD_SNAPSHOT_TTL
+
+OPEN_TASK_STATUSES = ['todo', 'in_progress']
+
+
+def _task_counters(now, week_ago):
+    return Task.objects.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='done')),
+        overdue=Count('id', filter=Q(due_date__lt=now, status__in=OPEN_TASK_STATUSES)),
+        recent=Count('id', filter=Q(updated_at__gte=week_ago)),
+    )
+
+
+def _project_counters():
+    return Project.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(status='active')),
+    )
+
+
+def _document_counters(week_ago):
+    return Document.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        approved=Count('id', filter=Q(status='approved')),
+        recent=Count('id', filter=Q(updated_at__gte=week_ago)),
+    )
+
+
+def _process_counters():
+    return ProcessInstance.objects.aggregate(
+        active=Count('id', filter=Q(status='active')),
+        completed=Count('id', filter=Q(status='completed')),
+    )
+
+
+def build_dashboard_snapshot():
+    """Compute the shared (user independent) part of the dashboard."""
+    now = timezone.now()
+    week_ago = now - timedelta(days=7)
+
+    tasks = _task_counters(now, week_ago)
+    projects = _project_counters()
+    documents = _document_counters(week_ago)
+    processes = _process_counters()
+
+    return {
+        'tasks': {
+            'total': tasks['total'],
+            'completed': tasks['completed'],
+            'overdue': tasks['overdue'],
+        },
+        'projects': projects,
+        'documents': {
+            'total': documents['total'],
+            'pending': documents['pending'],
+            'approved': documents['approved'],
+        },
+        'processes': processes,
+        'activity': {
+            'recent_tasks': tasks['recent'],
+            'recent_documents': documents['recent'],
+        },
+    }
+
+
+def get_dashboard_snapshot():
+    """Return the cached dashboard snapshot, rebuilding it when stale."""
+    key = versioned_key(
+        'analytics:dashboard',
+        *(model_version_name(model) for model in SNAPSHOT_MODELS)
+    )
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_dashboard_snapshot()
+        cache.set(key, snapshot, SNAPSHOT_TTL)
+    return snapshot
+
+
+def get_dashboard_stats(user):
+    """Dashboard snapshot merged with the per-user counters."""
+    snapshot = get_dashboard_snapshot()
+    tasks = snapshot['tasks']
+    return {
+        **snapshot,
+        'tasks': {
+            'total': tasks['total'],
+            'my_tasks': Task.objects.filter(assignee=user).count(),
+            'completed': tasks['completed'],
+            'overdue': tasks['overdue'],
+        },
+    }
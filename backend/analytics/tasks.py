@@ -0,0 +1,55 @@
+"""
+Background jobs for analytics.
+"""
+from celery import shared_task
+from django.core.files import File
+from django.utils import timezone
+from notifications.models import Notification
+from notifications.signals import send_websocket_notification
+from .exports import write_export, export_filename
+from .models import ExportJob
+from .rollups import refresh_all_rollups
+
+
+@shared_task
+def refresh_analytics_rollups(full=False):
+    """Periodically roll up rows changed since the last run."""
+    return refresh_all_rollups(full=full)
+
+
+@shared_task
+def run_export(job_id):
+    """Write a queued export to storage and notify its owner."""
+    job = ExportJob.objects.get(pk=job_id)
+    job.status = 'running'
+    job.save(update_fields=['status'])
+    try:
+        fileobj, row_count = write_export(job.dataset, job.format, job.params)
+        with fileobj:
+            job.file.save(export_filename(job.dataset, job.format), File(fileobj), save=False)
+    except Exception as exc:
+        job.status = 'failed'
+        job.error = str(exc)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        raise
+
+    job.status = 'done'
+    job.row_count = row_count
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'file', 'row_count', 'finished_at'])
+
+    Notification.objects.create(
+        user=job.user,
+        type='system',
+        title='Экспорт готов',
+        message=f'Файл {job.file.name.rsplit("/", 1)[-1]} ({row_count} строк) готов к загрузке',
+        link=job.file.url,
+        related_object_type='export',
+        related_object_id=job.id,
+    )
+    send_websocket_notification(job.user_id, {
+        'type': 'system',
+        'title': 'Экспорт готов',
+        'message': job.file.url,
+    })
@@ -2,11 +2,24 @@
 URLs for analytics app.
 """
 from django.urls import path
-from .views import dashboard_stats, task_analytics, document_analytics
+from .views import (
+    dashboard_stats, task_analytics, document_analytics, timeseries,
+    project_cumulative_flow, project_burndown, project_forecast, export, export_job,
+    workflow_analytics, process_analytics, department_analytics
+)
 
 urlpatterns = [
     path('dashboard/', dashboard_stats, name='dashboard-stats'),
     path('tasks/', task_analytics, name='task-analytics'),
     path('documents/', document_analytics, name='document-analytics'),
+    path('timeseries/', timeseries, name='analytics-timeseries'),
+    path('workflows/', workflow_analytics, name='workflow-analytics'),
+    path('processes/', process_analytics, name='process-analytics'),
+    path('departments/', department_analytics, name='department-analytics'),
+    path('projects/<int:project_id>/cumulative-flow/', project_cumulative_flow, name='project-cumulative-flow'),
+    path('projects/<int:project_id>/burndown/', project_burndown, name='project-burndown'),
+    path('projects/<int:project_id>/forecast/', project_forecast, name='project-forecast'),
+    path('export/', export, name='analytics-export'),
+    path('exports/<int:job_id>/', export_job, name='analytics-export-job'),
 ]
 
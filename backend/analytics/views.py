@@ -4,114 +4,74 @@ Analytics views.
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Count, Q, Avg, Sum
-from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework import status
 from datetime import timedelta
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from core.cache import model_version_name
+from core.conditional import conditional_response
 from tasks.models import Task, Project
 from documents.models import Document
-from processes.models import ProcessInstance
+from .durations import duration_stats, hours_to_days
+from .flow import cumulative_flow, burndown
+from .filters import (
+    apply_scope, get_choice_param, get_date_param, get_int_param,
+    TASK_SCOPE, DOCUMENT_SCOPE, ROLLUP_SCOPE
+)
+from .exports import DATASETS, CONTENT_TYPES, write_export, export_filename
+from .models import DailyRollup, ExportJob, ROLLUP_ENTITIES, ROLLUP_DIMENSIONS, EXPORT_FORMATS
+from .serializers import ExportJobSerializer
+from .tasks import run_export
+from .departments import get_department_report
+from .forecast import get_forecast
+from .processes import process_report
+from .workflows import get_bottlenecks
+from .stats import SNAPSHOT_MODELS, SNAPSHOT_TTL, get_dashboard_stats
 
 User = get_user_model()
 
+MAX_REPORT_DAYS = 3650
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
     """Get dashboard statistics."""
-    user = request.user
-    now = timezone.now()
-    week_ago = now - timedelta(days=7)
-    month_ago = now - timedelta(days=30)
-    
-    # Task statistics
-    total_tasks = Task.objects.count()
-    my_tasks = Task.objects.filter(assignee=user).count()
-    completed_tasks = Task.objects.filter(status='done').count()
-    overdue_tasks = Task.objects.filter(due_date__lt=now, status__in=['todo', 'in_progress']).count()
-    
-    # Project statistics
-    total_projects = Project.objects.count()
-    active_projects = Project.objects.filter(status='active').count()
-    
-    # Document statistics
-    total_documents = Document.objects.count()
-    pending_documents = Document.objects.filter(status='pending').count()
-    approved_documents = Document.objects.filter(status='approved').count()
-    
-    # Process statistics
-    active_processes = ProcessInstance.objects.filter(status='active').count()
-    completed_processes = ProcessInstance.objects.filter(status='completed').count()
-    
-    # Recent activity
-    recent_tasks = Task.objects.filter(updated_at__gte=week_ago).count()
-    recent_documents = Document.objects.filter(updated_at__gte=week_ago).count()
-    
-    return Response({
-        'tasks': {
-            'total': total_tasks,
-            'my_tasks': my_tasks,
-            'completed': completed_tasks,
-            'overdue': overdue_tasks,
-        },
-        'projects': {
-            'total': total_projects,
-            'active': active_projects,
-        },
-        'documents': {
-            'total': total_documents,
-            'pending': pending_documents,
-            'approved': approved_documents,
-        },
-        'processes': {
-            'active': active_processes,
-            'completed': completed_processes,
-        },
-        'activity': {
-            'recent_tasks': recent_tasks,
-            'recent_documents': recent_documents,
-        }
-    })
+    # The snapshot also expires, so its ETag changes at least as often.
+    return conditional_response(
+        request, [model_version_name(model) for model in SNAPSHOT_MODELS],
+        lambda: Response(get_dashboard_stats(request.user)),
+        'dashboard_stats', int(timezone.now().timestamp() // max(SNAPSHOT_TTL, 1)),
+    )
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def task_analytics(request):
     """Get task analytics."""
-    user = request.user
-    now = timezone.now()
-    month_ago = now - timedelta(days=30)
+    tasks = apply_scope(Task.objects.all(), request.query_params, TASK_SCOPE)
     
     # Tasks by status
-    tasks_by_status = Task.objects.values('status').annotate(count=Count('id'))
+    tasks_by_status = tasks.values('status').annotate(count=Count('id')).order_by()
     
     # Tasks by priority
-    tasks_by_priority = Task.objects.values('priority').annotate(count=Count('id'))
+    tasks_by_priority = tasks.values('priority').annotate(count=Count('id')).order_by()
     
     # Tasks completion rate
-    total_tasks = Task.objects.count()
-    completed_tasks = Task.objects.filter(status='done').count()
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+    totals = tasks.aggregate(total=Count('id'), completed=Count('id', filter=Q(status='done')))
+    total_tasks = totals['total']
+    completion_rate = (totals['completed'] / total_tasks * 100) if total_tasks > 0 else 0
     
-    # Average completion time
-    completed_tasks_with_date = Task.objects.filter(
-        status='done',
-        completed_at__isnull=False,
-        created_at__isnull=False
-    )
-    avg_completion_time = None
-    if completed_tasks_with_date.exists():
-        # Calculate average days to complete
-        completion_times = []
-        for task in completed_tasks_with_date:
-            if task.completed_at and task.created_at:
-                delta = task.completed_at - task.created_at
-                completion_times.append(delta.days)
-        if completion_times:
-            avg_completion_time = sum(completion_times) / len(completion_times)
+    # Completion time distribution
+    completion_time = duration_stats(tasks.filter(status='done'), 'created_at', 'completed_at')
     
     # Tasks by assignee
-    tasks_by_assignee = Task.objects.filter(assignee__isnull=False).values(
+    tasks_by_assignee = tasks.filter(assignee__isnull=False).values(
         'assignee__first_name', 'assignee__last_name'
     ).annotate(count=Count('id')).order_by('-count')[:10]
     
@@ -119,7 +79,8 @@ def task_analytics(request):
         'by_status': list(tasks_by_status),
         'by_priority': list(tasks_by_priority),
         'completion_rate': round(completion_rate, 2),
-        'avg_completion_time_days': round(avg_completion_time, 2) if avg_completion_time else None,
+        'avg_completion_time_days': hours_to_days(completion_time['mean_hours']),
+        'completion_time': completion_time,
         'by_assignee': list(tasks_by_assignee),
     })
 
@@ -128,27 +89,167 @@ def task_analytics(request):
 @permission_classes([IsAuthenticated])
 def document_analytics(request):
     """Get document analytics."""
+    documents = apply_scope(Document.objects.all(), request.query_params, DOCUMENT_SCOPE)
+    
     # Documents by status
-    documents_by_status = Document.objects.values('status').annotate(count=Count('id'))
+    documents_by_status = documents.values('status').annotate(count=Count('id')).order_by()
     
     # Documents by type
-    documents_by_type = Document.objects.values('document_type__name').annotate(count=Count('id'))
+    documents_by_type = documents.values('document_type__name').annotate(count=Count('id')).order_by()
     
-    # Approval time statistics
-    approved_documents = Document.objects.filter(status='approved', approved_at__isnull=False)
-    avg_approval_time = None
-    if approved_documents.exists():
-        approval_times = []
-        for doc in approved_documents:
-            if doc.approved_at and doc.created_at:
-                delta = doc.approved_at - doc.created_at
-                approval_times.append(delta.days)
-        if approval_times:
-            avg_approval_time = sum(approval_times) / len(approval_times)
+    # Approval time distribution
+    approval_time = duration_stats(documents.filter(status='approved'), 'created_at', 'approved_at')
     
     return Response({
         'by_status': list(documents_by_status),
         'by_type': list(documents_by_type),
-        'avg_approval_time_days': round(avg_approval_time, 2) if avg_approval_time else None,
+        'avg_approval_time_days': hours_to_days(approval_time['mean_hours']),
+        'approval_time': approval_time,
     })
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def timeseries(request):
+    """Get daily counts from the rollup tables."""
+    params = request.query_params
+    entity = get_choice_param(params, 'entity', dict(ROLLUP_ENTITIES), 'task')
+    dimension = get_choice_param(params, 'dimension', dict(ROLLUP_DIMENSIONS), 'status')
+    date_from, date_to = _date_range(params)
+    
+    rollups = DailyRollup.objects.filter(
+        entity=entity, dimension=dimension, date__gte=date_from, date__lte=date_to
+    )
+    rollups = apply_scope(rollups, params, ROLLUP_SCOPE)
+    rows = rollups.values('date', 'value').annotate(count=Sum('count')).order_by('date', 'value')
+    
+    series = []
+    for row in rows:
+        if not series or series[-1]['date'] != row['date']:
+            series.append({'date': row['date'], 'total': 0, 'counts': {}})
+        point = series[-1]
+        point['counts'][row['value']] = row['count']
+        point['total'] += row['count']
+    
+    return Response({
+        'entity': entity,
+        'dimension': dimension,
+        'date_from': date_from,
+        'date_to': date_to,
+        'series': series,
+    })
+
+
+def _date_range(params, default_days=30):
+    date_to = get_date_param(params, 'date_to', timezone.localdate())
+    date_from = get_date_param(params, 'date_from', date_to - timedelta(days=default_days))
+    if date_from > date_to:
+        raise ValidationError({'date_from': 'Must not be later than date_to'})
+    return date_from, date_to
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_cumulative_flow(request, project_id):
+    """Get per-day task counts by status for a project."""
+    project = get_object_or_404(Project, pk=project_id)
+    date_from, date_to = _date_range(request.query_params)
+    return Response({
+        'project': project.id,
+        'date_from': date_from,
+        'date_to': date_to,
+        'series': cumulative_flow(project.id, date_from, date_to),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_burndown(request, project_id):
+    """Get remaining and completed task counts per day for a project."""
+    project = get_object_or_404(Project, pk=project_id)
+    date_from, date_to = _date_range(request.query_params)
+    return Response({
+        'project': project.id,
+        'date_from': date_from,
+        'date_to': date_to,
+        'end_date': project.end_date,
+        'series': burndown(project, date_from, date_to),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def project_forecast(request, project_id):
+    """Get P50/P85/P95 completion dates for the remaining tasks of a project."""
+    project = get_object_or_404(Project, pk=project_id)
+    return Response(get_forecast(project))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export(request):
+    """
+    Export a dataset as XLSX or PDF (``?dataset=tasks&file_format=pdf``).
+
+    Small exports are streamed in the response; larger ones are queued as an
+    ExportJob and ``202 Accepted`` is returned with the job to poll.
+    """
+    params = request.query_params
+    dataset_name = get_choice_param(params, 'dataset', DATASETS, 'tasks')
+    export_format = get_choice_param(params, 'file_format', dict(EXPORT_FORMATS), 'xlsx')
+    
+    dataset = DATASETS[dataset_name](params)
+    if dataset.count() > settings.EXPORT_SYNC_MAX_ROWS:
+        job = ExportJob.objects.create(
+            user=request.user,
+            dataset=dataset_name,
+            format=export_format,
+            params=params.dict(),
+        )
+        run_export.delay(job.id)
+        return Response(ExportJobSerializer(job, context={'request': request}).data, status=status.HTTP_202_ACCEPTED)
+    
+    fileobj, _ = write_export(dataset_name, export_format, params)
+    return FileResponse(
+        fileobj,
+        as_attachment=True,
+        filename=export_filename(dataset_name, export_format),
+        content_type=CONTENT_TYPES[export_format],
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_job(request, job_id):
+    """Get the state of a background export."""
+    job = get_object_or_404(ExportJob, pk=job_id, user=request.user)
+    return Response(ExportJobSerializer(job, context={'request': request}).data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def workflow_analytics(request):
+    """Get approval dwell times and queue depth per workflow step and approver."""
+    workflow_id = get_int_param(request.query_params, 'workflow')
+    return Response(get_bottlenecks(workflow_id))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def process_analytics(request):
+    """Get process throughput, node dwell times and the slowest running instances."""
+    params = request.query_params
+    days = get_int_param(params, 'days')
+    if days is None:
+        days = 30
+    elif not 1 <= days <= MAX_REPORT_DAYS:
+        raise ValidationError({'days': f'Expected a number of days from 1 to {MAX_REPORT_DAYS}'})
+    return Response(process_report(days=days, process_id=get_int_param(params, 'process')))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def department_analytics(request):
+    """Get task and document counters for every department and its subtree."""
+    department_id = get_int_param(request.query_params, 'department')
+    return Response(get_department_report(department_id))
@@ -0,0 +1,75 @@
+"""
+Approval workflow bottleneck analytics.
+
+Dwell time of an approval is the time from its creation (the document
+reaching the step) to the decision (``signed_at``, falling back to
+``updated_at`` for approvals decided before ``signed_at`` was recorded).
+Pending approvals have no dwell time yet; they are counted as queue depth
+in the same grouped query.
+"""
+from django.core.cache import cache
+from django.db.models import Case, Count, Min, Q, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from core.cache import versioned_key, model_version_name
+from documents.models import Approval, WorkflowStep
+from .durations import duration_stats
+
+CACHE_TTL = 60
+
+STEP_FIELDS = ['step_id', 'step__name', 'step__order', 'step__workflow_id']
+APPROVER_FIELDS = ['approver_id', 'approver__first_name', 'approver__last_name', 'approver__email']
+
+
+def _decided_at():
+    return Case(
+        When(status='pending', then=None),
+        default=Coalesce('signed_at', 'updated_at'),
+    )
+
+
+def _queue_aggregates():
+    pending = Q(status='pending')
+    return {
+        'pending': Count('pk', filter=pending),
+        'oldest_pending_at': Min('created_at', filter=pending),
+    }
+
+
+def _with_pending_age(rows, now):
+    for row in rows:
+        oldest = row.pop('oldest_pending_at')
+        row['oldest_pending_hours'] = round((now - oldest).total_seconds() / 3600, 2) if oldest else None
+    return rows
+
+
+def _grouped(approvals, group_by, now):
+    rows = duration_stats(approvals, 'created_at', _decided_at(), group_by=group_by, extra=_queue_aggregates())
+    return _with_pending_age(rows, now)
+
+
+def build_bottlenecks(workflow_id=None):
+    approvals = Approval.objects.all()
+    if workflow_id is not None:
+        approvals = approvals.filter(step__workflow_id=workflow_id)
+    now = timezone.now()
+
+    by_step = _grouped(approvals, STEP_FIELDS, now)
+    by_approver = _grouped(approvals, APPROVER_FIELDS, now)
+    by_step.sort(key=lambda row: (row['p90_hours'] is None, -(row['p90_hours'] or 0)))
+    by_approver.sort(key=lambda row: (-row['pending'], -(row['p90_hours'] or 0)))
+    return {'by_step': by_step, 'by_approver': by_approver}
+
+
+def get_bottlenecks(workflow_id=None):
+    """Cached bottleneck report; kept for ``CACHE_TTL`` seconds at most."""
+    key = versioned_key(
+        f'analytics:workflows:{workflow_id or "all"}',
+        model_version_name(Approval),
+        model_version_name(WorkflowStep),
+    )
+    report = cache.get(key)
+    if report is None:
+        report = build_bottlenecks(workflow_id)
+        cache.set(key, report, CACHE_TTL)
+    return report
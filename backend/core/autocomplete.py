@@ -0,0 +1,134 @@
+"""
+Autocomplete for pickers (tags, users, projects).
+
+Each kind is a registered queryset with the text fields it is matched on
+and a usage column.  A term matches where each of its words occurs in one of
+the fields, so "ivan pet" finds a user by first and last name; only when that
+leaves fewer rows than asked for are words also matched by similarity to a word
+of a field (``pg_trgm`` word similarity), which tolerates typos but can match
+many more rows.  Both are served by trigram GIN indexes on the fields.  Rows
+where every word starts a word come first, then closer matches, then the more
+used rows (more tasks tagged, assigned, in the project), and only a few columns
+are returned.
+
+Results are cached for ``AUTOCOMPLETE_CACHE_TTL`` seconds per term under the
+model's version, so new or renamed rows show at once; usage counts are kept
+by triggers, not signals, and the order may lag by that long.
+"""
+import hashlib
+import operator
+import re
+from dataclasses import dataclass
+from functools import reduce
+from django.conf import settings
+from django.contrib.postgres.search import TrigramStrictWordSimilarity
+from django.core.cache import cache
+from django.db.models import BooleanField, ExpressionWrapper, F, Func, Q, TextField
+from django.db.models.functions import Cast
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .cache import model_version_name, versioned_key
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 100
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+
+_sources = {}
+
+
+def search_text(*fields):
+    """
+    Text fields joined by spaces, for matching several fields as one.
+
+    Built with ``||`` on ``text`` rather than ``CONCAT``, which is not
+    immutable, so the expression can be indexed; the index must be on this
+    same expression.  A plain ``Func``, so migrations do not refer to this module.
+    """
+    return Func(
+        *(Cast(field, TextField()) for field in fields),
+        template='(%(expressions)s)', arg_joiner=" || ' ' || ", output_field=TextField(),
+    )
+
+
+@dataclass
+class Source:
+    queryset: object
+    text: object
+    usage: str
+    values: tuple
+
+
+def register(kind, queryset, fields, usage, values):
+    """
+    Serve ``kind`` from ``queryset``, matched on ``fields``, ranked by
+    ``usage``, as ``values``.  Several fields are matched as their
+    ``search_text``, which is what has to be trigram indexed.
+    """
+    text = F(fields[0]) if len(fields) == 1 else search_text(*fields)
+    _sources[kind] = Source(queryset, text, usage, tuple(values))
+
+
+def _contains(word, word_start=False):
+    # Python escapes are also literal in PostgreSQL regular expressions.  pg_trgm
+    # searches the index for the trigrams of a plain pattern, not of one with ``\m``.
+    return Q(autocomplete_text__iregex=(r'\m' if word_start else '') + re.escape(word))
+
+
+def _best(source, rows, words, limit):
+    word_start = reduce(operator.and_, (_contains(word, word_start=True) for word in words))
+    # Strict word similarity ranks "Petrov" above "Petrova" for "petrov".
+    similarity = reduce(operator.add, (
+        TrigramStrictWordSimilarity(word, 'autocomplete_text') for word in words
+    ))
+    rows = rows.annotate(
+        word_start=ExpressionWrapper(word_start, output_field=BooleanField()),
+        similarity=similarity,
+    ).order_by('-word_start', '-similarity', f'-{source.usage}', 'pk')
+    return list(rows.values(*source.values)[:limit])
+
+
+def suggest(kind, term, limit=DEFAULT_LIMIT):
+    """Best ``limit`` rows of ``kind`` for ``term``, as dictionaries; rows containing it first."""
+    source = _sources[kind]
+    words = term.split()
+    rows = source.queryset.alias(autocomplete_text=source.text)
+    contained = reduce(operator.and_, (_contains(word) for word in words))
+    items = _best(source, rows.filter(contained), words, limit)
+    if len(items) < limit:
+        similar = reduce(operator.and_, (
+            _contains(word) | Q(autocomplete_text__trigram_word_similar=word) for word in words
+        ))
+        items += _best(source, rows.filter(similar).exclude(contained), words, limit - len(items))
+    return items
+
+
+def cached_suggest(kind, term, limit=DEFAULT_LIMIT):
+    source = _sources[kind]
+    digest = hashlib.md5(term.lower().encode()).hexdigest()
+    key = versioned_key(f'autocomplete:{kind}:{limit}:{digest}', model_version_name(source.queryset.model))
+    items = cache.get(key)
+    if items is None:
+        items = suggest(kind, term, limit)
+        cache.set(key, items, settings.AUTOCOMPLETE_CACHE_TTL)
+    return items
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def autocomplete(request, kind):
+    """Suggestions for ``?q=``, at most ``?limit=``; none for terms under ``MIN_TERM_LENGTH`` characters."""
+    if kind not in _sources:
+        return Response({'error': f'Unknown kind {kind!r}'}, status=status.HTTP_404_NOT_FOUND)
+    term = ' '.join(request.query_params.get('q', '').split())[:MAX_TERM_LENGTH]
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= limit <= MAX_LIMIT:
+        return Response({'error': f'limit must be 1..{MAX_LIMIT}'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(term) < MIN_TERM_LENGTH:
+        return Response([])
+    return Response(cached_suggest(kind, term, limit))
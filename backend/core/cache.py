@@ -0,0 +1,74 @@
+"""
+Versioned cache helpers shared by the apps.
+
+Cached snapshots embed the version counters of the models they were built
+from; bumping a counter makes every dependent key unreachable, so nothing
+has to be deleted explicitly.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+VERSION_PREFIX = 'version'
+
+
+def _version_key(name):
+    return f'{VERSION_PREFIX}:{name}'
+
+
+def model_version_name(model):
+    """Name of the version counter for a model (e.g. ``tasks.task``)."""
+    return model._meta.label_lower
+
+
+def get_versions(*names):
+    """Return current versions for the given counters, initialising missing ones."""
+    keys = [_version_key(name) for name in names]
+    found = cache.get_many(keys)
+    missing = {key: 1 for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump_version(*names):
+    """Increment version counters, invalidating every key built on them."""
+    for name in names:
+        key = _version_key(name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, timeout=None)
+
+
+def bump_model_version(*models):
+    bump_version(*(model_version_name(model) for model in models))
+
+
+def versioned_key(prefix, *names):
+    """Build a cache key that changes whenever one of the counters is bumped."""
+    versions = get_versions(*names)
+    suffix = '.'.join(str(version) for version in versions)
+    return f'{prefix}:v{suffix}'
+
+
+def _bump_sender_version(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def _bump_m2m_version(sender, instance, action, model, reverse, **kwargs):
+    # The counter of the model declaring the field; ``instance`` is on the other side when reversed.
+    if action.startswith('post_'):
+        bump_model_version(model if reverse else type(instance))
+
+
+def track_model_versions(*models):
+    """Bump a model's version counter on every save, delete and many-to-many change."""
+    for model in models:
+        uid = f'model-version-{model_version_name(model)}'
+        post_save.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender_version, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                _bump_m2m_version, sender=field.remote_field.through, dispatch_uid=f'{uid}-{field.name}'
+            )
@@ -0,0 +1,88 @@
+"""
+Conditional GET for API views.
+
+A response is identified by the version counters (see ``core.cache``) of
+the models it is built from, the user and the full request path, so its
+ETag is known before anything is queried or serialized.  The time an ETag
+is first served is remembered and sent as ``Last-Modified``.  Requests whose
+``If-None-Match`` or ``If-Modified-Since`` still matches get
+``304 Not Modified``; the browser then reuses the body it has.
+"""
+import hashlib
+import time
+from functools import partial
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from .cache import get_versions, model_version_name
+
+LAST_MODIFIED_TTL = 60 * 60 * 24 * 7
+
+
+def get_etag(request, version_names, *parts):
+    """Weak ETag of a response built from the counters in ``version_names``."""
+    versions = get_versions(*version_names) if version_names else []
+    identity = [
+        *parts, request.user.pk, request.get_full_path(), request.headers.get('Accept', ''),
+        *version_names, *versions,
+    ]
+    return 'W/"%s"' % hashlib.md5('|'.join(map(str, identity)).encode()).hexdigest()
+
+
+def conditional_response(request, version_names, build, *parts):
+    """
+    ``build()``, or ``304 Not Modified`` when the client's copy is current.
+
+    ``version_names`` must cover every model the response reads; ``parts``
+    tell apart responses of different views for the same path.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return build()
+    etag = get_etag(request, version_names, *parts)
+    key = f'conditional:{etag}'
+    last_modified = cache.get(key)
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build()
+        if response.status_code != 200:
+            return response
+        if last_modified is None:
+            last_modified = int(time.time())
+            if not cache.add(key, last_modified, LAST_MODIFIED_TTL):
+                last_modified = cache.get(key, last_modified)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified for ``list`` and ``retrieve`` of a viewset.
+
+    Responses depend on the viewset's model and ``conditional_models`` (the
+    models its serializer can expand or annotate) and, for responses that
+    also depend on the time, on ``get_conditional_parts()``; actions return
+    ``self.conditional(request, build)`` to get the same treatment.
+    """
+    conditional_models = ()
+
+    def get_conditional_versions(self):
+        return [model_version_name(model) for model in (self.queryset.model, *self.conditional_models)]
+
+    def get_conditional_parts(self):
+        return []
+
+    def conditional(self, request, build):
+        return conditional_response(
+            request, self.get_conditional_versions(), build, type(self).__name__, self.action,
+            *self.get_conditional_parts(),
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, partial(super().retrieve, request, *args, **kwargs))
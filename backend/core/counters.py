@@ -0,0 +1,217 @@
+"""
+Child-row counters kept by the database.
+
+A ``CounterField`` holds the number of rows of a reverse foreign key
+(``Task.comment_count`` counts ``Task.comments``) or of a reverse
+many-to-many relation (``Tag.task_count`` counts ``Tag.tasks``, i.e. rows
+of the join table), so lists read a column
+instead of joining and grouping the children.  The counter is maintained by
+statement-level triggers on the child table, added by the
+``CreateCounterTriggers`` migration operation: every ``INSERT``, ``DELETE``
+or ``UPDATE`` moving children adjusts the affected parents with one
+``UPDATE`` per statement, in the same transaction.  A guard trigger keeps
+ordinary saves of the parent, which write back the value they loaded, from
+overwriting it.  ``recount`` (the ``repair_counters`` command) recomputes
+counters in bulk should they drift, e.g. after rows were copied in with
+triggers disabled.
+"""
+from django.apps import apps
+from django.db import connections, models, transaction
+from django.db.migrations.operations.base import Operation
+
+REPAIR_SETTING = 'counters.repair'
+RECOUNT_BATCH_SIZE = 10000
+
+# ``new_rows``/``old_rows`` are the transition tables of the statement.
+COUNTER_SQL = '''
+    CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {insert}
+        ELSIF TG_OP = 'DELETE' THEN
+            {delete}
+        ELSE
+            {update}
+        END IF;
+        RETURN NULL;
+    END $$;
+    CREATE TRIGGER {on_insert} AFTER INSERT ON {child}
+        REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    CREATE TRIGGER {on_delete} AFTER DELETE ON {child}
+        REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+    CREATE TRIGGER {on_update} AFTER UPDATE ON {child}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+
+    CREATE OR REPLACE FUNCTION {guard}() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF pg_trigger_depth() < 2 AND current_setting('{setting}', true) IS DISTINCT FROM 'on' THEN
+            NEW.{column} := OLD.{column};
+        END IF;
+        RETURN NEW;
+    END $$;
+    CREATE TRIGGER {guard} BEFORE UPDATE OF {column} ON {parent}
+        FOR EACH ROW EXECUTE FUNCTION {guard}();
+'''
+ADJUST_SQL = '''
+            UPDATE {parent} SET {column} = {parent}.{column} + delta.value
+            FROM ({rows}) delta
+            WHERE {parent}.{key} = delta.key;'''
+DROP_SQL = '''
+    DROP TRIGGER IF EXISTS {on_insert} ON {child};
+    DROP TRIGGER IF EXISTS {on_delete} ON {child};
+    DROP TRIGGER IF EXISTS {on_update} ON {child};
+    DROP TRIGGER IF EXISTS {guard} ON {parent};
+    DROP FUNCTION IF EXISTS {function}();
+    DROP FUNCTION IF EXISTS {guard}();
+'''
+RECOUNT_SQL = '''
+    UPDATE {parent} SET {column} = counted.value
+    FROM (
+        SELECT {parent}.{key} AS key, count({child}.{fk}) AS value
+        FROM {parent} LEFT JOIN {child} ON {child}.{fk} = {parent}.{key}
+        {where}
+        GROUP BY {parent}.{key}
+    ) counted
+    WHERE {parent}.{key} = counted.key AND {parent}.{column} <> counted.value
+'''
+
+
+class CounterField(models.PositiveIntegerField):
+    """Number of rows of the reverse relation ``counts``; read-only to the application."""
+
+    def __init__(self, *args, counts=None, **kwargs):
+        self.counts = counts
+        kwargs.setdefault('default', 0)
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['counts'] = self.counts
+        kwargs.pop('editable', None)
+        if kwargs.get('default') == 0:
+            del kwargs['default']
+        return name, path, args, kwargs
+
+
+def _names(model, field, quote_name):
+    """SQL identifiers of a counter: parent and child tables and their columns."""
+    relation = model._meta.get_field(field.counts)
+    if relation.many_to_many:
+        child = relation.through
+        foreign_key = child._meta.get_field(relation.field.m2m_reverse_field_name())
+    else:
+        child = relation.related_model
+        foreign_key = relation.field
+    function = f'{model._meta.db_table}_{field.column}'
+    return {
+        'function': quote_name(function),
+        'guard': quote_name(f'{function}_guard'),
+        **{f'on_{event}': quote_name(f'{function}_{event}') for event in ('insert', 'delete', 'update')},
+        'parent': quote_name(model._meta.db_table),
+        'column': quote_name(field.column),
+        'key': quote_name(foreign_key.target_field.column),
+        'child': quote_name(child._meta.db_table),
+        'fk': quote_name(foreign_key.column),
+    }
+
+
+def counter_sql(model, field, quote_name):
+    names = _names(model, field, quote_name)
+    rows = {
+        'insert': 'SELECT {fk} AS key, count(*) AS value FROM new_rows WHERE {fk} IS NOT NULL GROUP BY {fk}',
+        'delete': 'SELECT {fk} AS key, -count(*) AS value FROM old_rows WHERE {fk} IS NOT NULL GROUP BY {fk}',
+        # Updates that leave the key alone cancel out.
+        'update': (
+            'SELECT key, sum(value) AS value FROM ('
+            'SELECT {fk} AS key, 1 AS value FROM new_rows UNION ALL SELECT {fk}, -1 FROM old_rows'
+            ') moved WHERE key IS NOT NULL GROUP BY key HAVING sum(value) <> 0'
+        ),
+    }
+    adjust = {op: ADJUST_SQL.format(rows=sql.format(**names), **names).strip() for op, sql in rows.items()}
+    return COUNTER_SQL.format(setting=REPAIR_SETTING, **names, **adjust), DROP_SQL.format(**names)
+
+
+def _recount_sql(names, batched):
+    where = 'WHERE {parent}.{key} >= %s AND {parent}.{key} < %s'.format(**names) if batched else ''
+    return RECOUNT_SQL.format(where=where, **names)
+
+
+def _recount(cursor, sql, params=()):
+    """Run a recount with the guard off; ``cursor`` may be a schema editor (which also collects SQL)."""
+    cursor.execute('SELECT set_config(%s, %s, true)', [REPAIR_SETTING, 'on'])
+    cursor.execute(sql, params)
+    fixed = getattr(cursor, 'rowcount', None)
+    cursor.execute('SELECT set_config(%s, %s, true)', [REPAIR_SETTING, 'off'])
+    return fixed
+
+
+def recount(model, field_name, batch_size=RECOUNT_BATCH_SIZE, using='default'):
+    """
+    Recompute ``model.field_name`` from the children; returns how many rows were off.
+
+    Parents are recounted ``batch_size`` primary keys at a time, each batch in
+    its own transaction, so rows are only locked briefly.  Children written
+    concurrently with a batch may be missed; run it while the tables are quiet.
+    """
+    connection = connections[using]
+    field = model._meta.get_field(field_name)
+    sql = _recount_sql(_names(model, field, connection.ops.quote_name), batched=True)
+    bounds = model._base_manager.using(using).aggregate(low=models.Min('pk'), high=models.Max('pk'))
+    if bounds['low'] is None:
+        return 0
+    fixed = 0
+    for low in range(bounds['low'], bounds['high'] + 1, batch_size):
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            fixed += _recount(cursor, sql, [low, low + batch_size])
+    return fixed
+
+
+def counter_fields():
+    """``(model, field)`` for every counter of the installed apps."""
+    return [
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, CounterField)
+    ]
+
+
+class CreateCounterTriggers(Operation):
+    """Install the triggers of a ``CounterField`` added earlier in the migration, and fill it."""
+    reversible = True
+
+    def __init__(self, model_name, name):
+        self.model_name = model_name
+        self.name = name
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'model_name': self.model_name, 'name': self.name}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _model(self, app_label, state):
+        model = state.apps.get_model(app_label, self.model_name)
+        return model, model._meta.get_field(self.name)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model, field = self._model(app_label, to_state)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        create, _ = counter_sql(model, field, schema_editor.quote_name)
+        schema_editor.execute(create)
+        # In one go: creating the triggers has locked the child table anyway.
+        _recount(schema_editor, _recount_sql(_names(model, field, schema_editor.quote_name), batched=False))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model, field = self._model(app_label, from_state)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(counter_sql(model, field, schema_editor.quote_name)[1])
+
+    def describe(self):
+        return f'Create counter triggers for {self.model_name}.{self.name}'
+
+    @property
+    def migration_name_fragment(self):
+        return f'{self.model_name.lower()}_{self.name}_triggers'
@@ -0,0 +1,68 @@
+"""
+Approximate row counts for large tables.
+
+An exact ``COUNT(*)`` scans the whole table (or index) on PostgreSQL.  When a
+total only needs to be roughly right (page counts, "about N tasks"), the
+planner's statistics are good enough: ``pg_class.reltuples`` for an
+unfiltered table and the row estimate of ``EXPLAIN`` for a filtered query.
+Estimates below ``APPROXIMATE_COUNT_THRESHOLD`` are replaced by an exact
+count, which is cheap at that size and keeps small lists precise.
+"""
+import json
+from django.conf import settings
+from django.db import connections
+
+
+def _threshold(threshold):
+    return settings.APPROXIMATE_COUNT_THRESHOLD if threshold is None else threshold
+
+
+def _table_estimate(connection, model):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that have never been analyzed.
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+def _plan_estimate(connection, queryset):
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _is_unfiltered(queryset):
+    query = queryset.query
+    return not query.where and not query.distinct and not query.is_sliced
+
+
+def estimate_count(queryset, threshold=None):
+    """
+    Return ``(count, is_exact)`` for ``queryset``.
+
+    The planner estimate is used when it is at least ``threshold`` rows;
+    otherwise (and on databases other than PostgreSQL) the exact count is.
+    """
+    connection = connections[queryset.db]
+    threshold = _threshold(threshold)
+    if connection.vendor != 'postgresql' or queryset.query.is_sliced:
+        return queryset.count(), True
+
+    estimate = _table_estimate(connection, queryset.model)
+    if estimate is not None and estimate >= threshold and not _is_unfiltered(queryset):
+        estimate = _plan_estimate(connection, queryset)
+    if estimate is None or estimate < threshold:
+        return queryset.count(), True
+    return estimate, False
+
+
+def approximate_count(queryset, threshold=None):
+    """Row count of ``queryset``; estimated by the planner for large results."""
+    return estimate_count(queryset, threshold)[0]
@@ -0,0 +1,24 @@
+"""
+Management command to recompute denormalized counters.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from core.counters import RECOUNT_BATCH_SIZE, counter_fields, recount
+
+
+class Command(BaseCommand):
+    help = 'Recompute trigger-maintained counter columns from the rows they count'
+
+    def add_arguments(self, parser):
+        parser.add_argument('counters', nargs='*', help='Counters as app_label.model.field (default: all)')
+        parser.add_argument('--batch-size', type=int, default=RECOUNT_BATCH_SIZE, help='Parents per transaction')
+
+    def handle(self, *args, **options):
+        counters = {f'{model._meta.label_lower}.{field.name}': (model, field) for model, field in counter_fields()}
+        names = options['counters'] or sorted(counters)
+        unknown = set(names) - set(counters)
+        if unknown:
+            raise CommandError(f'Unknown counters: {", ".join(sorted(unknown))}')
+        for name in names:
+            model, field = counters[name]
+            fixed = recount(model, field.name, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{name}: {fixed} row(s) fixed'))
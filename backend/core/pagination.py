@@ -0,0 +1,258 @@
+"""
+Pagination classes shared by the apps.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from .counting import estimate_count
+
+
+class ApproximatePage(Page):
+    """Page that knows from its own rows whether another one follows."""
+    more = None
+
+    def has_next(self):
+        return super().has_next() if self.more is None else self.more
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator whose total comes from ``estimate_count``.
+
+    An estimate may fall short of the real count, so with one pages are not
+    limited to ``num_pages``: a page reads one row more than it shows to
+    tell whether a next page exists, and only an empty page past the
+    estimate is refused.  ``orphans`` only apply to exact counts.
+    """
+
+    @cached_property
+    def _estimate(self):
+        if hasattr(self.object_list, 'query'):
+            return estimate_count(self.object_list)
+        return len(self.object_list), True
+
+    @cached_property
+    def count(self):
+        return self._estimate[0]
+
+    @property
+    def count_is_exact(self):
+        return self._estimate[1]
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.count_is_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > self.num_pages:
+            raise EmptyPage('That page contains no results')
+        page = self._get_page(rows[:self.per_page], number, self)
+        page.more = len(rows) > self.per_page
+        return page
+
+    def _get_page(self, *args, **kwargs):
+        return ApproximatePage(*args, **kwargs)
+
+
+class ApproximateCountPagination(PageNumberPagination):
+    """
+    Page number pagination that avoids ``COUNT(*)`` over large tables.
+
+    ``count`` is a planner estimate once the result is larger than
+    ``APPROXIMATE_COUNT_THRESHOLD``; ``count_is_exact`` tells the client which.
+    """
+    django_paginator_class = ApproximateCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_is_exact': self.page.paginator.count_is_exact,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['count_is_exact'] = {'type': 'boolean'}
+        return schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row instead of using ``OFFSET``.
+
+    The cursor carries the ordering values of the row a page ends (or, going
+    back, starts) at, so every page is one range scan of an index matching
+    the ordering.  The ordering is the queryset's own, made total by the
+    primary key; it may only use non-null fields of the model itself, other
+    orderings fall back to the view's (or model's) default one.  No count is
+    returned.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        self.fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+        values, reverse = self.decode_cursor(request)
+
+        ordering = [self._flip(name) for name in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            # A sparse fieldset must still load the cursor position.
+            queryset = queryset.only(*loaded, *(field.name for field in self.fields))
+        if values is not None:
+            queryset = queryset.filter(self._seek(ordering, values))
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if reverse:
+            page.reverse()
+
+        self.next_position = self.previous_position = None
+        if page and (has_more if not reverse else values is not None):
+            self.next_position = self._position(page[-1])
+        if page and (has_more if reverse else values is not None):
+            self.previous_position = self._position(page[0])
+        return page
+
+    def get_ordering(self, queryset, view=None):
+        candidates = [
+            list(queryset.query.order_by),
+            list(getattr(view, 'ordering', None) or []),
+            list(queryset.model._meta.ordering),
+        ]
+        for ordering in candidates:
+            if ordering and self._is_keyset_ordering(queryset.model, ordering):
+                break
+        else:
+            ordering = []
+        pk = queryset.model._meta.pk.name
+        ordering = [name.replace('pk', pk) if name.lstrip('-') == 'pk' else name for name in ordering]
+        if pk not in [name.lstrip('-') for name in ordering]:
+            ordering.append(f'-{pk}' if ordering and ordering[-1].startswith('-') else pk)
+        return ordering
+
+    @staticmethod
+    def _is_keyset_ordering(model, ordering):
+        for name in ordering:
+            if not isinstance(name, str) or name == '?':
+                return False
+            name = name.lstrip('-')
+            if name == 'pk':
+                continue
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+            if not field.concrete or field.null:
+                return False
+        return True
+
+    @staticmethod
+    def _flip(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    @staticmethod
+    def _seek(ordering, values):
+        """Rows after ``values`` in ``ordering``, led by a bound on the first field for the index."""
+        condition, equal = Q(), {}
+        for name, value in zip(ordering, values):
+            field = name.lstrip('-')
+            condition |= Q(**equal, **{f'{field}__{"lt" if name.startswith("-") else "gt"}': value})
+            equal[field] = value
+        first = ordering[0]
+        bound = Q(**{f'{first.lstrip("-")}__{"lte" if first.startswith("-") else "gte"}': values[0]})
+        return bound & condition
+
+    def _position(self, obj):
+        # ``value_to_string`` keeps full precision (e.g. microseconds), ``to_python`` reads it back.
+        return [field.value_to_string(obj) for field in self.fields]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values = [field.to_python(value) for field, value in zip(self.fields, cursor['v'], strict=True)]
+            return values, bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, ValidationError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, position, reverse=False):
+        cursor = json.dumps({'v': position, 'r': int(reverse)}, separators=(',', ':'))
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, urlsafe_b64encode(cursor.encode()).decode('ascii'))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class PageOrCursorPagination(ApproximateCountPagination):
+    """
+    Page numbers by default, keyset pages on request.
+
+    ``?pagination=cursor`` starts keyset pagination; its ``next`` and
+    ``previous`` links carry a ``cursor`` parameter, which keeps it selected.
+    """
+    keyset_class = KeysetPagination
+    mode_query_param = 'pagination'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        params = request.query_params
+        if params.get(self.mode_query_param) == 'cursor' or self.keyset_class.cursor_query_param in params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,106 @@
+"""
+PostgreSQL full-text search shared by the apps.
+
+A registered model keeps a ``search_vector`` column (GIN indexed) built in
+the database from its text fields, with HTML tags and character references
+stripped, under both the Russian and the English configuration.  It is
+refreshed by a single ``UPDATE`` after every save touching those fields;
+bulk writes call ``reindex`` themselves.
+"""
+import operator
+from functools import reduce
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Func, TextField
+from django.db.models.signals import post_save
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+SEARCH_CONFIGS = ('russian', 'english')
+HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_words': 30,
+    'min_words': 10,
+    'max_fragments': 2,
+}
+
+_weights = {}
+
+
+class StripTags(Func):
+    """Text with HTML tags and character references replaced by spaces."""
+    template = (
+        "regexp_replace(regexp_replace(%(expressions)s, '<[^>]*>', ' ', 'g'), "
+        "'&#?[a-zA-Z0-9]+;', ' ', 'g')"
+    )
+    output_field = TextField()
+
+
+def search_vector(weights):
+    """Expression building the vector from ``weights`` (field name -> weight ``A``-``D``)."""
+    return reduce(operator.add, (
+        SearchVector(StripTags(F(field)), config=config, weight=weight)
+        for field, weight in weights.items()
+        for config in SEARCH_CONFIGS
+    ))
+
+
+def reindex(queryset):
+    """Rebuild ``search_vector`` for every row of ``queryset`` in one statement."""
+    return queryset.update(search_vector=search_vector(_weights[queryset.model]))
+
+
+def _update_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(_weights[sender]):
+        return
+    reindex(sender._base_manager.filter(pk=instance.pk))
+
+
+def register(model, weights):
+    """Keep ``model.search_vector`` in sync with the fields in ``weights``."""
+    _weights[model] = dict(weights)
+    post_save.connect(_update_search_vector, sender=model, dispatch_uid=f'search:{model._meta.label_lower}')
+
+
+def search_query(terms):
+    """Web-search style query (quotes, ``or``, ``-``) matched in any configuration."""
+    return reduce(operator.or_, (
+        SearchQuery(terms, config=config, search_type='websearch') for config in SEARCH_CONFIGS
+    ))
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Full-text replacement for ``SearchFilter``, using the same ``search`` parameter.
+
+    Matching rows get ``search_rank`` and, when the view sets
+    ``search_headline_field``, a ``search_headline`` snippet with the matches
+    highlighted.  Results are ordered by rank unless ``ordering`` is given,
+    so the backend goes after ``OrderingFilter``.
+    """
+    search_param = api_settings.SEARCH_PARAM
+    ordering_param = api_settings.ORDERING_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return queryset
+
+        query = search_query(terms)
+        queryset = queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F('search_vector'), query))
+        headline_field = getattr(view, 'search_headline_field', None)
+        if headline_field:
+            queryset = queryset.annotate(search_headline=SearchHeadline(
+                StripTags(F(headline_field)), query, config=SEARCH_CONFIGS[0], **HEADLINE_OPTIONS,
+            ))
+        if self.ordering_param not in request.query_params:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
+
+
+class SearchResultSerializerMixin(serializers.Serializer):
+    """Adds ``search_rank`` and ``search_headline`` to results of a full-text search."""
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
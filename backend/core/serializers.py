@@ -0,0 +1,161 @@
+"""
+Sparse fieldsets and on-demand expansion shared by the apps.
+
+``?fields=id,title,project.name`` limits a response to the listed fields and
+``?expand=project.manager,tags`` renders the listed relations as nested
+objects.  Relations named in a serializer's ``Meta.expandable_fields`` are
+otherwise rendered as primary keys.  ``DynamicFieldsViewMixin`` shapes the
+view's queryset to match: expanded relations are joined or prefetched, the
+others are not, and with ``fields`` only the needed columns are loaded.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_paths(paths):
+    """``'a,b.c,b.d'`` (or a list of such paths) as ``{'a': [], 'b': ['c', 'd']}``."""
+    if isinstance(paths, str):
+        paths = paths.split(',')
+    tree = {}
+    for path in paths:
+        head, _, rest = path.strip().partition('.')
+        if head:
+            children = tree.setdefault(head, [])
+            if rest:
+                children.append(rest)
+    return tree
+
+
+class DynamicFieldsMixin:
+    """
+    ``fields`` and ``expand`` for a model serializer.
+
+    Both are given as keyword arguments (paths, as in the query string) or,
+    for the serializer at the root of a response, read from the request.
+    ``Meta.expandable_fields`` maps a relation to ``(serializer, options)``;
+    the serializer may be given by dotted path and ``options`` go to it
+    (``{'many': True}`` for to-many relations).  Unexpanded, the relation is
+    the primary key field ``ModelSerializer`` builds for it, so relations that
+    are not written through it belong in ``read_only_fields``.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._only = parse_paths(fields) if fields else None
+        self._expand = parse_paths(expand) if expand is not None else None
+
+    def _is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_shape(self):
+        """``(fields, expand)`` path trees; ``fields`` is ``None`` when not limited."""
+        if self._only is not None or self._expand is not None:
+            return self._only, self._expand or {}
+        request = self.context.get('request')
+        if request is not None and self._is_root():
+            params = request.query_params
+            only = parse_paths(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM) else None
+            return only, parse_paths(params.get(EXPAND_PARAM, ''))
+        return None, {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self.get_shape()
+        for name, (serializer_class, options) in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name not in fields:
+                continue
+            if name in expand:
+                if isinstance(serializer_class, str):
+                    serializer_class = import_string(serializer_class)
+                nested_fields = only.get(name) if only is not None else None
+                fields[name] = serializer_class(read_only=True, fields=nested_fields, expand=expand[name], **options)
+            elif isinstance(fields[name], serializers.BaseSerializer):
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, many=options.get('many', False))
+
+        if only is not None:
+            for name in list(fields):
+                if name not in only and not fields[name].write_only:
+                    del fields[name]
+        return fields
+
+
+def _nested(field):
+    """The serializer behind an expanded field, and whether it is to-many."""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, serializers.BaseSerializer):
+        return field, False
+    return None, isinstance(field, serializers.ManyRelatedField)
+
+
+def _plan(serializer, model, prefix, annotations, plan):
+    """
+    Collect ``select_related``/``prefetch_related``/``only`` lookups for ``serializer``.
+
+    Returns whether the columns of this level could be restricted: fields
+    backed by properties or methods may read any column.
+    """
+    columns, restricted = {model._meta.pk.name}, True
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            restricted = False
+            continue
+        name = field.source_attrs[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            restricted = restricted and name in annotations
+            continue
+
+        nested, many = _nested(field)
+        if many or model_field.one_to_many or model_field.many_to_many:
+            related = model_field.related_model._default_manager.all()
+            # Rows of a reverse foreign key are matched to their parents by that key.
+            parent_key = [model_field.field.name] if model_field.one_to_many else []
+            if nested is not None:
+                related = shape_queryset(related, nested, parent_key)
+            else:
+                related = related.only('pk', *parent_key)
+            plan['prefetch'].append(Prefetch(prefix + name, queryset=related))
+            continue
+
+        columns.add(name)
+        if nested is not None and model_field.is_relation:
+            plan['select'].append(prefix + name)
+            _plan(nested, model_field.related_model, f'{prefix}{name}__', {}, plan)
+    if restricted:
+        plan['only'].extend(prefix + column for column in columns)
+    return restricted
+
+
+def shape_queryset(queryset, serializer, columns=()):
+    """``queryset`` joined, prefetched and deferred for what ``serializer`` renders (plus ``columns``)."""
+    plan = {'select': [], 'prefetch': [], 'only': []}
+    restricted = _plan(serializer, queryset.model, '', queryset.query.annotations, plan)
+    queryset = queryset.select_related(None)
+    if plan['select']:
+        queryset = queryset.select_related(*plan['select'])
+    queryset = queryset.prefetch_related(None).prefetch_related(*plan['prefetch'])
+    only, _ = serializer.get_shape() if isinstance(serializer, DynamicFieldsMixin) else (None, None)
+    if only is not None and restricted:
+        queryset = queryset.only(*plan['only'], *columns)
+    return queryset
+
+
+class DynamicFieldsViewMixin:
+    """Shapes ``get_queryset()`` of read requests for the requested ``fields``/``expand``."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            queryset = shape_queryset(queryset, self.get_serializer())
+        return queryset
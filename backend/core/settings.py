@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third party
     'rest_framework',
@@ -32,12 +33,14 @@ INSTALLED_APPS = [
     'ckeditor_uploader',
     
     # Local apps
+    'core',
     'users',
     'tasks',
     'documents',
     'processes',
     'analytics',
     'notifications',
+    'activity',
 ]
 
 MIDDLEWARE = [
@@ -48,6 +51,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'activity.middleware.ActivityActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -94,6 +98,21 @@ CACHES = {
     }
 }
 
+# Analytics
+DASHBOARD_SNAPSHOT_TTL = int(os.getenv('DASHBOARD_SNAPSHOT_TTL', '60'))  # seconds
+ROLLUP_WATERMARK_OVERLAP = int(os.getenv('ROLLUP_WATERMARK_OVERLAP', '300'))  # seconds
+EXPORT_SYNC_MAX_ROWS = int(os.getenv('EXPORT_SYNC_MAX_ROWS', '5000'))  # larger exports run in background
+EXPORT_PDF_FONT = os.getenv('EXPORT_PDF_FONT', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf')  # needs Cyrillic glyphs
+APPROXIMATE_COUNT_THRESHOLD = int(os.getenv('APPROXIMATE_COUNT_THRESHOLD', '10000'))  # smaller results are counted exactly
+FORECAST_SIMULATIONS = int(os.getenv('FORECAST_SIMULATIONS', '10000'))
+FORECAST_HISTORY_DAYS = int(os.getenv('FORECAST_HISTORY_DAYS', '90'))  # throughput sample window
+RECURRENCE_HORIZON_DAYS = int(os.getenv('RECURRENCE_HORIZON_DAYS', '30'))  # recurring task occurrences created ahead
+REMINDER_DUE_SOON_HOURS = int(os.getenv('REMINDER_DUE_SOON_HOURS', '24'))  # "due soon" reminder ahead of the due date
+REMINDER_OVERDUE_DAYS = int(os.getenv('REMINDER_OVERDUE_DAYS', '7'))  # overdue tasks older than this are not reminded
+ACTIVITY_PARTITIONS_AHEAD = int(os.getenv('ACTIVITY_PARTITIONS_AHEAD', '2'))  # monthly activity log partitions created ahead
+ACTIVITY_RETENTION_MONTHS = int(os.getenv('ACTIVITY_RETENTION_MONTHS', '24'))  # older months are dropped; 0 keeps all
+AUTOCOMPLETE_CACHE_TTL = int(os.getenv('AUTOCOMPLETE_CACHE_TTL', '30'))  # seconds a term's suggestions are reused
+
 # Channels
 CHANNEL_LAYERS = {
     'default': {
@@ -196,3 +215,25 @@ EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 
+# Celery
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', REDIS_URL)
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_BEAT_SCHEDULE = {
+    'refresh-analytics-rollups': {
+        'task': 'analytics.tasks.refresh_analytics_rollups',
+        'schedule': timedelta(minutes=15),
+    },
+    'materialize-recurring-tasks': {
+        'task': 'tasks.tasks.materialize_recurring_tasks',
+        'schedule': timedelta(hours=1),
+    },
+    'send-task-reminders': {
+        'task': 'notifications.tasks.send_task_reminders',
+        'schedule': timedelta(minutes=15),
+    },
+    'maintain-activity-partitions': {
+        'task': 'activity.tasks.maintain_activity_partitions',
+        'schedule': timedelta(days=1),
+    },
+}
@@ -6,6 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from core.autocomplete import autocomplete
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -17,6 +18,8 @@ urlpatterns = [
     path('api/processes/', include('processes.urls')),
     path('api/analytics/', include('analytics.urls')),
     path('api/notifications/', include('notifications.urls')),
+    path('api/activity/', include('activity.urls')),
+    path('api/autocomplete/<str:kind>/', autocomplete, name='autocomplete'),
     path('ckeditor/', include('ckeditor_uploader.urls')),
 ]
 
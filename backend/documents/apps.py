@@ -4,4 +4,10 @@ from django.apps import AppConfig
 class DocumentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documents'
+    
+    def ready(self):
+        from core.search import register
+        from .models import DOCUMENT_SEARCH_WEIGHTS
+        register(self.get_model('Document'), DOCUMENT_SEARCH_WEIGHTS)
+        import documents.signals  # noqa
 
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_document_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='approval',
+            index=models.Index(fields=['step', 'status'], name='documents_a_step_id_52e28a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='approval',
+            index=models.Index(fields=['approver', 'status'], name='documents_a_approve_aa53a4_idx'),
+        ),
+    ]
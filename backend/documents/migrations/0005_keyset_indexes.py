@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0004_approval_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-created_at', '-id'], name='documents_d_created_c7041d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentcomment',
+            index=models.Index(fields=['document', '-created_at', '-id'], name='documents_d_documen_eea910_idx'),
+        ),
+    ]
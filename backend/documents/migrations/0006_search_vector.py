@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:40
+
+import operator
+from functools import reduce
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# The vector built by core.search at the time of this migration.
+SEARCH_CONFIGS = ('russian', 'english')
+STRIP_TAGS = (
+    "regexp_replace(regexp_replace(%(expressions)s, '<[^>]*>', ' ', 'g'), "
+    "'&#?[a-zA-Z0-9]+;', ' ', 'g')"
+)
+SEARCH_WEIGHTS = {'title': 'A', 'description': 'B'}
+
+
+def search_vector(weights):
+    return reduce(operator.add, (
+        django.contrib.postgres.search.SearchVector(
+            models.Func(models.F(field), template=STRIP_TAGS, output_field=models.TextField()),
+            config=config, weight=weight,
+        )
+        for field, weight in weights.items()
+        for config in SEARCH_CONFIGS
+    ))
+
+
+def index_existing(apps, schema_editor):
+    apps.get_model('documents', 'Document').objects.update(search_vector=search_vector(SEARCH_WEIGHTS))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='documents_d_search__05a045_gin'),
+        ),
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
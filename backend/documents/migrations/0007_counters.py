@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:15
+
+import core.counters
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0006_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='approval_count',
+            field=core.counters.CounterField(counts='approvals', verbose_name='Согласований'),
+        ),
+        migrations.AddField(
+            model_name='document',
+            name='comment_count',
+            field=core.counters.CounterField(counts='comments', verbose_name='Комментариев'),
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='document',
+            name='approval_count',
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='document',
+            name='comment_count',
+        ),
+    ]
@@ -2,8 +2,11 @@
 Document workflow models.
 """
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from core.counters import CounterField
 
 User = get_user_model()
 
@@ -15,6 +18,9 @@ DOCUMENT_STATUSES = [
     ('archived', _('Архивирован')),
 ]
 
+# Full-text search weights (see ``core.search``).
+DOCUMENT_SEARCH_WEIGHTS = {'title': 'A', 'description': 'B'}
+
 
 class DocumentType(models.Model):
     """Document type model."""
@@ -78,14 +84,23 @@ class Document(models.Model):
     status = models.CharField(max_length=20, choices=DOCUMENT_STATUSES, default='draft', verbose_name=_('Статус'))
     description = models.TextField(blank=True, verbose_name=_('Описание'))
     tags = models.ManyToManyField('tasks.Tag', blank=True, related_name='documents')
+    approval_count = CounterField(counts='approvals', verbose_name=_('Согласований'))
+    comment_count = CounterField(counts='comments', verbose_name=_('Комментариев'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     approved_at = models.DateTimeField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         verbose_name = _('Документ')
         verbose_name_plural = _('Документы')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
+        ]
     
     def __str__(self):
         return self.title
@@ -111,6 +126,10 @@ class Approval(models.Model):
         verbose_name_plural = _('Согласования')
         ordering = ['step__order', '-created_at']
         unique_together = ['document', 'step', 'approver']
+        indexes = [
+            models.Index(fields=['step', 'status']),
+            models.Index(fields=['approver', 'status']),
+        ]
     
     def __str__(self):
         return f"{self.document.title} - {self.step.name} - {self.approver}"
@@ -129,6 +148,9 @@ class DocumentComment(models.Model):
         verbose_name = _('Комментарий к документу')
         verbose_name_plural = _('Комментарии к документам')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['document', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Comment by {self.author} on {self.document}"
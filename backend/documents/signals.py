@@ -0,0 +1,7 @@
+"""
+Signals for documents app.
+"""
+from core.cache import track_model_versions
+from .models import DocumentType, ApprovalWorkflow, WorkflowStep, Document, Approval, DocumentComment
+
+track_model_versions(DocumentType, ApprovalWorkflow, WorkflowStep, Document, Approval, DocumentComment)
@@ -6,7 +6,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count
+from django.utils import timezone
+from core.conditional import ConditionalGetMixin
+from core.pagination import PageOrCursorPagination
+from core.search import FullTextSearchFilter
+from core.serializers import DynamicFieldsViewMixin
+from tasks.models import Tag
+from users.models import Department, Role, User
 from .models import DocumentType, ApprovalWorkflow, WorkflowStep, Document, Approval, DocumentComment
 from .serializers import (
     DocumentTypeSerializer, ApprovalWorkflowSerializer, WorkflowStepSerializer,
@@ -14,7 +20,7 @@ from .serializers import (
 )
 
 
-class DocumentTypeViewSet(viewsets.ModelViewSet):
+class DocumentTypeViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = DocumentType.objects.all()
     serializer_class = DocumentTypeSerializer
     permission_classes = [IsAuthenticated]
@@ -22,13 +28,13 @@ class DocumentTypeViewSet(viewsets.ModelViewSet):
     filterset_fields = []
 
 
-class ApprovalWorkflowViewSet(viewsets.ModelViewSet):
+class ApprovalWorkflowViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = ApprovalWorkflow.objects.prefetch_related('steps__approver').filter(is_active=True)
     serializer_class = ApprovalWorkflowSerializer
     permission_classes = [IsAuthenticated]
 
 
-class WorkflowStepViewSet(viewsets.ModelViewSet):
+class WorkflowStepViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = WorkflowStep.objects.select_related('workflow', 'approver').all()
     serializer_class = WorkflowStepSerializer
     permission_classes = [IsAuthenticated]
@@ -36,17 +42,19 @@ class WorkflowStepViewSet(viewsets.ModelViewSet):
     filterset_fields = ['workflow']
 
 
-class DocumentViewSet(viewsets.ModelViewSet):
+class DocumentViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Document.objects.select_related(
         'document_type', 'created_by', 'workflow', 'current_step', 'parent'
-    ).prefetch_related('tags').annotate(
-        approval_count=Count('approvals'),
-        comment_count=Count('comments')
-    ).all()
+    ).prefetch_related('tags').all()
+    conditional_models = (
+        DocumentType, ApprovalWorkflow, WorkflowStep, Approval, DocumentComment, Tag, User, Department, Role
+    )
     serializer_class = DocumentSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend]
+    pagination_class = PageOrCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['status', 'document_type', 'workflow', 'created_by']
+    search_headline_field = 'description'
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -75,7 +83,7 @@ class DocumentViewSet(viewsets.ModelViewSet):
                 approver=first_step.approver
             )
         
-        return Response(DocumentSerializer(document).data)
+        return Response(DocumentSerializer(document, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -91,12 +99,13 @@ class DocumentViewSet(viewsets.ModelViewSet):
             document=document,
             step=document.current_step,
             approver=request.user,
-            defaults={'status': 'approved', 'comment': comment}
+            defaults={'status': 'approved', 'comment': comment, 'signed_at': timezone.now()}
         )
         
         if not created:
             approval.status = 'approved'
             approval.comment = comment
+            approval.signed_at = timezone.now()
             approval.save()
         
         # Move to next step or complete
@@ -111,11 +120,10 @@ class DocumentViewSet(viewsets.ModelViewSet):
         else:
             document.status = 'approved'
             document.current_step = None
-            from django.utils import timezone
             document.approved_at = timezone.now()
         
         document.save()
-        return Response(DocumentSerializer(document).data)
+        return Response(DocumentSerializer(document, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
@@ -130,22 +138,23 @@ class DocumentViewSet(viewsets.ModelViewSet):
             document=document,
             step=document.current_step,
             approver=request.user,
-            defaults={'status': 'rejected', 'comment': comment}
+            defaults={'status': 'rejected', 'comment': comment, 'signed_at': timezone.now()}
         )
         
         if not created:
             approval.status = 'rejected'
             approval.comment = comment
+            approval.signed_at = timezone.now()
             approval.save()
         
         document.status = 'rejected'
         document.current_step = None
         document.save()
         
-        return Response(DocumentSerializer(document).data)
+        return Response(DocumentSerializer(document, context=self.get_serializer_context()).data)
 
 
-class ApprovalViewSet(viewsets.ModelViewSet):
+class ApprovalViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Approval.objects.select_related('document', 'step', 'approver').all()
     serializer_class = ApprovalSerializer
     permission_classes = [IsAuthenticated]
@@ -153,10 +162,12 @@ class ApprovalViewSet(viewsets.ModelViewSet):
     filterset_fields = ['document', 'step', 'approver', 'status']
 
 
-class DocumentCommentViewSet(viewsets.ModelViewSet):
+class DocumentCommentViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = DocumentComment.objects.select_related('author', 'document').prefetch_related('mentions').all()
+    conditional_models = (User, Department, Role)
     serializer_class = DocumentCommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PageOrCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['document']
     
@@ -0,0 +1,13 @@
+"""
+Management command to send due date reminders.
+"""
+from django.core.management.base import BaseCommand
+from notifications.reminders import scan
+
+
+class Command(BaseCommand):
+    help = 'Notify assignees of tasks that are due soon or overdue'
+
+    def handle(self, *args, **options):
+        for threshold, count in scan().items():
+            self.stdout.write(self.style.SUCCESS(f'{threshold}: {count} reminder(s) sent'))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_active_due_index'),
+        ('notifications', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('task_assigned', 'Задача назначена'), ('task_updated', 'Задача обновлена'), ('task_comment', 'Новый комментарий к задаче'), ('document_submitted', 'Документ отправлен на согласование'), ('document_approved', 'Документ согласован'), ('document_rejected', 'Документ отклонен'), ('document_comment', 'Новый комментарий к документу'), ('process_started', 'Процесс запущен'), ('process_completed', 'Процесс завершен'), ('mention', 'Вас упомянули'), ('task_due_soon', 'Срок задачи подходит'), ('task_overdue', 'Задача просрочена'), ('system', 'Системное уведомление')], max_length=50, verbose_name='Тип'),
+        ),
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('threshold', models.CharField(choices=[('due_soon', 'Скоро срок'), ('overdue', 'Просрочена')], max_length=20, verbose_name='Порог')),
+                ('due_date', models.DateTimeField(verbose_name='Срок выполнения')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='tasks.task', verbose_name='Задача')),
+            ],
+            options={
+                'verbose_name': 'Напоминание о сроке',
+                'verbose_name_plural': 'Напоминания о сроках',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='taskreminder',
+            constraint=models.UniqueConstraint(fields=('task', 'threshold', 'due_date'), name='notifications_unique_task_reminder'),
+        ),
+    ]
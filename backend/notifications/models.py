@@ -18,9 +18,16 @@ NOTIFICATION_TYPES = [
     ('process_started', _('Процесс запущен')),
     ('process_completed', _('Процесс завершен')),
     ('mention', _('Вас упомянули')),
+    ('task_due_soon', _('Срок задачи подходит')),
+    ('task_overdue', _('Задача просрочена')),
     ('system', _('Системное уведомление')),
 ]
 
+REMINDER_THRESHOLDS = [
+    ('due_soon', _('Скоро срок')),
+    ('overdue', _('Просрочена')),
+]
+
 
 class Notification(models.Model):
     """Notification model."""
@@ -40,8 +47,27 @@ class Notification(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', '-created_at']),
+            models.Index(fields=['user', '-created_at', '-id']),
         ]
     
     def __str__(self):
         return f"{self.user} - {self.title}"
 
+
+class TaskReminder(models.Model):
+    """A due date reminder already sent; one per task, threshold and due date."""
+    task = models.ForeignKey('tasks.Task', on_delete=models.CASCADE, related_name='reminders', verbose_name=_('Задача'))
+    threshold = models.CharField(max_length=20, choices=REMINDER_THRESHOLDS, verbose_name=_('Порог'))
+    due_date = models.DateTimeField(verbose_name=_('Срок выполнения'))
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Напоминание о сроке')
+        verbose_name_plural = _('Напоминания о сроках')
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'threshold', 'due_date'], name='notifications_unique_task_reminder'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_id} - {self.threshold}"
+
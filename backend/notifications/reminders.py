@@ -0,0 +1,127 @@
+"""
+Due date reminders.
+
+``scan`` walks the active tasks that are due soon or overdue (by at most
+``REMINDER_OVERDUE_DAYS``) along the partial ``(due_date, id)`` index, in
+keyset batches of plain reads, so the task table is never locked.  Each
+batch records its reminders with one ``INSERT ... ON CONFLICT DO NOTHING
+RETURNING``; only the tasks it returns had no reminder for that threshold
+and due date yet, and only they are notified, so repeated or concurrent
+scans never notify twice.  A task whose due date moves is reminded again.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from core.cache import bump_version
+from tasks.models import ACTIVE_TASK_STATUSES, Task
+from .models import Notification, TaskReminder
+from .signals import notification_version_name, send_websocket_notification
+
+BATCH_SIZE = 1000
+TASK_FIELDS = ['id', 'title', 'due_date', 'assignee_id', 'reporter_id']
+
+# threshold -> (notification type, title, message)
+REMINDERS = {
+    'due_soon': ('task_due_soon', 'Скоро срок: {title}', 'Срок задачи "{title}" истекает {due}'),
+    'overdue': ('task_overdue', 'Задача просрочена: {title}', 'Срок задачи "{title}" истек {due}'),
+}
+
+RECORD_SQL = '''
+    INSERT INTO {table} (task_id, threshold, due_date, created_at)
+    SELECT task_id, %s, due_date, %s FROM unnest(%s::bigint[], %s::timestamptz[]) AS batch(task_id, due_date)
+    ON CONFLICT DO NOTHING
+    RETURNING task_id
+'''
+
+
+def windows(now):
+    """Due date range ``[start, end)`` of every threshold."""
+    return {
+        'due_soon': (now, now + timedelta(hours=settings.REMINDER_DUE_SOON_HOURS)),
+        'overdue': (now - timedelta(days=settings.REMINDER_OVERDUE_DAYS), now),
+    }
+
+
+def pending(threshold, start, end):
+    """Active tasks due in ``[start, end)`` not yet reminded of ``threshold`` for that due date."""
+    reminded = TaskReminder.objects.filter(task=OuterRef('pk'), threshold=threshold, due_date=OuterRef('due_date'))
+    return Task.objects.filter(
+        status__in=ACTIVE_TASK_STATUSES, due_date__gte=start, due_date__lt=end,
+    ).filter(~Exists(reminded))
+
+
+def batches(queryset):
+    """Rows of ``queryset`` in ``(due_date, id)`` order, one keyset page at a time."""
+    queryset = queryset.order_by('due_date', 'id').values(*TASK_FIELDS)
+    after = None
+    while True:
+        page = queryset
+        if after is not None:
+            page = page.filter(Q(due_date__gt=after[0]) | Q(due_date=after[0], id__gt=after[1]))
+        rows = list(page[:BATCH_SIZE])
+        if rows:
+            yield rows
+        if len(rows) < BATCH_SIZE:
+            return
+        after = rows[-1]['due_date'], rows[-1]['id']
+
+
+def _record(threshold, rows, now):
+    """Store reminders for ``rows``; returns the ids of the tasks that had none."""
+    table = connection.ops.quote_name(TaskReminder._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_SQL.format(table=table), [
+            threshold, now, [row['id'] for row in rows], [row['due_date'] for row in rows],
+        ])
+        return {task_id for (task_id,) in cursor.fetchall()}
+
+
+def _notification(threshold, row):
+    notification_type, title, message = REMINDERS[threshold]
+    due = timezone.localtime(row['due_date']).strftime('%d.%m.%Y %H:%M')
+    return Notification(
+        user_id=row['assignee_id'] or row['reporter_id'],
+        type=notification_type,
+        title=title.format(title=row['title']),
+        message=message.format(title=row['title'], due=due),
+        link=f'/tasks/{row["id"]}',
+        related_object_type='task',
+        related_object_id=row['id'],
+    )
+
+
+def _push(notifications):
+    """One websocket message per user for a batch."""
+    by_user = {}
+    for notification in notifications:
+        by_user.setdefault(notification.user_id, []).append(notification)
+    bump_version(*(notification_version_name(user_id) for user_id in by_user))
+    for user_id, items in by_user.items():
+        if len(items) == 1:
+            title, message = items[0].title, items[0].message
+        else:
+            title = f'Напоминания о сроках: {len(items)}'
+            message = f'Задач с подходящим или истекшим сроком: {len(items)}'
+        send_websocket_notification(user_id, {'type': items[0].type, 'title': title, 'message': message})
+
+
+def remind(threshold, rows, now):
+    """Record and send the reminders of one batch; returns how many were sent."""
+    with transaction.atomic():
+        recorded = _record(threshold, rows, now)
+        notifications = [_notification(threshold, row) for row in rows if row['id'] in recorded]
+        Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+        if notifications:
+            transaction.on_commit(lambda: _push(notifications))
+    return len(notifications)
+
+
+def scan(now=None):
+    """Send every due reminder; returns the number sent per threshold."""
+    now = now or timezone.now()
+    sent = {}
+    for threshold, (start, end) in windows(now).items():
+        sent[threshold] = sum(remind(threshold, rows, now) for rows in batches(pending(threshold, start, end)))
+    return sent
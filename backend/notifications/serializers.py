@@ -2,10 +2,11 @@
 Serializers for notifications app.
 """
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Notification
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
@@ -1,15 +1,28 @@
 """
 Signals for notifications.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
+from core.cache import bump_version
 from .models import Notification
 from tasks.models import Task, TaskComment
+from tasks.signals import tasks_bulk_saved, tasks_imported
 from documents.models import Document, DocumentComment, Approval
 
 
+def notification_version_name(user_id):
+    """Counter bumped whenever the notifications of a user change."""
+    return f'notifications.user:{user_id}'
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def invalidate_user_notifications(sender, instance, **kwargs):
+    bump_version(notification_version_name(instance.user_id))
+
+
 @receiver(post_save, sender=Task)
 def task_notification(sender, instance, created, **kwargs):
     """Send notification when task is created or updated."""
@@ -40,6 +53,79 @@ def task_notification(sender, instance, created, **kwargs):
         )
 
 
+@receiver(tasks_bulk_saved)
+def task_batch_notification(sender, created=(), updated=(), reassigned=(), **kwargs):
+    """Send one notification per user for a bulk task operation."""
+    assigned, changed = {}, {}
+    reassigned_ids = {task.id for task in reassigned}
+    for task in [*created, *reassigned]:
+        if task.assignee_id:
+            assigned.setdefault(task.assignee_id, []).append(task)
+    for task in updated:
+        if task.assignee_id and task.id not in reassigned_ids:
+            changed.setdefault(task.assignee_id, []).append(task)
+    
+    notifications, messages = [], []
+    for user_id, tasks in assigned.items():
+        if len(tasks) == 1:
+            title = f'Новая задача: {tasks[0].title}'
+            message = f'Вам назначена задача "{tasks[0].title}"'
+        else:
+            title = f'Новые задачи: {len(tasks)}'
+            message = f'Вам назначено задач: {len(tasks)}'
+        notifications.append(_batch_notification(user_id, 'task_assigned', title, message, tasks))
+        messages.append((user_id, {'type': 'task_assigned', 'title': title, 'message': message}))
+    for user_id, tasks in changed.items():
+        if len(tasks) == 1:
+            title = f'Задача обновлена: {tasks[0].title}'
+            message = f'Задача "{tasks[0].title}" была обновлена'
+        else:
+            title = f'Задачи обновлены: {len(tasks)}'
+            message = f'Обновлено ваших задач: {len(tasks)}'
+        notifications.append(_batch_notification(user_id, 'task_updated', title, message, tasks))
+    
+    Notification.objects.bulk_create(notifications)
+    bump_version(*{notification_version_name(notification.user_id) for notification in notifications})
+    for user_id, message in messages:
+        send_websocket_notification(user_id, message)
+
+
+@receiver(tasks_imported)
+def task_import_notification(sender, user, result, **kwargs):
+    """One summary notification for the user who imported a file of tasks."""
+    if result.error:
+        title = 'Импорт задач прерван'
+        message = f'Создано задач: {result.created}. Ошибка: {result.error}'
+    else:
+        title = 'Импорт задач завершен'
+        message = f'Создано задач: {result.created}, пропущено строк: {result.skipped}'
+    if result.errors:
+        first = result.errors[0]
+        message += f'. Строка {first["row"]}: ' + '; '.join(f'{name}: {text}' for name, text in first['errors'].items())
+    Notification.objects.create(
+        user=user,
+        type='system',
+        title=title,
+        message=message,
+        link='/tasks',
+        related_object_type='task',
+    )
+    send_websocket_notification(user.id, {'type': 'system', 'title': title, 'message': message})
+
+
+def _batch_notification(user_id, notification_type, title, message, tasks):
+    single = len(tasks) == 1
+    return Notification(
+        user_id=user_id,
+        type=notification_type,
+        title=title,
+        message=message,
+        link=f'/tasks/{tasks[0].id}' if single else '/tasks',
+        related_object_type='task',
+        related_object_id=tasks[0].id if single else None,
+    )
+
+
 @receiver(post_save, sender=TaskComment)
 def task_comment_notification(sender, instance, created, **kwargs):
     """Send notification when task comment is created."""
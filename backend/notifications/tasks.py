@@ -0,0 +1,11 @@
+"""
+Background jobs for notifications.
+"""
+from celery import shared_task
+from .reminders import scan
+
+
+@shared_task
+def send_task_reminders():
+    """Remind assignees of tasks that are due soon or overdue."""
+    return scan()
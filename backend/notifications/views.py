@@ -6,17 +6,26 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from core.cache import bump_version
+from core.conditional import ConditionalGetMixin
+from core.pagination import PageOrCursorPagination
+from core.serializers import DynamicFieldsViewMixin
 from .models import Notification
 from .serializers import NotificationSerializer
+from .signals import notification_version_name
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PageOrCursorPagination
     
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return super().get_queryset().filter(user=self.request.user)
+    
+    def get_conditional_versions(self):
+        return [notification_version_name(self.request.user.pk)]
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
@@ -27,17 +36,19 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         
         notification.is_read = True
         notification.save()
-        return Response(NotificationSerializer(notification).data)
+        return Response(NotificationSerializer(notification, context=self.get_serializer_context()).data)
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
         """Mark all notifications as read."""
         Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        bump_version(notification_version_name(request.user.pk))
         return Response({'status': 'ok'})
     
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get unread notifications count."""
-        count = Notification.objects.filter(user=request.user, is_read=False).count()
-        return Response({'count': count})
+        return self.conditional(request, lambda: Response({
+            'count': Notification.objects.filter(user=request.user, is_read=False).count()
+        }))
 
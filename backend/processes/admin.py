@@ -2,7 +2,7 @@
 Admin configuration for processes app.
 """
 from django.contrib import admin
-from .models import Process, ProcessInstance, ProcessNode
+from .models import Process, ProcessInstance, ProcessNode, ProcessNodeVisit
 
 
 @admin.register(Process)
@@ -25,3 +25,9 @@ class ProcessNodeAdmin(admin.ModelAdmin):
     list_filter = ['node_type', 'process']
     search_fields = ['name', 'node_id']
 
+
+@admin.register(ProcessNodeVisit)
+class ProcessNodeVisitAdmin(admin.ModelAdmin):
+    list_display = ['instance', 'process', 'node_id', 'entered_at', 'left_at']
+    list_filter = ['process', 'entered_at']
+    search_fields = ['node_id']
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processinstance',
+            index=models.Index(fields=['started_at'], name='processes_p_started_56bb80_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processinstance',
+            index=models.Index(fields=['completed_at'], name='processes_p_complet_eb5c01_idx'),
+        ),
+    ]
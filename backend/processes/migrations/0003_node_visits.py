@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def open_current_visits(apps, schema_editor):
+    """Open a visit for the current node of every running instance."""
+    ProcessInstance = apps.get_model('processes', 'ProcessInstance')
+    ProcessNodeVisit = apps.get_model('processes', 'ProcessNodeVisit')
+    instances = ProcessInstance.objects.exclude(current_node='').exclude(status__in=['completed', 'cancelled'])
+    ProcessNodeVisit.objects.bulk_create(
+        (
+            ProcessNodeVisit(instance_id=pk, process_id=process_id, node_id=node_id, entered_at=started_at)
+            for pk, process_id, node_id, started_at in instances.values_list('id', 'process_id', 'current_node', 'started_at').iterator()
+        ),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0002_processinstance_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessNodeVisit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('node_id', models.CharField(max_length=100, verbose_name='ID узла')),
+                ('entered_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Вход')),
+                ('left_at', models.DateTimeField(blank=True, null=True, verbose_name='Выход')),
+            ],
+            options={
+                'verbose_name': 'Посещение узла',
+                'verbose_name_plural': 'Посещения узлов',
+                'ordering': ['entered_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='processinstance',
+            index=models.Index(fields=['status', 'started_at'], name='processes_p_status_d39efc_idx'),
+        ),
+        migrations.AddField(
+            model_name='processnodevisit',
+            name='instance',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='node_visits', to='processes.processinstance'),
+        ),
+        migrations.AddField(
+            model_name='processnodevisit',
+            name='process',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='processes.process'),
+        ),
+        migrations.AddIndex(
+            model_name='processnodevisit',
+            index=models.Index(fields=['process', 'entered_at'], name='processes_p_process_4af349_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processnodevisit',
+            index=models.Index(condition=models.Q(('left_at__isnull', True)), fields=['instance'], name='processes_open_visit_idx'),
+        ),
+        migrations.RunPython(open_current_visits, migrations.RunPython.noop),
+    ]
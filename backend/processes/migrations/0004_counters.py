@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:15
+
+import core.counters
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0003_node_visits'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='process',
+            name='instance_count',
+            field=core.counters.CounterField(counts='instances', verbose_name='Запусков'),
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='process',
+            name='instance_count',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('processes', '0004_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='processinstance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        # Existing rows were last changed when they started or completed,
+        # not when the column was added.
+        migrations.RunSQL(
+            'UPDATE processes_processinstance SET updated_at = COALESCE(completed_at, started_at)',
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='processinstance',
+            index=models.Index(fields=['updated_at'], name='processes_p_updated_a319e4_idx'),
+        ),
+    ]
@@ -3,7 +3,9 @@ Process management models.
 """
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from core.counters import CounterField
 import json
 
 User = get_user_model()
@@ -33,6 +35,7 @@ class Process(models.Model):
     definition = models.JSONField(default=dict, verbose_name=_('Определение процесса'))  # BPMN-like structure
     status = models.CharField(max_length=20, choices=PROCESS_STATUSES, default='draft', verbose_name=_('Статус'))
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_processes', verbose_name=_('Создатель'))
+    instance_count = CounterField(counts='instances', verbose_name=_('Запусков'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -55,11 +58,18 @@ class ProcessInstance(models.Model):
     started_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='started_processes', verbose_name=_('Запустил'))
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = _('Экземпляр процесса')
         verbose_name_plural = _('Экземпляры процессов')
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['started_at']),
+            models.Index(fields=['completed_at']),
+            models.Index(fields=['status', 'started_at']),
+            models.Index(fields=['updated_at']),
+        ]
     
     def __str__(self):
         return f"{self.process.name} - {self.name}"
@@ -83,3 +93,37 @@ class ProcessNode(models.Model):
     def __str__(self):
         return f"{self.process.name} - {self.name}"
 
+
+class ProcessNodeVisit(models.Model):
+    """Time a process instance spent in a node."""
+    instance = models.ForeignKey(ProcessInstance, on_delete=models.CASCADE, related_name='node_visits')
+    process = models.ForeignKey(Process, on_delete=models.CASCADE, related_name='+')
+    node_id = models.CharField(max_length=100, verbose_name=_('ID узла'))
+    entered_at = models.DateTimeField(default=timezone.now, verbose_name=_('Вход'))
+    left_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Выход'))
+    
+    class Meta:
+        verbose_name = _('Посещение узла')
+        verbose_name_plural = _('Посещения узлов')
+        ordering = ['entered_at']
+        indexes = [
+            models.Index(fields=['process', 'entered_at']),
+            models.Index(fields=['instance'], condition=models.Q(left_at__isnull=True), name='processes_open_visit_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.instance_id} @ {self.node_id}"
+    
+    @classmethod
+    def leave(cls, instance, at=None):
+        """Close the instance's open visit, if any."""
+        return cls.objects.filter(instance=instance, left_at__isnull=True).update(left_at=at or timezone.now())
+    
+    @classmethod
+    def enter(cls, instance, node_id, at=None):
+        """Close the current visit and open one for ``node_id``."""
+        at = at or timezone.now()
+        cls.leave(instance, at)
+        if node_id:
+            return cls.objects.create(instance=instance, process_id=instance.process_id, node_id=node_id, entered_at=at)
+        return None
@@ -2,33 +2,32 @@
 Serializers for processes app.
 """
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import Process, ProcessInstance, ProcessNode
 from users.serializers import UserSerializer
 
 
-class ProcessNodeSerializer(serializers.ModelSerializer):
+class ProcessNodeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ProcessNode
         fields = ['id', 'process', 'node_id', 'node_type', 'name', 'position', 'config', 'connections']
 
 
-class ProcessSerializer(serializers.ModelSerializer):
-    created_by = UserSerializer(read_only=True)
-    nodes = ProcessNodeSerializer(many=True, read_only=True)
-    instance_count = serializers.IntegerField(read_only=True)
-    
+class ProcessSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Process
         fields = [
             'id', 'name', 'description', 'definition', 'status', 'created_by',
             'nodes', 'instance_count', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        read_only_fields = ['created_by', 'nodes', 'created_at', 'updated_at']
+        expandable_fields = {
+            'created_by': (UserSerializer, {}),
+            'nodes': (ProcessNodeSerializer, {'many': True}),
+        }
 
 
-class ProcessInstanceSerializer(serializers.ModelSerializer):
-    process = ProcessSerializer(read_only=True)
-    started_by = UserSerializer(read_only=True)
+class ProcessInstanceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     process_id = serializers.IntegerField(write_only=True)
     
     class Meta:
@@ -37,5 +36,9 @@ class ProcessInstanceSerializer(serializers.ModelSerializer):
             'id', 'process', 'process_id', 'name', 'current_node', 'status',
             'data', 'started_by', 'started_at', 'completed_at'
         ]
-        read_only_fields = ['started_by', 'started_at', 'completed_at']
+        read_only_fields = ['process', 'started_by', 'started_at', 'completed_at']
+        expandable_fields = {
+            'process': (ProcessSerializer, {}),
+            'started_by': (UserSerializer, {}),
+        }
 
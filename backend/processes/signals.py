@@ -0,0 +1,7 @@
+"""
+Signals for processes app.
+"""
+from core.cache import track_model_versions
+from .models import Process, ProcessInstance, ProcessNode
+
+track_model_versions(Process, ProcessInstance, ProcessNode)
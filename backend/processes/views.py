@@ -5,15 +5,18 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count
-from .models import Process, ProcessInstance, ProcessNode
+from django.db import transaction
+from django.utils import timezone
+from core.conditional import ConditionalGetMixin
+from core.serializers import DynamicFieldsViewMixin
+from users.models import Department, Role, User
+from .models import Process, ProcessInstance, ProcessNode, ProcessNodeVisit
 from .serializers import ProcessSerializer, ProcessInstanceSerializer, ProcessNodeSerializer
 
 
-class ProcessViewSet(viewsets.ModelViewSet):
-    queryset = Process.objects.select_related('created_by').prefetch_related('nodes').annotate(
-        instance_count=Count('instances')
-    ).all()
+class ProcessViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
+    queryset = Process.objects.select_related('created_by').prefetch_related('nodes').all()
+    conditional_models = (ProcessNode, ProcessInstance, User, Department, Role)
     serializer_class = ProcessSerializer
     permission_classes = [IsAuthenticated]
     
@@ -37,10 +40,10 @@ class ProcessViewSet(viewsets.ModelViewSet):
         process.definition = request.data.get('definition', {})
         process.save()
         
-        return Response(ProcessSerializer(process).data)
+        return Response(ProcessSerializer(process, context=self.get_serializer_context()).data)
 
 
-class ProcessNodeViewSet(viewsets.ModelViewSet):
+class ProcessNodeViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = ProcessNode.objects.select_related('process').all()
     serializer_class = ProcessNodeSerializer
     permission_classes = [IsAuthenticated]
@@ -48,15 +51,18 @@ class ProcessNodeViewSet(viewsets.ModelViewSet):
     filterset_fields = ['process']
 
 
-class ProcessInstanceViewSet(viewsets.ModelViewSet):
+class ProcessInstanceViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = ProcessInstance.objects.select_related('process', 'started_by').all()
+    conditional_models = (Process, ProcessNode, User, Department, Role)
     serializer_class = ProcessInstanceSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = []
     filterset_fields = ['process', 'status']
     
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(started_by=self.request.user)
+        instance = serializer.save(started_by=self.request.user)
+        ProcessNodeVisit.enter(instance, instance.current_node, at=instance.started_at)
     
     @action(detail=True, methods=['post'])
     def move_to_node(self, request, pk=None):
@@ -65,19 +71,22 @@ class ProcessInstanceViewSet(viewsets.ModelViewSet):
         next_node = request.data.get('node_id')
         
         instance.current_node = next_node
-        instance.save()
+        with transaction.atomic():
+            instance.save()
+            ProcessNodeVisit.enter(instance, next_node)
         
-        return Response(ProcessInstanceSerializer(instance).data)
+        return Response(ProcessInstanceSerializer(instance, context=self.get_serializer_context()).data)
     
     @action(detail=True, methods=['post'])
     def complete(self, request, pk=None):
         """Complete process instance."""
         instance = self.get_object()
-        from django.utils import timezone
         
         instance.status = 'completed'
         instance.completed_at = timezone.now()
-        instance.save()
+        with transaction.atomic():
+            instance.save()
+            ProcessNodeVisit.leave(instance, instance.completed_at)
         
-        return Response(ProcessInstanceSerializer(instance).data)
+        return Response(ProcessInstanceSerializer(instance, context=self.get_serializer_context()).data)
 
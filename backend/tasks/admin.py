@@ -2,7 +2,7 @@
 Admin configuration for tasks app.
 """
 from django.contrib import admin
-from .models import Project, Task, Tag, TaskColumn, TaskComment
+from .models import Project, Task, Tag, TaskColumn, TaskComment, TaskTransition
 
 
 @admin.register(Project)
@@ -38,3 +38,9 @@ class TaskCommentAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
     search_fields = ['content']
 
+
+@admin.register(TaskTransition)
+class TaskTransitionAdmin(admin.ModelAdmin):
+    list_display = ['task', 'from_status', 'to_status', 'from_column', 'to_column', 'changed_by', 'created_at']
+    list_filter = ['to_status', 'project', 'created_at']
+    readonly_fields = ['created_at']
@@ -4,4 +4,15 @@ from django.apps import AppConfig
 class TasksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasks'
+    
+    def ready(self):
+        from core import autocomplete
+        from core.search import register
+        from .models import PROJECT_SEARCH_WEIGHTS, TASK_SEARCH_WEIGHTS
+        Project, Tag = self.get_model('Project'), self.get_model('Tag')
+        register(Project, PROJECT_SEARCH_WEIGHTS)
+        register(self.get_model('Task'), TASK_SEARCH_WEIGHTS)
+        autocomplete.register('tags', Tag.objects.all(), ['name'], 'task_count', ['id', 'name', 'color'])
+        autocomplete.register('projects', Project.objects.all(), ['name'], 'task_count', ['id', 'name', 'color'])
+        import tasks.signals  # noqa
 
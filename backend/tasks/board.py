@@ -0,0 +1,71 @@
+"""
+Kanban board payload.
+
+The whole board is read with a fixed number of flat ``values()`` queries
+(columns, tasks, task tags, assignees) regardless of its size.  Cards only
+carry ids; the users and tags they refer to are sent once, in dictionaries
+shared by the whole payload.
+"""
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from .models import Task, TaskColumn
+
+User = get_user_model()
+
+CARD_FIELDS = [
+    'id', 'title', 'status', 'priority', 'due_date', 'rank',
+    'column_id', 'assignee_id', 'depends_on_id', 'completed_at',
+]
+
+
+def _users(user_ids):
+    users = {}
+    rows = User.objects.filter(id__in=user_ids).values('id', 'username', 'first_name', 'last_name', 'avatar')
+    for row in rows:
+        users[row['id']] = {
+            'id': row['id'],
+            'full_name': f"{row['first_name']} {row['last_name']}".strip() or row['username'],
+            'avatar': default_storage.url(row['avatar']) if row['avatar'] else None,
+        }
+    return users
+
+
+def _task_tags(tasks):
+    task_tags, tags = {}, {}
+    rows = Task.tags.through.objects.filter(task__in=tasks).values_list(
+        'task_id', 'tag_id', 'tag__name', 'tag__color'
+    )
+    for task_id, tag_id, name, color in rows:
+        task_tags.setdefault(task_id, []).append(tag_id)
+        tags[tag_id] = {'id': tag_id, 'name': name, 'color': color}
+    return task_tags, tags
+
+
+def build_board(project_id):
+    """
+    A project's columns (its own and the shared ones) with their ordered
+    cards; cards outside the columns go to ``unplaced``.
+    """
+    columns = TaskColumn.objects.filter(Q(project_id=project_id) | Q(project__isnull=True)).order_by('position', 'id')
+    tasks = Task.objects.filter(project_id=project_id).order_by('rank', 'id')
+
+    board = [{**column, 'tasks': []} for column in columns.values('id', 'name', 'position', 'is_default')]
+    by_id = {column['id']: column for column in board}
+    task_tags, tags = _task_tags(tasks)
+
+    unplaced, user_ids = [], set()
+    for card in tasks.values(*CARD_FIELDS):
+        card['tag_ids'] = task_tags.get(card['id'], [])
+        if card['assignee_id']:
+            user_ids.add(card['assignee_id'])
+        column = by_id.get(card['column_id'])
+        (column['tasks'] if column else unplaced).append(card)
+
+    return {
+        'project': project_id,
+        'columns': board,
+        'unplaced': unplaced,
+        'users': _users(user_ids),
+        'tags': tags,
+    }
@@ -0,0 +1,179 @@
+"""
+Bulk task operations.
+
+A batch is validated as a whole and written with ``bulk_create`` /
+``bulk_update`` in one transaction.  The per-row ``post_save`` handlers
+(notifications, cache versions) do not run for it; instead the batch is
+announced once through ``tasks_bulk_saved`` after commit.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from core.cache import bump_model_version
+from core.search import reindex
+from .graph import find_cycle
+from .models import Project, Tag, Task, TaskColumn, TaskTransition, TASK_SEARCH_WEIGHTS
+from .ranking import column_tasks, ranks_after
+from .serializers import TaskBulkItemSerializer
+from .signals import tasks_bulk_saved
+
+User = get_user_model()
+
+MAX_BATCH = 500
+BATCH_SIZE = 500
+
+RELATED = {
+    'project_id': Project,
+    'assignee_id': User,
+    'column_id': TaskColumn,
+    'depends_on_id': Task,
+}
+
+
+def _check_related(rows):
+    """Reject ids of missing related objects, with one query per relation."""
+    errors = {}
+    wanted = {field: {row[field] for row in rows if row.get(field) is not None} for field in RELATED}
+    wanted['tag_ids'] = {tag_id for row in rows for tag_id in row.get('tag_ids', [])}
+    for field, ids in wanted.items():
+        model = RELATED.get(field, Tag)
+        missing = ids - set(model.objects.filter(pk__in=ids).values_list('pk', flat=True)) if ids else set()
+        if missing:
+            errors[field] = f'Not found: {", ".join(map(str, sorted(missing)))}'
+    if errors:
+        raise ValidationError(errors)
+
+
+def validate_batch(data, partial=False):
+    """
+    Validate a list of task payloads.
+
+    Items of an update (``partial=True``) must carry a unique ``id`` and only
+    the fields to change; items of a create must not carry an ``id``.
+    """
+    if not isinstance(data, list) or not data:
+        raise ValidationError({'tasks': 'Expected a non-empty list'})
+    if len(data) > MAX_BATCH:
+        raise ValidationError({'tasks': f'At most {MAX_BATCH} items per request'})
+    serializer = TaskBulkItemSerializer(data=data, many=True, partial=partial)
+    serializer.is_valid(raise_exception=True)
+    rows = [dict(row) for row in serializer.validated_data]
+
+    ids = [row.get('id') for row in rows]
+    if partial and (None in ids or len(set(ids)) != len(ids)):
+        raise ValidationError({'id': 'Every item needs a unique id'})
+    if not partial and any(ids):
+        raise ValidationError({'id': 'New tasks cannot have an id'})
+    _check_related(rows)
+    if partial:
+        cycle = find_cycle({row['id']: row['depends_on_id'] for row in rows if 'depends_on_id' in row})
+        if cycle:
+            raise ValidationError({'depends_on_id': f'Dependency cycle: {" -> ".join(map(str, cycle))}'})
+    return rows
+
+
+def assign_ranks(tasks):
+    """Append tasks to the end of their columns, in the given order."""
+    scopes = {}
+    for task in tasks:
+        scopes.setdefault((task.column_id, None if task.column_id else task.project_id), []).append(task)
+    exclude = [task.pk for task in tasks if task.pk]
+    for (column_id, project_id), group in scopes.items():
+        last = column_tasks(Task, column_id, project_id).exclude(pk__in=exclude).exclude(rank='')
+        last = last.order_by('-rank').values_list('rank', flat=True).first()
+        for task, rank in zip(group, ranks_after(last, len(group))):
+            task.rank = rank
+
+
+def _set_tags(task_tags, replace=False):
+    Through = Task.tags.through
+    if replace:
+        Through.objects.filter(task_id__in=task_tags).delete()
+    Through.objects.bulk_create(
+        [Through(task_id=task_id, tag_id=tag_id) for task_id, tag_ids in task_tags.items() for tag_id in set(tag_ids)],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def announce(created=(), updated=(), reassigned=(), previous_project_ids=()):
+    project_ids = {task.project_id for task in [*created, *updated] if task.project_id}
+    project_ids.update(project_id for project_id in previous_project_ids if project_id)
+
+    def send():
+        bump_model_version(Task)
+        tasks_bulk_saved.send(
+            sender=Task, created=list(created), updated=list(updated),
+            reassigned=list(reassigned), project_ids=project_ids,
+        )
+    transaction.on_commit(send)
+
+
+@transaction.atomic
+def create_tasks(rows, user):
+    """Create validated rows as tasks reported by ``user``; returns the tasks."""
+    now = timezone.now()
+    tasks, task_tags = [], []
+    for row in rows:
+        task_tags.append(row.pop('tag_ids', []))
+        task = Task(reporter=user, **row)
+        if task.status == 'done':
+            task.completed_at = now
+        tasks.append(task)
+
+    assign_ranks(tasks)
+    Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+    _set_tags({task.id: tag_ids for task, tag_ids in zip(tasks, task_tags) if tag_ids})
+    reindex(Task.objects.filter(pk__in=[task.id for task in tasks]))
+    TaskTransition.objects.bulk_create(
+        [TaskTransition.build(task, changed_by=user) for task in tasks], batch_size=BATCH_SIZE,
+    )
+    announce(created=tasks)
+    return tasks
+
+
+@transaction.atomic
+def update_tasks(rows, user):
+    """Apply validated partial rows (each with an ``id``); returns the tasks."""
+    now = timezone.now()
+    tasks = Task.objects.select_for_update().in_bulk([row['id'] for row in rows])
+    missing = [row['id'] for row in rows if row['id'] not in tasks]
+    if missing:
+        raise ValidationError({'id': f'Not found: {", ".join(map(str, missing))}'})
+
+    fields = {'updated_at'}
+    moved, reassigned, transitions, task_tags = [], [], [], {}
+    previous_project_ids = {task.project_id for task in tasks.values()}
+    for row in rows:
+        task = tasks[row.pop('id')]
+        old_status, old_column_id = task.status, task.column_id
+        old_project_id, old_assignee_id = task.project_id, task.assignee_id
+        if 'tag_ids' in row:
+            task_tags[task.id] = row.pop('tag_ids')
+        for field, value in row.items():
+            setattr(task, field, value)
+        fields.update(row)
+        task.updated_at = now
+        if task.status == 'done' and not task.completed_at:
+            task.completed_at = now
+            fields.add('completed_at')
+
+        if task.column_id != old_column_id or (task.column_id is None and task.project_id != old_project_id):
+            moved.append(task)
+        if task.assignee_id and task.assignee_id != old_assignee_id:
+            reassigned.append(task)
+        transition = TaskTransition.build(task, old_status, old_column_id, changed_by=user)
+        if transition:
+            transitions.append(transition)
+
+    if moved:
+        assign_ranks(moved)
+        fields.add('rank')
+    Task.objects.bulk_update(list(tasks.values()), sorted(fields), batch_size=BATCH_SIZE)
+    if task_tags:
+        _set_tags(task_tags, replace=True)
+    if fields & set(TASK_SEARCH_WEIGHTS):
+        reindex(Task.objects.filter(pk__in=list(tasks)))
+    TaskTransition.objects.bulk_create(transitions, batch_size=BATCH_SIZE)
+    announce(updated=tasks.values(), reassigned=reassigned, previous_project_ids=previous_project_ids)
+    return list(tasks.values())
@@ -0,0 +1,162 @@
+"""
+Task dependency graph.
+
+``Task.depends_on`` gives a task at most one blocker, so the dependencies
+of a project form a forest of chains.  The edges of a project are read with
+one ``values()`` query, cached under a per-project version counter (bumped
+by ``tasks.signals`` when a task's blocker, due date, status or project
+changes) and turned into adjacency maps per request.  Writes are checked for
+cycles with one recursive query over the chains they extend.
+"""
+from collections import defaultdict
+from django.core.cache import cache
+from django.db import connection
+from core.cache import versioned_key
+from .models import Task
+
+GRAPH_FIELDS = ['id', 'title', 'status', 'due_date', 'depends_on_id']
+CLOSED_STATUSES = ['done', 'cancelled']
+
+# UNION drops chain rows already produced, so a cycle that exists in the
+# table already cannot make the recursion run forever.
+CHAIN_SQL = '''
+    WITH RECURSIVE chain(id, depends_on_id) AS (
+        SELECT id, depends_on_id FROM {table} WHERE id = ANY(%s)
+        UNION
+        SELECT task.id, task.depends_on_id
+        FROM {table} task
+        JOIN chain ON task.id = chain.depends_on_id
+    )
+    SELECT id, depends_on_id FROM chain
+'''
+
+
+def dependency_version_name(project_id):
+    """Counter bumped whenever the dependency graph of a project changes."""
+    return f'tasks.dependencies.project:{project_id}'
+
+
+def find_cycle(changes):
+    """
+    Cycle that the new edges ``{task_id: depends_on_id}`` would close.
+
+    Returns the task ids along the cycle (starting and ending with a changed
+    task) or ``None``.
+    """
+    blocker_ids = [blocker_id for blocker_id in changes.values() if blocker_id is not None]
+    if not blocker_ids:
+        return None
+    table = connection.ops.quote_name(Task._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(CHAIN_SQL.format(table=table), [blocker_ids])
+        blockers = dict(cursor.fetchall())
+    blockers.update(changes)
+
+    # Every new cycle runs through a changed edge, so walking up from each
+    # changed task finds it.
+    for task_id in changes:
+        path, seen, node = [task_id], {task_id}, blockers.get(task_id)
+        while node is not None and node not in seen:
+            path.append(node)
+            seen.add(node)
+            node = blockers.get(node)
+        if node == task_id:
+            return path + [task_id]
+    return None
+
+
+class DependencyGraph:
+    """Adjacency maps over the tasks of one project."""
+
+    def __init__(self, rows):
+        self.tasks = {row['id']: row for row in rows}
+        self.dependents = defaultdict(list)
+        for row in rows:
+            if row['depends_on_id'] is not None:
+                self.dependents[row['depends_on_id']].append(row['id'])
+
+    def blockers(self, task_id):
+        """Ids of the tasks ``task_id`` waits for, nearest first (may end outside the project)."""
+        chain, seen = [], {task_id}
+        node = self.tasks[task_id]['depends_on_id'] if task_id in self.tasks else None
+        while node is not None and node not in seen:
+            chain.append(node)
+            seen.add(node)
+            node = self.tasks[node]['depends_on_id'] if node in self.tasks else None
+        return chain
+
+    def dependents_of(self, task_id):
+        """Ids of the tasks waiting for ``task_id`` directly or transitively, breadth first."""
+        found, queue, seen = [], [task_id], {task_id}
+        while queue:
+            for dependent_id in self.dependents.get(queue.pop(0), []):
+                if dependent_id not in seen:
+                    seen.add(dependent_id)
+                    found.append(dependent_id)
+                    queue.append(dependent_id)
+        return found
+
+    def _is_open(self, task_id):
+        return task_id in self.tasks and self.tasks[task_id]['status'] not in CLOSED_STATUSES
+
+    def finish_dates(self):
+        """
+        Earliest date every open task can be finished.
+
+        That is its own due date, unless an open blocker up its chain is due
+        later; tasks without a due date inherit their blocker's.
+        """
+        finish = {}
+        for task_id in self.tasks:
+            if not self._is_open(task_id) or task_id in finish:
+                continue
+            # Walk up to the first task already known (or the root), then back down.
+            chain, node = [], task_id
+            while self._is_open(node) and node not in finish and node not in chain:
+                chain.append(node)
+                node = self.tasks[node]['depends_on_id']
+            inherited = finish.get(node)
+            for node in reversed(chain):
+                due = self.tasks[node]['due_date']
+                inherited = max(filter(None, (due, inherited)), default=None)
+                finish[node] = inherited
+        return finish
+
+    def critical_path(self, finish=None):
+        """Chain of open tasks, root first, ending at the latest finish date (longest chain on ties)."""
+        finish = self.finish_dates() if finish is None else finish
+        dated = [task_id for task_id, date in finish.items() if date is not None]
+        if not dated:
+            return []
+        depth = {task_id: len([b for b in self.blockers(task_id) if self._is_open(b)]) for task_id in dated}
+        leaf = max(dated, key=lambda task_id: (finish[task_id], depth[task_id], -task_id))
+        path = [leaf]
+        for blocker_id in self.blockers(leaf):
+            if not self._is_open(blocker_id):
+                break
+            path.append(blocker_id)
+        return path[::-1]
+
+    def report(self):
+        finish = self.finish_dates()
+        path = self.critical_path(finish)
+        return {
+            'tasks': list(self.tasks.values()),
+            'critical_path': path,
+            'finish_date': finish[path[-1]] if path else None,
+            # Due before a blocker can be done.
+            'late': [
+                task_id for task_id, date in finish.items()
+                if self.tasks[task_id]['due_date'] and date > self.tasks[task_id]['due_date']
+            ],
+        }
+
+
+def get_graph(project_id):
+    """Dependency graph of a project (``None`` for tasks outside projects), cached until it changes."""
+    key = versioned_key(f'tasks:dependencies:{project_id}', dependency_version_name(project_id))
+    rows = cache.get(key)
+    if rows is None:
+        rows = list(Task.objects.filter(project_id=project_id).order_by().values(*GRAPH_FIELDS))
+        cache.set(key, rows, None)
+    return DependencyGraph(rows)
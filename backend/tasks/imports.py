@@ -0,0 +1,306 @@
+"""
+Bulk import of tasks from CSV and XLSX files.
+
+Files are read as a stream (``csv`` over the file, openpyxl in read-only
+mode) and handled ``CHUNK_SIZE`` rows at a time, so memory stays flat
+however long the file is.  Users, projects, columns and tags are loaded once
+into lookup dictionaries; each row of a chunk is checked against them
+without a query, and the valid rows of the chunk are written with
+``bulk_create`` in one transaction.  Invalid rows are skipped and reported.
+Chunks already written stay if a later one fails.
+
+No per-task signals run, neither ``post_save`` nor ``tasks_bulk_saved``
+(so nobody gets one notification per task and the activity log does not
+list imported tasks one by one).  Once the file is done, caches are
+invalidated and ``tasks_imported`` is sent once with the summary.
+"""
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from openpyxl import load_workbook
+from rest_framework.exceptions import ValidationError
+from core.cache import bump_model_version
+from core.search import reindex
+from .bulk import BATCH_SIZE, assign_ranks, _set_tags
+from .models import Project, Tag, Task, TaskColumn, TaskTransition, TASK_PRIORITIES, TASK_STATUSES
+from .signals import tasks_imported
+
+User = get_user_model()
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+IMPORT_FORMATS = ('csv', 'xlsx')
+
+# Column headers, in English or as written by the XLSX export.
+HEADERS = {
+    'title': ['title', 'название'],
+    'description': ['description', 'описание'],
+    'project': ['project', 'проект'],
+    'column': ['column', 'колонка'],
+    'status': ['status', 'статус'],
+    'priority': ['priority', 'приоритет'],
+    'assignee': ['assignee', 'исполнитель'],
+    'reporter': ['reporter', 'автор'],
+    'due_date': ['due_date', 'срок'],
+    'completed_at': ['completed_at', 'выполнена'],
+    'tags': ['tags', 'теги'],
+}
+DATE_FORMATS = ['%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y']
+TITLE_LENGTH = Task._meta.get_field('title').max_length
+TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def _choices(choices):
+    """Codes by code and by label, lowercased."""
+    codes = {code: code for code, _ in choices}
+    codes.update({str(label).lower(): code for code, label in choices})
+    return codes
+
+
+STATUSES = _choices(TASK_STATUSES)
+PRIORITIES = _choices(TASK_PRIORITIES)
+
+
+def _header(cells):
+    """Field of every column (``None`` for columns that are not imported)."""
+    aliases = {alias: name for name, names in HEADERS.items() for alias in names}
+    fields = [aliases.get(str(cell or '').strip().lower()) for cell in cells]
+    if 'title' not in fields:
+        raise ValidationError('The first row must name the columns, including title')
+    return fields
+
+
+def read_csv(fileobj):
+    """``(line, row)`` pairs of a CSV file; ``,``, ``;`` and tab separated files are recognized."""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        dialect = csv.Sniffer().sniff(text.read(4096), delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    text.seek(0)
+    reader = csv.reader(text, dialect)
+    fields = _header(next(reader, []))
+    for cells in reader:
+        if any(cells):
+            yield reader.line_num, dict(zip(fields, cells))
+
+
+def read_xlsx(fileobj):
+    """``(line, row)`` pairs of the first sheet of an XLSX file."""
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        fields = _header(next(rows, []))
+        for line, cells in enumerate(rows, start=2):
+            if any(cell not in (None, '') for cell in cells):
+                yield line, dict(zip(fields, cells))
+    finally:
+        workbook.close()
+
+
+READERS = {'csv': read_csv, 'xlsx': read_xlsx}
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _parse_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is not None:
+        return parsed
+    day = parse_date(value)
+    if day is not None:
+        return datetime.combine(day, time.min)
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    raise ValueError(f'Unknown date {value!r}')
+
+
+def _datetime(value):
+    """Aware datetime of a cell; dates are taken as local midnight."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime.combine(value, time.min)
+    else:
+        parsed = _parse_datetime(_text(value))
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+class Lookups:
+    """Ids of the users, projects, columns and tags rows refer to, by (lowercased) name."""
+
+    def __init__(self):
+        self.users = {}
+        for pk, username, email in User.objects.values_list('id', 'username', 'email'):
+            self.users[username.lower()] = pk
+            self.users[email.lower()] = pk
+        self.project_ids = set()
+        self.projects = {}
+        for pk, name in Project.objects.order_by('id').values_list('id', 'name'):
+            self.project_ids.add(pk)
+            self.projects.setdefault(name.lower(), pk)
+        self.columns, self.default_columns = {}, {}
+        for pk, project_id, name, is_default in TaskColumn.objects.order_by('position', 'id').values_list(
+            'id', 'project_id', 'name', 'is_default'
+        ):
+            self.columns.setdefault((project_id, name.lower()), pk)
+            if is_default:
+                self.default_columns.setdefault(project_id, pk)
+        self.tags = {name.lower(): pk for pk, name in Tag.objects.values_list('id', 'name')}
+
+    def project(self, value):
+        if value.isdigit() and int(value) in self.project_ids:
+            return int(value)
+        return self.projects.get(value.lower())
+
+    def column(self, project_id, name):
+        """The project's column called ``name``, or else the shared one."""
+        key = name.lower()
+        return self.columns.get((project_id, key)) or self.columns.get((None, key))
+
+    def default_column(self, project_id):
+        """The project's default column, or else the shared one."""
+        return self.default_columns.get(project_id) or self.default_columns.get(None)
+
+    def add_tags(self, names):
+        """Create the tags in ``names`` that do not exist yet."""
+        missing = {name.lower(): name for name in names if name.lower() not in self.tags}
+        if missing:
+            Tag.objects.bulk_create([Tag(name=name) for name in missing.values()], ignore_conflicts=True)
+            for pk, name in Tag.objects.filter(name__in=missing.values()).values_list('id', 'name'):
+                self.tags[name.lower()] = pk
+
+
+def build_task(row, lookups, user):
+    """Unsaved task and tag names for a row; raises ``ValueError`` with ``{column: message}``."""
+    errors = {}
+    values = {name: _text(value) for name, value in row.items() if name and name not in ('due_date', 'completed_at')}
+
+    title = values.get('title', '')
+    if not title:
+        errors['title'] = 'Required'
+    elif len(title) > TITLE_LENGTH:
+        errors['title'] = f'At most {TITLE_LENGTH} characters'
+    task = Task(title=title, description=values.get('description', ''), reporter=user)
+
+    for name, choices in (('status', STATUSES), ('priority', PRIORITIES)):
+        if values.get(name):
+            code = choices.get(values[name].lower())
+            if code is None:
+                errors[name] = f'Unknown value {values[name]!r}'
+            setattr(task, name, code)
+
+    for name in ('assignee', 'reporter'):
+        if values.get(name):
+            user_id = lookups.users.get(values[name].lower())
+            if user_id is None:
+                errors[name] = f'Unknown user {values[name]!r}'
+            setattr(task, f'{name}_id', user_id)
+
+    if values.get('project'):
+        task.project_id = lookups.project(values['project'])
+        if task.project_id is None:
+            errors['project'] = f'Unknown project {values["project"]!r}'
+    if values.get('column'):
+        task.column_id = lookups.column(task.project_id, values['column'])
+        if task.column_id is None:
+            errors['column'] = f'Unknown column {values["column"]!r}'
+    else:
+        task.column_id = lookups.default_column(task.project_id)
+
+    for name in ('due_date', 'completed_at'):
+        if row.get(name) not in (None, ''):
+            try:
+                setattr(task, name, _datetime(row[name]))
+            except ValueError as exc:
+                errors[name] = str(exc)
+    if task.status == 'done' and not task.completed_at:
+        task.completed_at = timezone.now()
+
+    tags = [name.strip() for name in values.get('tags', '').split(',') if name.strip()]
+    if any(len(name) > TAG_LENGTH for name in tags):
+        errors['tags'] = f'Tags are at most {TAG_LENGTH} characters'
+    if errors:
+        raise ValueError(errors)
+    return task, tags
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    project_ids: set = field(default_factory=set)
+    error: str = ''
+
+    def reject(self, line, errors):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': line, 'errors': errors})
+
+
+@transaction.atomic
+def _write_chunk(tasks, tags, lookups, user, result):
+    lookups.add_tags({name for names in tags for name in names})
+    assign_ranks(tasks)
+    Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+    _set_tags({
+        task.id: [lookups.tags[name.lower()] for name in names] for task, names in zip(tasks, tags) if names
+    })
+    reindex(Task.objects.filter(pk__in=[task.id for task in tasks]))
+    TaskTransition.objects.bulk_create(
+        [TaskTransition.build(task, changed_by=user) for task in tasks], batch_size=BATCH_SIZE,
+    )
+    result.created += len(tasks)
+    result.project_ids.update(task.project_id for task in tasks if task.project_id)
+
+
+def import_tasks(fileobj, file_format, user, chunk_size=CHUNK_SIZE):
+    """
+    Import the tasks of a CSV or XLSX file, reported by ``user`` unless a row names a reporter.
+
+    Returns an ``ImportResult``; raises ``ValidationError`` for a file
+    without a header row.  ``tasks_imported`` is sent in any case, with
+    ``result.error`` set when the import did not finish.
+    """
+    if file_format not in READERS:
+        raise ValidationError(f'Expected one of {", ".join(IMPORT_FORMATS)}')
+    lookups = Lookups()
+    result = ImportResult()
+    tasks, tags = [], []
+    try:
+        for line, row in READERS[file_format](fileobj):
+            try:
+                task, names = build_task(row, lookups, user)
+            except ValueError as exc:
+                result.reject(line, exc.args[0])
+                continue
+            tasks.append(task)
+            tags.append(names)
+            if len(tasks) >= chunk_size:
+                _write_chunk(tasks, tags, lookups, user, result)
+                tasks, tags = [], []
+        if tasks:
+            _write_chunk(tasks, tags, lookups, user, result)
+    except Exception as exc:
+        result.error = ' '.join(map(str, exc.detail)) if isinstance(exc, ValidationError) else str(exc)
+        raise
+    finally:
+        if result.created:
+            bump_model_version(Task, TaskTransition, Tag)
+        tasks_imported.send(sender=Task, user=user, result=result, project_ids=result.project_ids)
+    return result
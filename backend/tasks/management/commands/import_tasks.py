@@ -0,0 +1,39 @@
+"""
+Management command to import tasks from a CSV or XLSX file.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from tasks.imports import CHUNK_SIZE, IMPORT_FORMATS, import_tasks
+
+
+class Command(BaseCommand):
+    help = 'Import tasks from a CSV or XLSX file in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file')
+        parser.add_argument('--user', required=True, help='Username or email of the default reporter')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='File format (default: from the extension)')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        user = User.objects.filter(username=options['user']).first() or User.objects.filter(
+            email__iexact=options['user']
+        ).first()
+        if user is None:
+            raise CommandError(f'Unknown user {options["user"]!r}')
+        file_format = options['format'] or options['path'].rpartition('.')[2].lower()
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f'Unknown format {file_format!r}; pass --format')
+
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                result = import_tasks(fileobj, file_format, user, chunk_size=options['chunk_size'])
+        except (OSError, ValidationError) as exc:
+            raise CommandError(str(exc))
+        for error in result.errors:
+            self.stdout.write(self.style.WARNING(f'row {error["row"]}: {error["errors"]}'))
+        if result.skipped > len(result.errors):
+            self.stdout.write(self.style.WARNING(f'... {result.skipped - len(result.errors)} more row(s) skipped'))
+        self.stdout.write(self.style.SUCCESS(f'{result.created} task(s) created, {result.skipped} row(s) skipped'))
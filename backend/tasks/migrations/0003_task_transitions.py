@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_transitions(apps, schema_editor):
+    """Seed the log with one creation entry per existing task."""
+    Task = apps.get_model('tasks', 'Task')
+    TaskTransition = apps.get_model('tasks', 'TaskTransition')
+    tasks = Task.objects.values_list('id', 'project_id', 'status', 'column_id', 'created_at').order_by('id')
+    batch = []
+    for task_id, project_id, status, column_id, created_at in tasks.iterator(chunk_size=2000):
+        batch.append(TaskTransition(
+            task_id=task_id, project_id=project_id, to_status=status,
+            to_column_id=column_id, created_at=created_at,
+        ))
+        if len(batch) >= 2000:
+            TaskTransition.objects.bulk_create(batch)
+            batch = []
+    TaskTransition.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tasks', '0002_task_timestamp_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('todo', 'К выполнению'), ('in_progress', 'В работе'), ('review', 'На проверке'), ('done', 'Выполнено'), ('cancelled', 'Отменено')], max_length=20)),
+                ('to_status', models.CharField(choices=[('todo', 'К выполнению'), ('in_progress', 'В работе'), ('review', 'На проверке'), ('done', 'Выполнено'), ('cancelled', 'Отменено')], max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('from_column', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.taskcolumn')),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='tasks.project')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='tasks.task')),
+                ('to_column', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.taskcolumn')),
+            ],
+            options={
+                'verbose_name': 'Переход задачи',
+                'verbose_name_plural': 'Переходы задач',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['project', 'created_at'], name='tasks_taskt_project_9b4f8b_idx'), models.Index(fields=['task', 'created_at'], name='tasks_taskt_task_id_12dae5_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_transitions, migrations.RunPython.noop),
+    ]
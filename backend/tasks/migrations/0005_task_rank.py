@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:33
+
+from itertools import groupby
+from django.db import migrations, models
+
+# Ranks as tasks.ranking spaced them at the time of this migration: base-36
+# fractions without the leading "0." and trailing zeros.
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+MIN_GAP = 1000
+
+
+def spaced_ranks(count):
+    width = 1
+    while BASE ** width < (count + 1) * MIN_GAP:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [encode(step * (number + 1), width) for number in range(count)]
+
+
+def encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def rank_existing_tasks(apps, schema_editor):
+    """Rank every column (and each project's tasks outside columns) in their current order."""
+    Task = apps.get_model('tasks', 'Task')
+    tasks = Task.objects.only('id', 'column_id', 'project_id').order_by('column_id', 'project_id', 'position', '-created_at')
+    scope = lambda task: (task.column_id, None if task.column_id else task.project_id)
+    for _, group in groupby(tasks.iterator(chunk_size=2000), key=scope):
+        group = list(group)
+        for task, rank in zip(group, spaced_ranks(len(group))):
+            task.rank = rank
+        Task.objects.bulk_update(group, ['rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_project_status_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['rank', '-created_at'], 'verbose_name': 'Задача', 'verbose_name_plural': 'Задачи'},
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, db_collation='C', max_length=64, verbose_name='Порядок'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['column', 'rank'], name='tasks_task_column__131ec7_idx'),
+        ),
+        migrations.RunPython(rank_existing_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.7 on 2026-10-18 05:40
+
+import operator
+from functools import reduce
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# The vectors built by core.search at the time of this migration.
+SEARCH_CONFIGS = ('russian', 'english')
+STRIP_TAGS = (
+    "regexp_replace(regexp_replace(%(expressions)s, '<[^>]*>', ' ', 'g'), "
+    "'&#?[a-zA-Z0-9]+;', ' ', 'g')"
+)
+SEARCH_WEIGHTS = {
+    'Project': {'name': 'A', 'description': 'B'},
+    'Task': {'title': 'A', 'description': 'B'},
+}
+
+
+def search_vector(weights):
+    return reduce(operator.add, (
+        django.contrib.postgres.search.SearchVector(
+            models.Func(models.F(field), template=STRIP_TAGS, output_field=models.TextField()),
+            config=config, weight=weight,
+        )
+        for field, weight in weights.items()
+        for config in SEARCH_CONFIGS
+    ))
+
+
+def index_existing(apps, schema_editor):
+    for name, weights in SEARCH_WEIGHTS.items():
+        apps.get_model('tasks', name).objects.update(search_vector=search_vector(weights))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tasks_proje_search__17172d_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tasks_task_search__21079e_gin'),
+        ),
+        migrations.RunPython(index_existing, migrations.RunPython.noop),
+    ]
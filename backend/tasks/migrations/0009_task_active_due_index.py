@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:06
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so writes to the task table are not blocked meanwhile.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0008_task_recurrence'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('status__in', ['todo', 'in_progress', 'review'])), fields=['due_date', 'id'], name='tasks_task_active_due_idx'),
+        ),
+    ]
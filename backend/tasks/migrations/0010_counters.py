@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:15
+
+import core.counters
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_active_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='task_count',
+            field=core.counters.CounterField(counts='tasks', verbose_name='Задач'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=core.counters.CounterField(counts='comments', verbose_name='Комментариев'),
+        ),
+        migrations.AddField(
+            model_name='taskcolumn',
+            name='task_count',
+            field=core.counters.CounterField(counts='tasks', verbose_name='Задач'),
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='project',
+            name='task_count',
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='task',
+            name='comment_count',
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='taskcolumn',
+            name='task_count',
+        ),
+    ]
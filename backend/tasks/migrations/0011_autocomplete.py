@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:40
+
+import core.counters
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_counters'),
+        # Installs pg_trgm.
+        ('users', '0002_autocomplete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='task_count',
+            field=core.counters.CounterField(counts='tasks', verbose_name='Задач'),
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='tag',
+            name='task_count',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='tasks_project_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='tasks_tag_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,10 +1,16 @@
 """
 Task management models.
 """
-from django.db import models
+from functools import partial
+from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from ckeditor.fields import RichTextField
+from core.counters import CounterField
+from .ranking import MAX_LENGTH as MAX_RANK_LENGTH, append
 
 User = get_user_model()
 
@@ -23,6 +29,8 @@ TASK_STATUSES = [
     ('done', _('Выполнено')),
     ('cancelled', _('Отменено')),
 ]
+# Statuses of tasks still being worked on; covered by the partial due date index.
+ACTIVE_TASK_STATUSES = ['todo', 'in_progress', 'review']
 
 TASK_PRIORITIES = [
     ('low', _('Низкий')),
@@ -31,6 +39,10 @@ TASK_PRIORITIES = [
     ('urgent', _('Срочный')),
 ]
 
+# Full-text search weights (see ``core.search``).
+PROJECT_SEARCH_WEIGHTS = {'name': 'A', 'description': 'B'}
+TASK_SEARCH_WEIGHTS = {'title': 'A', 'description': 'B'}
+
 
 class Project(models.Model):
     """Project model."""
@@ -42,13 +54,19 @@ class Project(models.Model):
     end_date = models.DateField(null=True, blank=True, verbose_name=_('Дата окончания'))
     status = models.CharField(max_length=20, choices=PROJECT_STATUSES, default='planning', verbose_name=_('Статус'))
     color = models.CharField(max_length=7, default='#3B82F6', verbose_name=_('Цвет'))
+    task_count = CounterField(counts='tasks', verbose_name=_('Задач'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         verbose_name = _('Проект')
         verbose_name_plural = _('Проекты')
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='tasks_project_name_trgm'),
+        ]
     
     def __str__(self):
         return self.name
@@ -58,11 +76,15 @@ class Tag(models.Model):
     """Tag model for tasks."""
     name = models.CharField(max_length=50, unique=True, verbose_name=_('Название'))
     color = models.CharField(max_length=7, default='#6B7280', verbose_name=_('Цвет'))
+    task_count = CounterField(counts='tasks', verbose_name=_('Задач'))
     
     class Meta:
         verbose_name = _('Тег')
         verbose_name_plural = _('Теги')
         ordering = ['name']
+        indexes = [
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='tasks_tag_name_trgm'),
+        ]
     
     def __str__(self):
         return self.name
@@ -74,6 +96,7 @@ class TaskColumn(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='columns', null=True, blank=True)
     position = models.PositiveIntegerField(default=0, verbose_name=_('Позиция'))
     is_default = models.BooleanField(default=False, verbose_name=_('По умолчанию'))
+    task_count = CounterField(counts='tasks', verbose_name=_('Задач'))
     
     class Meta:
         verbose_name = _('Колонка задач')
@@ -97,20 +120,108 @@ class Task(models.Model):
     tags = models.ManyToManyField(Tag, blank=True, related_name='tasks')
     column = models.ForeignKey(TaskColumn, on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
     position = models.PositiveIntegerField(default=0, verbose_name=_('Позиция'))
+    rank = models.CharField(max_length=MAX_RANK_LENGTH, blank=True, db_collation='C', verbose_name=_('Порядок'))
     depends_on = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='dependents', verbose_name=_('Зависит от'))
     is_recurring = models.BooleanField(default=False, verbose_name=_('Повторяющаяся'))
     recurrence_pattern = models.CharField(max_length=50, blank=True, verbose_name=_('Паттерн повторения'))
+    recurrence_source = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences', verbose_name=_('Повторяющаяся задача'))
+    occurrence_at = models.DateTimeField(null=True, blank=True, editable=False)
+    recurrence_watermark = models.DateTimeField(null=True, blank=True, editable=False)
+    comment_count = CounterField(counts='comments', verbose_name=_('Комментариев'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
     
     class Meta:
         verbose_name = _('Задача')
         verbose_name_plural = _('Задачи')
-        ordering = ['position', '-created_at']
+        ordering = ['rank', '-created_at']
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['project', 'status', 'completed_at']),
+            models.Index(fields=['column', 'rank']),
+            models.Index(fields=['rank', '-created_at', '-id']),
+            GinIndex(fields=['search_vector']),
+            models.Index(
+                fields=['recurrence_watermark'], name='tasks_task_recurring_idx',
+                condition=models.Q(is_recurring=True, recurrence_source__isnull=True),
+            ),
+            models.Index(
+                fields=['due_date', 'id'], name='tasks_task_active_due_idx',
+                condition=models.Q(status__in=ACTIVE_TASK_STATUSES, due_date__isnull=False),
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['recurrence_source', 'occurrence_at'], name='tasks_task_unique_occurrence',
+                condition=models.Q(recurrence_source__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return self.title
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets a save that moves the task to another project tell the old one.
+        instance._loaded_project_id = instance.__dict__.get('project_id')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if not self.rank and append(self):
+            from .tasks import rebalance_task_ranks
+            transaction.on_commit(partial(rebalance_task_ranks.delay, self.column_id, self.project_id))
+        super().save(*args, **kwargs)
+
+
+class TaskTransition(models.Model):
+    """Append-only log of task status and column changes."""
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='transitions')
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    from_status = models.CharField(max_length=20, choices=TASK_STATUSES, blank=True)
+    to_status = models.CharField(max_length=20, choices=TASK_STATUSES)
+    from_column = models.ForeignKey(TaskColumn, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    to_column = models.ForeignKey(TaskColumn, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name = _('Переход задачи')
+        verbose_name_plural = _('Переходы задач')
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at']),
+            models.Index(fields=['task', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_id}: {self.from_status or '-'} -> {self.to_status}"
+    
+    @classmethod
+    def build(cls, task, from_status='', from_column_id=None, changed_by=None):
+        """Unsaved log entry for ``task``, or ``None`` if its status and column are unchanged."""
+        if from_status == task.status and from_column_id == task.column_id:
+            return None
+        return cls(
+            task=task,
+            project_id=task.project_id,
+            from_status=from_status,
+            to_status=task.status,
+            from_column_id=from_column_id,
+            to_column_id=task.column_id,
+            changed_by=changed_by,
+        )
+    
+    @classmethod
+    def record(cls, task, from_status='', from_column_id=None, changed_by=None):
+        """Log a change of ``task`` if its status or column differs from the old values."""
+        transition = cls.build(task, from_status, from_column_id, changed_by)
+        if transition is not None:
+            transition.save()
+        return transition
 
 
 class TaskComment(models.Model):
@@ -126,6 +237,9 @@ class TaskComment(models.Model):
         verbose_name = _('Комментарий')
         verbose_name_plural = _('Комментарии')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['task', '-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"Comment by {self.author} on {self.task}"
@@ -0,0 +1,136 @@
+"""
+Materialization of recurring tasks.
+
+A recurring task is the template of a series.  ``materialize`` creates its
+occurrences up to ``RECURRENCE_HORIZON_DAYS`` ahead.  Each series keeps a
+watermark: the moment up to which it is materialized, pushed on to just
+before its next occurrence.  A run only looks at series whose watermark is
+behind the horizon, i.e. that have an occurrence to create, and only
+creates occurrences after the watermark.  Workers lock batches of series with ``SKIP LOCKED``, so each
+series is advanced by one worker at a time, and occurrences that already
+exist (say after a watermark was reset) are skipped; a unique (series,
+occurrence) constraint backs this up.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .bulk import BATCH_SIZE, announce, assign_ranks
+from .models import Task, TaskColumn, TaskTransition
+from .recurrence import parse_pattern, series_start
+
+logger = logging.getLogger(__name__)
+
+SERIES_BATCH = 1000
+MAX_PER_SERIES = 366  # occurrences of one series per batch
+SERIES_FIELDS = [
+    'id', 'title', 'description', 'project_id', 'assignee_id', 'reporter_id', 'priority',
+    'due_date', 'created_at', 'recurrence_pattern', 'recurrence_watermark', 'search_vector',
+]
+
+
+def horizon(now=None):
+    """End of the last local day to materialize; it only moves once a day."""
+    day = timezone.localdate(now) + timedelta(days=settings.RECURRENCE_HORIZON_DAYS)
+    return timezone.make_aware(datetime.combine(day, time.max))
+
+
+def pending_series(until):
+    return Task.objects.filter(is_recurring=True, recurrence_source__isnull=True).exclude(
+        recurrence_pattern=''
+    ).filter(Q(recurrence_watermark__isnull=True) | Q(recurrence_watermark__lt=until))
+
+
+def occurrences(task, now, until):
+    """
+    Occurrences of ``task`` after its watermark up to ``until``, and the new watermark.
+
+    A series that was never materialized starts from ``now``, not from its
+    anchor in the past.
+    """
+    start = series_start(task)
+    after = task.recurrence_watermark or max(start, now)
+    rule = parse_pattern(task.recurrence_pattern, start)
+    dates = [date for date in rule.between(after, until, inc=True) if date > after]
+    if len(dates) > MAX_PER_SERIES:
+        dates = dates[:MAX_PER_SERIES]
+        return dates, dates[-1]
+    following = rule.after(until)
+    return dates, following - timedelta(microseconds=1) if following else until
+
+
+def _occurrence(task, date, column_id):
+    # Same title and description as the series, so the same search vector.
+    return Task(
+        title=task.title, description=task.description, project_id=task.project_id,
+        assignee_id=task.assignee_id, reporter_id=task.reporter_id, priority=task.priority,
+        column_id=column_id, due_date=date, recurrence_source_id=task.id, occurrence_at=date,
+        search_vector=task.search_vector,
+    )
+
+
+def _existing(series, new_tasks):
+    if not new_tasks:
+        return set()
+    return set(Task.objects.filter(
+        recurrence_source__in=series, occurrence_at__gte=min(task.occurrence_at for task in new_tasks),
+    ).values_list('recurrence_source_id', 'occurrence_at'))
+
+
+def _copy_tags(series, created):
+    Through = Task.tags.through
+    series_tags = {}
+    for task_id, tag_id in Through.objects.filter(task__in=series).values_list('task_id', 'tag_id'):
+        series_tags.setdefault(task_id, []).append(tag_id)
+    Through.objects.bulk_create([
+        Through(task_id=task.id, tag_id=tag_id)
+        for task in created for tag_id in series_tags.get(task.recurrence_source_id, [])
+    ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def _materialize_batch(now, until):
+    """Lock and advance one batch of series; returns (series, occurrences created)."""
+    with transaction.atomic():
+        series = list(
+            pending_series(until).select_for_update(skip_locked=True).only(*SERIES_FIELDS).order_by('id')[:SERIES_BATCH]
+        )
+        if not series:
+            return 0, 0
+        default_columns = dict(TaskColumn.objects.filter(
+            project_id__in={task.project_id for task in series}, is_default=True,
+        ).values_list('project_id', 'id'))
+
+        new_tasks = []
+        for task in series:
+            try:
+                dates, task.recurrence_watermark = occurrences(task, now, until)
+            except ValueError as exc:
+                logger.warning('Task %s has an invalid recurrence %r: %s', task.id, task.recurrence_pattern, exc)
+                task.recurrence_watermark = until
+                continue
+            new_tasks.extend(_occurrence(task, date, default_columns.get(task.project_id)) for date in dates)
+
+        existing = _existing(series, new_tasks)
+        created = [task for task in new_tasks if (task.recurrence_source_id, task.occurrence_at) not in existing]
+        assign_ranks(created)
+        Task.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        Task.objects.bulk_update(series, ['recurrence_watermark'], batch_size=BATCH_SIZE)
+        if created:
+            _copy_tags(series, created)
+            TaskTransition.objects.bulk_create([TaskTransition.build(task) for task in created], batch_size=BATCH_SIZE)
+            announce(created=created)
+    return len(series), len(created)
+
+
+def materialize(now=None):
+    """Create the occurrences of all series up to the horizon; returns how many were created."""
+    now = now or timezone.now()
+    until = horizon(now)
+    total = 0
+    while True:
+        series, created = _materialize_batch(now, until)
+        if not series:
+            return total
+        total += created
@@ -0,0 +1,160 @@
+"""
+Fractional ordering of tasks within a board column.
+
+A rank is a base-36 fraction written as a string of digits without the
+leading ``0.`` and without trailing zeros, so that comparing ranks as plain
+strings (the column uses the ``C`` collation) is comparing the fractions.
+There is always a rank strictly between two different ranks, which lets a
+move write only the moved task; once ranks grow longer than
+``REBALANCE_LENGTH`` the column is re-spaced in the background.
+"""
+from django.db import transaction
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+REBALANCE_LENGTH = 16
+MAX_LENGTH = 64
+MIN_GAP = 1000
+
+
+def rank_between(before=None, after=None):
+    """Shortest rank strictly between ``before`` and ``after`` (either may be empty)."""
+    before = before or ''
+    if after and before >= after:
+        raise ValueError(f'Rank {before!r} is not lower than {after!r}')
+
+    result = []
+    index = 0
+    while True:
+        low = DIGITS.index(before[index]) if index < len(before) else 0
+        high = DIGITS.index(after[index]) if after and index < len(after) else BASE
+        if high - low > 1:
+            result.append(DIGITS[(low + high) // 2])
+            return ''.join(result)
+        result.append(DIGITS[low])
+        if high - low == 1:
+            # Anything above the rest of ``before`` now stays below ``after``.
+            after = None
+        index += 1
+
+
+def spaced_ranks(count):
+    """``count`` increasing ranks, evenly spread with room for inserts in between."""
+    width = 1
+    while BASE ** width < (count + 1) * MIN_GAP:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [_encode(step * (number + 1), width) for number in range(count)]
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def column_tasks(task_model, column_id, project_id=None):
+    """Tasks sharing one ordering: a column, or a project's tasks outside any column."""
+    if column_id is not None:
+        return task_model.objects.filter(column_id=column_id)
+    return task_model.objects.filter(column__isnull=True, project_id=project_id)
+
+
+def rebalance(task_model, column_id, project_id=None):
+    """Re-spread the ranks of one column evenly; returns the number of tasks."""
+    with transaction.atomic():
+        tasks = list(
+            column_tasks(task_model, column_id, project_id).select_for_update().order_by('rank', 'id').only('id', 'rank')
+        )
+        for task, rank in zip(tasks, spaced_ranks(len(tasks))):
+            task.rank = rank
+        task_model.objects.bulk_update(tasks, ['rank'], batch_size=1000)
+    return len(tasks)
+
+
+def _neighbours(siblings, previous_id, next_id, position):
+    if previous_id or next_id:
+        wanted = [task_id for task_id in (previous_id, next_id) if task_id]
+        ranks = dict(siblings.filter(pk__in=wanted).values_list('pk', 'rank'))
+        if len(ranks) != len(wanted):
+            raise ValueError('Neighbour task is not in the column')
+        before, after = ranks.get(previous_id), ranks.get(next_id)
+        if after is None:
+            after = siblings.filter(rank__gt=before).order_by('rank').values_list('rank', flat=True).first()
+        if before is None:
+            before = siblings.filter(rank__lt=after).order_by('-rank').values_list('rank', flat=True).first()
+        return before, after
+
+    ordered = siblings.order_by('rank', 'id').values_list('rank', flat=True)
+    if position <= 0:
+        return None, ordered.first()
+    window = list(ordered[position - 1:position + 1])
+    if not window:
+        return siblings.order_by('-rank').values_list('rank', flat=True).first(), None
+    return window[0], window[1] if len(window) > 1 else None
+
+
+def place(task, previous_id=None, next_id=None, position=0):
+    """
+    Set ``task.rank`` for its (new) column without touching other tasks.
+
+    The place is given by the neighbour ids (``previous_id`` above,
+    ``next_id`` below) or by the index ``position``.  Neighbours sharing a
+    rank (concurrent moves into the same gap) or a rank that would not fit
+    the column force an immediate rebalance.  Returns ``True`` when the new
+    rank is long enough for a background rebalance to be due.
+    """
+    model = type(task)
+    siblings = column_tasks(model, task.column_id, task.project_id).exclude(pk=task.pk)
+    neighbours = _neighbours(siblings, previous_id, next_id, position)
+    try:
+        rank = rank_between(*neighbours)
+    except ValueError:
+        rank = None
+    if rank is None or len(rank) > MAX_LENGTH:
+        rebalance(model, task.column_id, task.project_id)
+        rank = rank_between(*_neighbours(siblings, previous_id, next_id, position))
+    task.rank = rank
+    return len(rank) > REBALANCE_LENGTH
+
+
+def rank_after(last=None):
+    """
+    Short rank above ``last``: its leading digits up to the first one below
+    ``z``, incremented.
+
+    ``rank_between(last, None)`` would make each appended rank a little
+    longer than the one before; this only lengthens ranks once the leading
+    digits are all ``z``, i.e. every ``BASE - 1`` appends at the top.
+    """
+    if not last:
+        return rank_between(None, None)
+    width = next((index + 1 for index, digit in enumerate(last) if digit != DIGITS[-1]), len(last) + 1)
+    value = 0
+    for digit in last[:width].ljust(width, DIGITS[0]):
+        value = value * BASE + DIGITS.index(digit)
+    return _encode(value + 1, width)
+
+
+def append(task):
+    """
+    Set ``task.rank`` to the end of its column; like ``place``, rebalances
+    at once when the rank would not fit and returns ``True`` when a
+    background rebalance is due.
+    """
+    model = type(task)
+    ranked = column_tasks(model, task.column_id, task.project_id).exclude(rank='').order_by('-rank')
+    rank = rank_after(ranked.values_list('rank', flat=True).first())
+    if len(rank) > MAX_LENGTH:
+        rebalance(model, task.column_id, task.project_id)
+        rank = rank_after(ranked.values_list('rank', flat=True).first())
+    task.rank = rank
+    return len(rank) > REBALANCE_LENGTH
+
+
+def ranks_after(last, count):
+    """``count`` increasing ranks above ``last``, sharing one short prefix."""
+    prefix = rank_after(last)
+    return [prefix + rank for rank in spaced_ranks(count)]
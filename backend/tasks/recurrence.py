@@ -0,0 +1,60 @@
+"""
+Recurrence patterns of recurring tasks.
+
+A pattern is either a preset (``daily``, ``weekly``, ``weekly:mon,thu``,
+``monthly``, ``monthly:1,15,-1``, ``yearly``) or an RFC 5545 ``RRULE`` of at
+least daily frequency.  It is anchored at the task's due date (or creation
+time); ``tasks.occurrences`` turns it into tasks.
+"""
+import re
+from dateutil.rrule import rrule, rrulestr, DAILY, WEEKLY, MONTHLY, YEARLY, MO, TU, WE, TH, FR, SA, SU
+from django.utils import timezone
+from rest_framework import serializers
+
+PRESETS = {'daily': DAILY, 'weekly': WEEKLY, 'monthly': MONTHLY, 'yearly': YEARLY}
+WEEKDAYS = {'mon': MO, 'tue': TU, 'wed': WE, 'thu': TH, 'fri': FR, 'sat': SA, 'sun': SU}
+SUB_DAILY = re.compile(r'FREQ=(HOURLY|MINUTELY|SECONDLY)', re.IGNORECASE)
+
+
+def parse_pattern(pattern, dtstart):
+    """``rrule`` for a recurrence pattern; raises ``ValueError`` for an invalid one."""
+    pattern = pattern.strip()
+    if '=' in pattern:
+        if SUB_DAILY.search(pattern):
+            raise ValueError('Recurrence more frequent than daily is not supported')
+        rule = rrulestr(pattern.removeprefix('RRULE:'), dtstart=dtstart)
+        if not isinstance(rule, rrule):
+            raise ValueError('Expected a single RRULE')
+        return rule
+
+    name, _, args = pattern.lower().partition(':')
+    if name not in PRESETS:
+        raise ValueError(f'Unknown recurrence {name!r}')
+    options = {}
+    if args:
+        values = [value.strip() for value in args.split(',')]
+        if name == 'weekly':
+            if not set(values) <= set(WEEKDAYS):
+                raise ValueError(f'Weekdays are {", ".join(WEEKDAYS)}')
+            options['byweekday'] = [WEEKDAYS[value] for value in values]
+        elif name == 'monthly':
+            options['bymonthday'] = [int(value) for value in values]
+            if not all(1 <= abs(day) <= 31 for day in options['bymonthday']):
+                raise ValueError('Days of month are 1..31 or -31..-1')
+        else:
+            raise ValueError(f'{name!r} takes no arguments')
+    return rrule(PRESETS[name], dtstart=dtstart, **options)
+
+
+def series_start(task):
+    """Anchor of a series, in local time so weekdays and month days are local ones."""
+    return timezone.localtime(task.due_date or task.created_at or timezone.now()).replace(microsecond=0)
+
+
+def validate_recurrence_pattern(value):
+    """Serializer field validator; an empty pattern is allowed."""
+    if value:
+        try:
+            parse_pattern(value, timezone.localtime())
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
@@ -1,73 +1,146 @@
 """
 Serializers for tasks app.
 """
+from django.db.models import Manager
 from rest_framework import serializers
+from core.search import SearchResultSerializerMixin
+from core.serializers import DynamicFieldsMixin
+from .graph import find_cycle
 from .models import Project, Task, Tag, TaskColumn, TaskComment
+from .recurrence import validate_recurrence_pattern
+from .stats import task_stats
 from users.serializers import UserSerializer
 
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ['id', 'name', 'color']
 
 
-class ProjectSerializer(serializers.ModelSerializer):
-    manager = UserSerializer(read_only=True)
+class TaskStatsField(serializers.Field):
+    """Task counts of a project, from the page computed by ``ProjectListSerializer`` when there is one."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(source='id', read_only=True, **kwargs)
+    
+    def to_representation(self, project_id):
+        stats = self.context.get('task_stats', {})
+        if project_id not in stats:
+            stats = task_stats([project_id])
+        return stats[project_id]
+
+
+class ProjectListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        if 'task_stats' in self.child.fields:
+            data = list(data.all() if isinstance(data, Manager) else data)
+            self.context['task_stats'] = task_stats(project.pk for project in data)
+        return super().to_representation(data)
+
+
+class ProjectSerializer(DynamicFieldsMixin, SearchResultSerializerMixin, serializers.ModelSerializer):
     manager_id = serializers.IntegerField(write_only=True)
-    task_count = serializers.IntegerField(read_only=True)
+    task_stats = TaskStatsField()
     
     class Meta:
         model = Project
         fields = [
             'id', 'name', 'description', 'manager', 'manager_id', 'department',
-            'start_date', 'end_date', 'status', 'color', 'task_count',
-            'created_at', 'updated_at'
+            'start_date', 'end_date', 'status', 'color', 'task_count', 'task_stats',
+            'created_at', 'updated_at', 'search_rank', 'search_headline'
         ]
-        read_only_fields = ['created_at', 'updated_at']
+        read_only_fields = ['manager', 'created_at', 'updated_at']
+        expandable_fields = {
+            'manager': (UserSerializer, {}),
+        }
+        list_serializer_class = ProjectListSerializer
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        # Projects nested in other objects would need a query each.
+        if not self._is_root():
+            fields.pop('task_stats', None)
+        return fields
 
 
-class TaskColumnSerializer(serializers.ModelSerializer):
-    task_count = serializers.IntegerField(read_only=True)
-    
+class TaskColumnSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TaskColumn
         fields = ['id', 'name', 'project', 'position', 'is_default', 'task_count']
 
 
-class TaskSerializer(serializers.ModelSerializer):
-    assignee = UserSerializer(read_only=True)
-    reporter = UserSerializer(read_only=True)
-    project = ProjectSerializer(read_only=True)
-    tags = TagSerializer(many=True, read_only=True)
-    column = TaskColumnSerializer(read_only=True)
+class TaskSerializer(DynamicFieldsMixin, SearchResultSerializerMixin, serializers.ModelSerializer):
     assignee_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     reporter_id = serializers.IntegerField(write_only=True, required=False)
     project_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     tag_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
     column_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
-    comment_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Task
         fields = [
             'id', 'title', 'description', 'project', 'project_id', 'assignee', 'assignee_id',
             'reporter', 'reporter_id', 'priority', 'status', 'due_date', 'tags', 'tag_ids',
-            'column', 'column_id', 'position', 'depends_on', 'is_recurring', 'recurrence_pattern',
-            'comment_count', 'created_at', 'updated_at', 'completed_at'
+            'column', 'column_id', 'position', 'rank', 'depends_on', 'is_recurring', 'recurrence_pattern',
+            'recurrence_source', 'occurrence_at', 'comment_count', 'created_at', 'updated_at', 'completed_at',
+            'search_rank', 'search_headline'
+        ]
+        read_only_fields = [
+            'project', 'assignee', 'reporter', 'tags', 'column', 'rank', 'recurrence_source',
+            'created_at', 'updated_at', 'completed_at'
+        ]
+        extra_kwargs = {'recurrence_pattern': {'validators': [validate_recurrence_pattern]}}
+        expandable_fields = {
+            'project': (ProjectSerializer, {}),
+            'assignee': (UserSerializer, {}),
+            'reporter': (UserSerializer, {}),
+            'tags': (TagSerializer, {'many': True}),
+            'column': (TaskColumnSerializer, {}),
+            'depends_on': ('tasks.serializers.TaskSerializer', {}),
+            'recurrence_source': ('tasks.serializers.TaskSerializer', {}),
+        }
+    
+    def validate(self, attrs):
+        depends_on = attrs.get('depends_on')
+        if self.instance is not None and depends_on is not None:
+            cycle = find_cycle({self.instance.pk: depends_on.pk})
+            if cycle:
+                raise serializers.ValidationError({
+                    'depends_on': f'Dependency cycle: {" -> ".join(map(str, cycle))}'
+                })
+        return attrs
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """One item of a bulk create/update payload; related objects are given by id."""
+    id = serializers.IntegerField(required=False)
+    project_id = serializers.IntegerField(required=False, allow_null=True)
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    column_id = serializers.IntegerField(required=False, allow_null=True)
+    depends_on_id = serializers.IntegerField(required=False, allow_null=True)
+    tag_ids = serializers.ListField(child=serializers.IntegerField(), required=False)
+    
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'description', 'project_id', 'assignee_id', 'priority', 'status',
+            'due_date', 'column_id', 'depends_on_id', 'is_recurring', 'recurrence_pattern', 'tag_ids'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'completed_at']
+        extra_kwargs = {'recurrence_pattern': {'validators': [validate_recurrence_pattern]}}
 
 
-class TaskCommentSerializer(serializers.ModelSerializer):
-    author = UserSerializer(read_only=True)
-    mentions = UserSerializer(many=True, read_only=True)
+class TaskCommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     mention_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
     
     class Meta:
         model = TaskComment
         fields = ['id', 'task', 'author', 'content', 'mentions', 'mention_ids', 'created_at', 'updated_at']
-        read_only_fields = ['author', 'created_at', 'updated_at']
+        read_only_fields = ['author', 'mentions', 'created_at', 'updated_at']
+        expandable_fields = {
+            'author': (UserSerializer, {}),
+            'mentions': (UserSerializer, {'many': True}),
+        }
     
     def create(self, validated_data):
         mention_ids = validated_data.pop('mention_ids', [])
@@ -0,0 +1,49 @@
+"""
+Signals for tasks app.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from core.cache import bump_version, track_model_versions
+from .graph import dependency_version_name
+from .models import Project, Tag, Task, TaskColumn, TaskComment
+
+# Sent by ``tasks.bulk`` once a bulk operation has been committed, instead of
+# the per-row ``post_save`` signals that ``bulk_create``/``bulk_update`` skip.
+# Arguments: ``created``, ``updated`` and ``reassigned`` (lists of tasks; a
+# reassigned task is also in ``updated``) and ``project_ids`` (the projects
+# the tasks were in before or after).
+tasks_bulk_saved = Signal()
+
+# Sent by ``tasks.imports`` once per imported file (the tasks of an import
+# are announced through neither ``post_save`` nor ``tasks_bulk_saved``).
+# Arguments: ``user`` (who imported), ``result`` (the ``ImportResult``) and
+# ``project_ids`` (the projects tasks were imported into).
+tasks_imported = Signal()
+
+DEPENDENCY_FIELDS = {'depends_on', 'due_date', 'status', 'project', 'title'}
+
+track_model_versions(Project, Tag, Task, TaskColumn, TaskComment)
+
+
+def _bump_graphs(*project_ids):
+    bump_version(*{dependency_version_name(project_id) for project_id in project_ids})
+
+
+@receiver(post_save, sender='tasks.Task')
+def invalidate_dependency_graph(sender, instance, update_fields=None, **kwargs):
+    """A task may have changed its blocker, dates or status, or moved between projects."""
+    if update_fields is not None and not DEPENDENCY_FIELDS & set(update_fields):
+        return
+    _bump_graphs(instance.project_id, getattr(instance, '_loaded_project_id', instance.project_id))
+
+
+@receiver(post_delete, sender='tasks.Task')
+def invalidate_deleted_dependency_graph(sender, instance, **kwargs):
+    _bump_graphs(instance.project_id)
+
+
+@receiver(tasks_bulk_saved)
+@receiver(tasks_imported)
+def invalidate_bulk_dependency_graphs(sender, project_ids=(), **kwargs):
+    # ``project_ids`` leaves out tasks outside projects.
+    _bump_graphs(None, *project_ids)
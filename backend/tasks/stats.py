@@ -0,0 +1,43 @@
+"""
+Task statistics of projects.
+
+Project lists show how the tasks of every project on the page are spread
+over statuses and priorities, and how many are overdue.  ``task_stats``
+computes this for a whole page with one query grouped by project, using
+conditional counts, so the cost does not grow with the page size.  Overdue
+counts are taken as of ``stats_time``, which only moves once a minute, so
+conditional GETs of project lists stay valid for that long.
+"""
+from datetime import datetime, timezone as dt_timezone
+from django.db.models import Count, Q
+from django.utils import timezone
+from .models import ACTIVE_TASK_STATUSES, TASK_PRIORITIES, TASK_STATUSES, Task
+
+STATS_RESOLUTION = 60  # seconds
+
+
+def stats_time(now=None):
+    """``now`` rounded down to ``STATS_RESOLUTION``."""
+    timestamp = (now or timezone.now()).timestamp()
+    return datetime.fromtimestamp(timestamp - timestamp % STATS_RESOLUTION, tz=dt_timezone.utc)
+
+
+def _stats(row):
+    return {
+        'by_status': {code: row.get(f'status_{code}', 0) for code, _ in TASK_STATUSES},
+        'by_priority': {code: row.get(f'priority_{code}', 0) for code, _ in TASK_PRIORITIES},
+        'overdue': row.get('overdue', 0),
+    }
+
+
+def task_stats(project_ids, now=None):
+    """``{project_id: stats}`` for every id in ``project_ids``, in one query."""
+    project_ids = list(project_ids)
+    if not project_ids:
+        return {}
+    aggregates = {f'status_{code}': Count('id', filter=Q(status=code)) for code, _ in TASK_STATUSES}
+    aggregates.update({f'priority_{code}': Count('id', filter=Q(priority=code)) for code, _ in TASK_PRIORITIES})
+    aggregates['overdue'] = Count('id', filter=Q(due_date__lt=stats_time(now), status__in=ACTIVE_TASK_STATUSES))
+    rows = Task.objects.filter(project_id__in=project_ids).values('project_id').annotate(**aggregates).order_by()
+    found = {row.pop('project_id'): row for row in rows}
+    return {project_id: _stats(found.get(project_id, {})) for project_id in project_ids}
@@ -0,0 +1,37 @@
+"""
+Background jobs for tasks app.
+"""
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from core.cache import bump_model_version
+from .imports import import_tasks
+from .models import Task
+from .ranking import rebalance
+from .occurrences import materialize
+
+
+@shared_task
+def rebalance_task_ranks(column_id, project_id=None):
+    """Re-spread the ranks of a column whose ranks grew too long."""
+    count = rebalance(Task, column_id, project_id)
+    bump_model_version(Task)
+    return count
+
+
+@shared_task
+def materialize_recurring_tasks():
+    """Create upcoming occurrences of recurring tasks (a no-op once done for the day)."""
+    return materialize()
+
+
+@shared_task
+def import_tasks_file(name, file_format, user_id):
+    """Import an uploaded file of tasks (the user is notified by ``tasks_imported``), then delete it."""
+    user = get_user_model().objects.get(pk=user_id)
+    try:
+        with default_storage.open(name, 'rb') as fileobj:
+            result = import_tasks(fileobj, file_format, user)
+    finally:
+        default_storage.delete(name)
+    return {'created': result.created, 'skipped': result.skipped}
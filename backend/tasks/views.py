@@ -3,43 +3,67 @@ Views for tasks app.
 """
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
-from .models import Project, Task, Tag, TaskColumn, TaskComment
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from core.pagination import PageOrCursorPagination
+from core.cache import bump_model_version
+from core.conditional import ConditionalGetMixin
+from core.search import FullTextSearchFilter
+from core.serializers import DynamicFieldsViewMixin
+from .board import build_board
+from .graph import get_graph
+from users.models import Department, Role, User
+from .bulk import validate_batch, create_tasks, update_tasks
+from .imports import IMPORT_FORMATS
+from .models import Project, Task, Tag, TaskColumn, TaskComment, TaskTransition, TASK_STATUSES
 from .serializers import (
     ProjectSerializer, TaskSerializer, TagSerializer,
     TaskColumnSerializer, TaskCommentSerializer
 )
+from .ranking import place, spaced_ranks
+from .stats import stats_time
+from .tasks import import_tasks_file, rebalance_task_ranks
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.select_related('manager', 'department').annotate(
-        task_count=Count('tasks')
-    ).all()
+def _optional_int(value):
+    return None if value in (None, '') else int(value)
+
+
+class ProjectViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.select_related('manager', 'department').all()
+    conditional_models = (Task, User, Department, Role)
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'department', 'manager']
-    search_fields = ['name', 'description']
+    search_headline_field = 'description'
     ordering_fields = ['created_at', 'name']
     ordering = ['-created_at']
+    
+    def get_conditional_parts(self):
+        # Overdue counts in ``task_stats`` change as time passes.
+        return [stats_time().timestamp()]
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Task.objects.select_related(
         'project', 'assignee', 'reporter', 'column', 'depends_on'
-    ).prefetch_related('tags').annotate(
-        comment_count=Count('comments')
-    ).all()
+    ).prefetch_related('tags').all()
+    conditional_models = (Project, Tag, TaskColumn, TaskComment, User, Department, Role)
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = PageOrCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     filterset_fields = ['status', 'priority', 'project', 'assignee', 'reporter', 'column']
-    search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'due_date', 'priority', 'position']
-    ordering = ['position', '-created_at']
+    search_headline_field = 'description'
+    ordering_fields = ['created_at', 'due_date', 'priority', 'position', 'rank']
+    ordering = ['rank', '-created_at']
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -56,15 +80,124 @@ class TaskViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Get all columns of a project with their task cards in one response.
+        
+        The board is not paginated, so it is only served for one project.
+        """
+        project_id = request.query_params.get('project')
+        if not project_id:
+            return Response({'error': 'Project is required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not project_id.isdigit():
+            return Response({'error': 'Invalid project'}, status=status.HTTP_400_BAD_REQUEST)
+        if not Project.objects.filter(pk=project_id).exists():
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        project_id = int(project_id)
+        return self.conditional(request, lambda: Response(build_board(project_id)))
+    
+    @action(detail=False, methods=['get'])
+    def dependency_graph(self, request):
+        """Dependency edges of a project's tasks with the critical path and late tasks."""
+        project_id = request.query_params.get('project')
+        if project_id:
+            if not project_id.isdigit():
+                return Response({'error': 'Invalid project'}, status=status.HTTP_400_BAD_REQUEST)
+            if not Project.objects.filter(pk=project_id).exists():
+                return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+            project_id = int(project_id)
+        return self.conditional(
+            request, lambda: Response({'project': project_id or None, **get_graph(project_id or None).report()})
+        )
+    
+    @action(detail=True, methods=['get'])
+    def dependencies(self, request, pk=None):
+        """Tasks this task waits for (nearest first) and tasks waiting for it."""
+        def build():
+            task = self.get_object()
+            graph = get_graph(task.project_id)
+            return Response({
+                'task': task.id,
+                'blockers': graph.blockers(task.id),
+                'dependents': graph.dependents_of(task.id),
+            })
+        return self.conditional(request, build)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        """Create a list of tasks in one transaction."""
+        tasks = create_tasks(validate_batch(request.data), request.user)
+        return Response({'created': [task.id for task in tasks]}, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_file(self, request):
+        """
+        Import a CSV or XLSX ``file`` of tasks in the background.
+        
+        The format is taken from ``file_format`` or the file name; the user
+        gets a notification with the summary once the import is done.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = (request.data.get('file_format') or upload.name.rpartition('.')[2]).lower()
+        if file_format not in IMPORT_FORMATS:
+            return Response(
+                {'error': f'file_format must be one of {", ".join(IMPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        name = default_storage.save(f'imports/tasks.{file_format}', upload)
+        import_tasks_file.delay(name, file_format, request.user.id)
+        return Response({'file': upload.name, 'status': 'queued'}, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """Apply a list of partial updates (each with the task ``id``) in one transaction."""
+        tasks = update_tasks(validate_batch(request.data, partial=True), request.user)
+        return Response({'updated': [task.id for task in tasks]})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """Set the status of the tasks listed in ``task_ids``."""
+        return self._bulk_set(request, 'status')
+    
+    @action(detail=False, methods=['post'])
+    def bulk_assign(self, request):
+        """Assign the tasks listed in ``task_ids`` to ``assignee_id`` (null to unassign)."""
+        return self._bulk_set(request, 'assignee_id')
+    
+    def _bulk_set(self, request, field):
+        task_ids = request.data.get('task_ids')
+        if not isinstance(task_ids, list) or field not in request.data:
+            return Response({'error': f'task_ids and {field} are required'}, status=status.HTTP_400_BAD_REQUEST)
+        rows = [{'id': task_id, field: request.data[field]} for task_id in task_ids]
+        tasks = update_tasks(validate_batch(rows, partial=True), request.user)
+        return Response({'updated': [task.id for task in tasks]})
+    
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(reporter=self.request.user)
+        task = serializer.save(reporter=self.request.user)
+        TaskTransition.record(task, changed_by=self.request.user)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_status, old_column_id = serializer.instance.status, serializer.instance.column_id
+        task = serializer.save()
+        TaskTransition.record(task, old_status, old_column_id, changed_by=self.request.user)
     
     @action(detail=True, methods=['post'])
     def move(self, request, pk=None):
-        """Move task to different column/position."""
+        """
+        Move task to different column/position.
+        
+        The place is given by the neighbouring cards (``previous_id`` above,
+        ``next_id`` below) or by the index ``position`` in the column; only
+        the moved task is written.
+        """
         task = self.get_object()
         column_id = request.data.get('column_id')
-        position = request.data.get('position', 0)
+        old_column_id = task.column_id
         
         if column_id:
             try:
@@ -73,10 +206,66 @@ class TaskViewSet(viewsets.ModelViewSet):
             except TaskColumn.DoesNotExist:
                 return Response({'error': 'Column not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        task.position = position
-        task.save()
+        try:
+            position = int(request.data.get('position') or 0)
+            with transaction.atomic():
+                crowded = place(
+                    task,
+                    previous_id=_optional_int(request.data.get('previous_id')),
+                    next_id=_optional_int(request.data.get('next_id')),
+                    position=position,
+                )
+                task.save(update_fields=['column', 'rank', 'updated_at'])
+                TaskTransition.record(task, task.status, old_column_id, changed_by=request.user)
+                if crowded:
+                    transaction.on_commit(lambda: rebalance_task_ranks.delay(task.column_id, task.project_id))
+        except (TypeError, ValueError) as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
+    
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        """
+        Apply a column's new order in one transaction.
+        
+        ``task_ids`` lists the column's tasks top to bottom; tasks from other
+        columns are moved in, tasks of the column left out keep their
+        relative order below the listed ones.
+        """
+        task_ids = request.data.get('task_ids')
+        if not isinstance(task_ids, list) or not all(isinstance(task_id, int) for task_id in task_ids):
+            return Response({'error': 'task_ids must be a list of task ids'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(set(task_ids)) != len(task_ids):
+            return Response({'error': 'Duplicate task ids'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            column = TaskColumn.objects.get(id=request.data.get('column_id'))
+        except (TaskColumn.DoesNotExist, TypeError, ValueError):
+            return Response({'error': 'Column not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        fields = ['id', 'project_id', 'column_id', 'status', 'rank']
+        with transaction.atomic():
+            listed = Task.objects.select_for_update().filter(pk__in=task_ids).only(*fields).in_bulk()
+            if len(listed) != len(task_ids):
+                return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+            if column.project_id and any(task.project_id != column.project_id for task in listed.values()):
+                return Response({'error': 'Task belongs to another project'}, status=status.HTTP_400_BAD_REQUEST)
+            
+            rest = Task.objects.select_for_update().filter(column=column).exclude(pk__in=task_ids)
+            ordered = [listed[task_id] for task_id in task_ids] + list(rest.order_by('rank', 'id').only(*fields))
+            transitions = []
+            for task, rank in zip(ordered, spaced_ranks(len(ordered))):
+                old_column_id = task.column_id
+                task.column = column
+                task.rank = rank
+                transition = TaskTransition.build(task, task.status, old_column_id, changed_by=request.user)
+                if transition:
+                    transitions.append(transition)
+            Task.objects.bulk_update(ordered, ['column', 'rank'], batch_size=1000)
+            TaskTransition.objects.bulk_create(transitions)
+            transaction.on_commit(lambda: bump_model_version(Task))
         
-        return Response(TaskSerializer(task).data)
+        return Response({'column_id': column.id, 'task_ids': [task.id for task in ordered]})
     
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
@@ -84,19 +273,21 @@ class TaskViewSet(viewsets.ModelViewSet):
         task = self.get_object()
         new_status = request.data.get('status')
         
-        if new_status not in dict(Task.TASK_STATUSES):
+        if new_status not in dict(TASK_STATUSES):
             return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
         
+        old_status = task.status
         task.status = new_status
         if new_status == 'done' and not task.completed_at:
-            from django.utils import timezone
             task.completed_at = timezone.now()
-        task.save()
+        with transaction.atomic():
+            task.save()
+            TaskTransition.record(task, old_status, task.column_id, changed_by=request.user)
         
-        return Response(TaskSerializer(task).data)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
 
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [IsAuthenticated]
@@ -104,18 +295,20 @@ class TagViewSet(viewsets.ModelViewSet):
     search_fields = ['name']
 
 
-class TaskColumnViewSet(viewsets.ModelViewSet):
-    queryset = TaskColumn.objects.annotate(task_count=Count('tasks')).all()
+class TaskColumnViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
+    queryset = TaskColumn.objects.all()
     serializer_class = TaskColumnSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['project']
 
 
-class TaskCommentViewSet(viewsets.ModelViewSet):
+class TaskCommentViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = TaskComment.objects.select_related('author', 'task').prefetch_related('mentions').all()
+    conditional_models = (User, Department, Role)
     serializer_class = TaskCommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PageOrCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['task']
     
@@ -4,4 +4,11 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+    
+    def ready(self):
+        from core.autocomplete import register
+        from .models import USER_AUTOCOMPLETE_FIELDS, full_name_expression
+        users = self.get_model('User').objects.filter(is_active=True).annotate(full_name=full_name_expression())
+        register('users', users, USER_AUTOCOMPLETE_FIELDS, 'assigned_task_count', ['id', 'username', 'full_name'])
+        import users.signals  # noqa
 
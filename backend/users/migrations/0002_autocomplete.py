@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:40
+
+import core.counters
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('tasks', '0010_counters'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='user',
+            name='assigned_task_count',
+            field=core.counters.CounterField(counts='assigned_tasks', verbose_name='Назначено задач'),
+        ),
+        core.counters.CreateCounterTriggers(
+            model_name='user',
+            name='assigned_task_count',
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(models.Func(django.db.models.functions.comparison.Cast('first_name', models.TextField()), django.db.models.functions.comparison.Cast('last_name', models.TextField()), django.db.models.functions.comparison.Cast('username', models.TextField()), django.db.models.functions.comparison.Cast('email', models.TextField()), arg_joiner=" || ' ' || ", output_field=models.TextField(), template='(%(expressions)s)'), name='gin_trgm_ops'), name='users_user_name_trgm'),
+        ),
+    ]
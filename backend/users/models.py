@@ -2,8 +2,21 @@
 User models for corporate portal.
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
 from django.utils.translation import gettext_lazy as _
+from core.autocomplete import search_text
+from core.counters import CounterField
+
+# Matched by user autocomplete as one ``search_text``, trigram indexed.
+USER_AUTOCOMPLETE_FIELDS = ['first_name', 'last_name', 'username', 'email']
+
+
+def full_name_expression():
+    """``User.full_name`` computed in the database."""
+    return Coalesce(NullIf(Trim(Concat('first_name', Value(' '), 'last_name')), Value('')), 'username')
 
 
 class Department(models.Model):
@@ -48,6 +61,7 @@ class User(AbstractUser):
     position = models.CharField(max_length=200, blank=True, verbose_name=_('Должность'))
     bio = models.TextField(blank=True, verbose_name=_('О себе'))
     is_active = models.BooleanField(default=True)
+    assigned_task_count = CounterField(counts='assigned_tasks', verbose_name=_('Назначено задач'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -58,6 +72,9 @@ class User(AbstractUser):
         verbose_name = _('Пользователь')
         verbose_name_plural = _('Пользователи')
         ordering = ['last_name', 'first_name']
+        indexes = [
+            GinIndex(OpClass(search_text(*USER_AUTOCOMPLETE_FIELDS), name='gin_trgm_ops'), name='users_user_name_trgm'),
+        ]
     
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
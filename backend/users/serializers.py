@@ -2,25 +2,24 @@
 Serializers for users app.
 """
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from django.contrib.auth.password_validation import validate_password
 from .models import User, Department, Role
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Department
         fields = ['id', 'name', 'description', 'parent', 'created_at']
 
 
-class RoleSerializer(serializers.ModelSerializer):
+class RoleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = ['id', 'name', 'code', 'description', 'permissions']
 
 
-class UserSerializer(serializers.ModelSerializer):
-    department = DepartmentSerializer(read_only=True)
-    role = RoleSerializer(read_only=True)
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     department_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     role_id = serializers.IntegerField(write_only=True, required=False, allow_null=True)
     full_name = serializers.CharField(read_only=True)
@@ -32,7 +31,11 @@ class UserSerializer(serializers.ModelSerializer):
             'phone', 'avatar', 'department', 'department_id', 'role', 'role_id',
             'position', 'bio', 'is_active', 'date_joined', 'created_at'
         ]
-        read_only_fields = ['date_joined', 'created_at']
+        read_only_fields = ['department', 'role', 'date_joined', 'created_at']
+        expandable_fields = {
+            'department': (DepartmentSerializer, {}),
+            'role': (RoleSerializer, {}),
+        }
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -0,0 +1,7 @@
+"""
+Signals for users app.
+"""
+from core.cache import track_model_versions
+from .models import Department, Role, User
+
+track_model_versions(Department, Role, User)
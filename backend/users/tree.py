@@ -0,0 +1,50 @@
+"""
+Department tree helpers.
+
+The ancestor/descendant closure of the whole ``Department`` tree is read
+with one recursive CTE and cached under the department version counter
+(bumped on every save/delete, see ``users.signals``), so expanding a
+department to its subtree normally costs no query at all.
+"""
+from django.core.cache import cache
+from django.db import connection
+from core.cache import versioned_key, model_version_name
+from .models import Department
+
+# UNION (not UNION ALL) drops rows already produced, so a parent cycle
+# entered through the admin cannot make the recursion run forever.
+CLOSURE_SQL = '''
+    WITH RECURSIVE closure(ancestor_id, descendant_id) AS (
+        SELECT id, id FROM {table}
+        UNION
+        SELECT closure.ancestor_id, department.id
+        FROM {table} department
+        JOIN closure ON department.parent_id = closure.descendant_id
+    )
+    SELECT ancestor_id, descendant_id FROM closure
+'''
+
+
+def build_subtree_index():
+    """Map every department id to the ids of its subtree (itself included)."""
+    table = connection.ops.quote_name(Department._meta.db_table)
+    index = {}
+    with connection.cursor() as cursor:
+        cursor.execute(CLOSURE_SQL.format(table=table))
+        for ancestor_id, descendant_id in cursor.fetchall():
+            index.setdefault(ancestor_id, []).append(descendant_id)
+    return index
+
+
+def get_subtree_index():
+    key = versioned_key('users:department-subtrees', model_version_name(Department))
+    index = cache.get(key)
+    if index is None:
+        index = build_subtree_index()
+        cache.set(key, index, None)
+    return index
+
+
+def department_subtree(department_id):
+    """Ids of ``department_id`` and all of its sub-departments."""
+    return get_subtree_index().get(department_id, [department_id])
@@ -6,14 +6,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.auth import get_user_model
+from core.conditional import ConditionalGetMixin
+from core.serializers import DynamicFieldsViewMixin
 from .serializers import UserSerializer, UserCreateSerializer, UserUpdateSerializer, DepartmentSerializer, RoleSerializer
 from .models import Department, Role
 
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.select_related('department', 'role').all()
+    conditional_models = (Department, Role)
     permission_classes = [IsAuthenticated]
     
     def get_serializer_class(self):
@@ -30,18 +33,17 @@ class UserViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
-        return Response(serializer.data)
+        return self.conditional(request, lambda: Response(self.get_serializer(request.user).data))
     
     @action(detail=False, methods=['put', 'patch'])
     def update_me(self, request):
         serializer = UserUpdateSerializer(request.user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(UserSerializer(request.user).data)
+        return Response(UserSerializer(request.user, context=self.get_serializer_context()).data)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated]
@@ -52,7 +54,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [IsAuthenticated]
@@ -19,15 +19,16 @@ import { CSS } from '@dnd-kit/utilities'
 import apiClient from '../../api/client'
 import Card from '../ui/Card/Card'
 import StatusBadge from '../ui/StatusBadge/StatusBadge'
-import type { Task, TaskColumn } from '../../types'
+import type { Board, BoardCard, BoardUser, Project } from '../../types'
 import { ArrowLeft } from 'lucide-react'
-import { Link } from 'react-router-dom'
+import { Link, useSearchParams } from 'react-router-dom'
 
 interface SortableTaskProps {
-  task: Task
+  task: BoardCard
+  assignee?: BoardUser
 }
 
-function SortableTask({ task }: SortableTaskProps) {
+function SortableTask({ task, assignee }: SortableTaskProps) {
   const {
     attributes,
     listeners,
@@ -49,9 +50,9 @@ function SortableTask({ task }: SortableTaskProps) {
         <h4 className="font-semibold text-gray-900 dark:text-gray-100 mb-2">{task.title}</h4>
         <div className="flex items-center space-x-2">
           <StatusBadge status={task.priority} />
-          {task.assignee && (
+          {assignee && (
             <span className="text-sm text-gray-600 dark:text-gray-400">
-              {task.assignee.full_name}
+              {assignee.full_name}
             </span>
           )}
         </div>
@@ -61,8 +62,11 @@ function SortableTask({ task }: SortableTaskProps) {
 }
 
 export default function KanbanBoard() {
-  const [tasks, setTasks] = useState<Task[]>([])
-  const [columns, setColumns] = useState<TaskColumn[]>([])
+  const [searchParams, setSearchParams] = useSearchParams()
+  const [projects, setProjects] = useState<Pick<Project, 'id' | 'name'>[]>([])
+  // The board is served per project; without one in the URL the first project is shown.
+  const projectId = searchParams.get('project') || (projects.length > 0 ? String(projects[0].id) : null)
+  const [board, setBoard] = useState<Board | null>(null)
   const [activeId, setActiveId] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
 
@@ -74,14 +78,30 @@ export default function KanbanBoard() {
   )
 
   useEffect(() => {
+    const fetchProjects = async () => {
+      try {
+        const response = await apiClient.get('/tasks/projects/', { params: { fields: 'id,name' } })
+        const results = response.data.results || []
+        setProjects(results)
+        if (results.length === 0) {
+          setIsLoading(false)
+        }
+      } catch (error) {
+        console.error('Error fetching projects:', error)
+        setIsLoading(false)
+      }
+    }
+    fetchProjects()
+  }, [])
+
+  useEffect(() => {
+    if (!projectId) return
     const fetchData = async () => {
       try {
-        const [tasksRes, columnsRes] = await Promise.all([
-          apiClient.get('/tasks/'),
-          apiClient.get('/tasks/columns/'),
-        ])
-        setTasks(tasksRes.data.results || tasksRes.data)
-        setColumns(columnsRes.data.results || columnsRes.data)
+        const response = await apiClient.get('/tasks/board/', {
+          params: { project: projectId },
+        })
+        setBoard(response.data)
       } catch (error) {
         console.error('Error fetching kanban data:', error)
       } finally {
@@ -89,7 +109,10 @@ export default function KanbanBoard() {
       }
     }
     fetchData()
-  }, [])
+  }, [projectId])
+
+  const columns = board?.columns || []
+  const tasks = [...columns.flatMap((column) => column.tasks), ...(board?.unplaced || [])]
 
   const handleDragStart = (event: any) => {
     setActiveId(event.active.id)
@@ -107,17 +130,26 @@ export default function KanbanBoard() {
     const overColumnId = over.id
     const newColumn = columns.find((c) => c.id.toString() === overColumnId)
 
-    if (newColumn && activeTask.column?.id !== newColumn.id) {
+    if (newColumn && activeTask.column_id !== newColumn.id) {
       try {
         await apiClient.post(`/tasks/${activeTask.id}/move/`, {
           column_id: newColumn.id,
           position: 0,
         })
 
-        setTasks((prevTasks) =>
-          prevTasks.map((task) =>
-            task.id === activeTask.id ? { ...task, column: newColumn } : task
-          )
+        const moved = { ...activeTask, column_id: newColumn.id }
+        setBoard((prevBoard) =>
+          prevBoard && {
+            ...prevBoard,
+            unplaced: prevBoard.unplaced.filter((task) => task.id !== activeTask.id),
+            columns: prevBoard.columns.map((column) => ({
+              ...column,
+              tasks:
+                column.id === newColumn.id
+                  ? [moved, ...column.tasks]
+                  : column.tasks.filter((task) => task.id !== activeTask.id),
+            })),
+          }
         )
       } catch (error) {
         console.error('Error moving task:', error)
@@ -150,6 +182,17 @@ export default function KanbanBoard() {
             <p className="text-gray-600 dark:text-gray-400 mt-2">Перетаскивайте задачи между колонками</p>
           </div>
         </div>
+        <select
+          className="input-field"
+          value={projectId || ''}
+          onChange={(e) => setSearchParams({ project: e.target.value })}
+        >
+          {projects.map((project) => (
+            <option key={project.id} value={project.id}>
+              {project.name}
+            </option>
+          ))}
+        </select>
       </div>
 
       <DndContext
@@ -160,9 +203,10 @@ export default function KanbanBoard() {
       >
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
           {displayColumns.map((column) => {
-            const columnTasks = tasks.filter(
-              (task) => task.column?.id === column.id || task.status === column.id
-            )
+            const columnTasks =
+              'tasks' in column
+                ? column.tasks
+                : tasks.filter((task) => task.status === column.id)
 
             return (
               <div key={column.id} className="flex flex-col">
@@ -178,7 +222,11 @@ export default function KanbanBoard() {
                 >
                   <div className="space-y-2 min-h-[200px]">
                     {columnTasks.map((task) => (
-                      <SortableTask key={task.id} task={task} />
+                      <SortableTask
+                        key={task.id}
+                        task={task}
+                        assignee={task.assignee_id ? board?.users[task.assignee_id] : undefined}
+                      />
                     ))}
                   </div>
                 </SortableContext>
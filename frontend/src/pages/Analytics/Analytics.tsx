@@ -17,7 +17,7 @@ export default function Analytics() {
         // Получаем основные данные
         const [tasksRes, docsRes, usersRes, processesRes] = await Promise.allSettled([
           apiClient.get('/tasks/'),
-          apiClient.get('/documents/'),
+          apiClient.get('/documents/', { params: { expand: 'document_type' } }),
           apiClient.get('/users/'),
           apiClient.get('/processes/'),
         ])
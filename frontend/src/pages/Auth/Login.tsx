@@ -39,7 +39,7 @@ export default function Login() {
       setTokens(access, refresh)
 
       // Get user info
-      const userResponse = await apiClient.get('/api/users/me/')
+      const userResponse = await apiClient.get('/api/users/me/', { params: { expand: 'department,role' } })
       setUser(userResponse.data)
 
       toast.success('Успешный вход!')
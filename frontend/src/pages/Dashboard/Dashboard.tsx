@@ -47,8 +47,8 @@ export default function Dashboard() {
         
         // Получаем все данные для дашборда
         const [tasksRes, docsRes, usersRes, processesRes] = await Promise.allSettled([
-          apiClient.get('/tasks/'),
-          apiClient.get('/documents/'),
+          apiClient.get('/tasks/', { params: { expand: 'project' } }),
+          apiClient.get('/documents/', { params: { expand: 'document_type' } }),
           apiClient.get('/users/'),
           apiClient.get('/processes/'),
         ])
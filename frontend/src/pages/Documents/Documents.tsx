@@ -37,7 +37,7 @@ export default function Documents() {
         setLoading(true)
         // Получаем реальные данные из API
         const [docsResponse, typesResponse] = await Promise.all([
-          apiClient.get('/documents/'),
+          apiClient.get('/documents/', { params: { expand: 'document_type,created_by' } }),
           apiClient.get('/documents/types/'),
         ])
         
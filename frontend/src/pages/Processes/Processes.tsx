@@ -26,7 +26,7 @@ export default function Processes() {
       try {
         setLoading(true)
         // Получаем реальные данные из API
-        const response = await apiClient.get('/processes/')
+        const response = await apiClient.get('/processes/', { params: { expand: 'created_by' } })
         
         console.log('Processes data:', response.data)
         setProcesses(response.data.results || [])
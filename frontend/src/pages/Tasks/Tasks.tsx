@@ -51,7 +51,7 @@ export default function Tasks() {
         setLoading(true)
         // Получаем реальные данные из API
         const [tasksResponse, projectsResponse] = await Promise.all([
-          apiClient.get('/tasks/'),
+          apiClient.get('/tasks/', { params: { expand: 'project,assignee,reporter' } }),
           apiClient.get('/tasks/projects/'),
         ])
         
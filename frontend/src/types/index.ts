@@ -42,16 +42,30 @@ export interface Project {
   status: 'planning' | 'active' | 'on_hold' | 'completed' | 'cancelled'
   color: string
   task_count?: number
+  task_stats?: ProjectTaskStats
   created_at: string
   updated_at: string
 }
 
+export interface ProjectTaskStats {
+  by_status: Record<Task['status'], number>
+  by_priority: Record<Task['priority'], number>
+  overdue: number
+}
+
 export interface Tag {
   id: number
   name: string
   color: string
 }
 
+// Items of /api/autocomplete/<kind>/
+export interface AutocompleteItems {
+  tags: Tag
+  projects: Pick<Project, 'id' | 'name' | 'color'>
+  users: Pick<User, 'id' | 'username' | 'full_name'>
+}
+
 export interface TaskColumn {
   id: number
   name: string
@@ -71,18 +85,58 @@ export interface Task {
   priority: 'low' | 'medium' | 'high' | 'urgent'
   status: 'todo' | 'in_progress' | 'review' | 'done' | 'cancelled'
   due_date?: string
-  tags: Tag[]
-  column?: TaskColumn
+  // Ids unless requested with ?expand=tags,column
+  tags: number[] | Tag[]
+  column?: number | TaskColumn
   position: number
+  rank: string
   depends_on?: Task
   is_recurring: boolean
   recurrence_pattern?: string
+  recurrence_source?: number | null
+  occurrence_at?: string | null
   comment_count?: number
   created_at: string
   updated_at: string
   completed_at?: string
 }
 
+export interface BoardUser {
+  id: number
+  full_name: string
+  avatar: string | null
+}
+
+export interface BoardCard {
+  id: number
+  title: string
+  status: Task['status']
+  priority: Task['priority']
+  due_date: string | null
+  rank: string
+  column_id: number | null
+  assignee_id: number | null
+  depends_on_id: number | null
+  completed_at: string | null
+  tag_ids: number[]
+}
+
+export interface BoardColumn {
+  id: number
+  name: string
+  position: number
+  is_default: boolean
+  tasks: BoardCard[]
+}
+
+export interface Board {
+  project: number
+  columns: BoardColumn[]
+  unplaced: BoardCard[]
+  users: Record<number, BoardUser>
+  tags: Record<number, Tag>
+}
+
 export interface DocumentType {
   id: number
   name: string